@@ -30,6 +30,7 @@ VarDesc *BlockDesc::Var(const std::string &name) {
     return it->second.get();
   }
   need_update_ = true;
+  ++vars_version_;
   auto *var = new VarDesc(name);
   vars_[name].reset(var);
   return var;
@@ -53,6 +54,7 @@ VarDesc *BlockDesc::RenameVar(const std::string &old_name,
     return nullptr;
   }
   need_update_ = true;
+  ++vars_version_;
   auto *var = this->Var(old_name);
   VarDesc *new_var = new VarDesc(*(var->Proto()));
   new_var->SetName(new_name);
@@ -123,28 +125,33 @@ std::vector<VarDesc *> BlockDesc::AllVars() const {
 
 OpDesc *BlockDesc::AppendOp() {
   need_update_ = true;
+  ++ops_version_;
   ops_.emplace_back(new OpDesc(this));
   return ops_.back().get();
 }
 
 void BlockDesc::AppendAllocatedOp(std::unique_ptr<OpDesc> &&op_desc) {
   need_update_ = true;
+  ++ops_version_;
   ops_.emplace_back(std::move(op_desc));
 }
 
 OpDesc *BlockDesc::PrependOp() {
   need_update_ = true;
+  ++ops_version_;
   ops_.emplace_front(new OpDesc(this));
   return ops_.front().get();
 }
 
 void BlockDesc::PrependAllocatedOp(std::unique_ptr<OpDesc> &&op_desc) {
   need_update_ = true;
+  ++ops_version_;
   ops_.emplace_front(std::move(op_desc));
 }
 
 OpDesc *BlockDesc::InsertOp(size_t index) {
   need_update_ = true;
+  ++ops_version_;
   auto it = ops_.begin() + index;
   std::unique_ptr<OpDesc> new_op(new OpDesc(this));
   it = ops_.insert(it, std::move(new_op));
@@ -156,6 +163,7 @@ void BlockDesc::RemoveOp(size_t s, size_t e) {
     return;
   }
   need_update_ = true;
+  ++ops_version_;
   ops_.erase(ops_.begin() + s, ops_.begin() + e);
 }
 
@@ -163,6 +171,7 @@ void BlockDesc::RemoveOpInternal(const OpDesc *op_desc) {
   // TODO(minqiyang): make this faster
   for (auto it = ops_.begin(); it != ops_.end(); ++it) {
     if (it->get() == op_desc) {
+      ++ops_version_;
       ops_.erase(it);
       break;
     }
@@ -95,14 +95,31 @@ class BlockDesc {
 
   void RemoveOpInternal(const OpDesc *op_desc);
 
-  void RemoveVar(const std::string &name) { vars_.erase(name); }
+  void RemoveVar(const std::string &name) {
+    ++vars_version_;
+    vars_.erase(name);
+  }
 
   std::vector<OpDesc *> AllOps() const;
 
   size_t OpSize() const { return ops_.size(); }
 
+  size_t VarSize() const { return vars_.size(); }
+
   OpDesc *Op(int idx) const { return ops_.at(idx).get(); }
 
+  // Increased on every change of the op list and the var set respectively,
+  // so that the Python side can skip synchronizing an unchanged block.
+  uint64_t OpsVersion() const { return ops_version_; }
+
+  uint64_t VarsVersion() const { return vars_version_; }
+
+  // Increased on every change of the inputs or outputs of the ops, so that
+  // the Python side can tell whether its index of them is stale.
+  uint64_t ArgsVersion() const { return args_version_; }
+
+  void IncreaseArgsVersion() { ++args_version_; }
+
   void Flush();
 
   proto::BlockDesc *Proto();
@@ -113,6 +130,9 @@ class BlockDesc {
   ProgramDesc *prog_;       // not_own
   proto::BlockDesc *desc_;  // not_own
   bool need_update_;
+  uint64_t ops_version_{0};
+  uint64_t vars_version_{0};
+  uint64_t args_version_{0};
 
   std::deque<std::unique_ptr<OpDesc>> ops_;
   std::unordered_map<std::string, std::unique_ptr<VarDesc>> vars_;
@@ -293,6 +293,7 @@ void OpDesc::CopyFrom(const OpDesc &op_desc) {
   outputs_ = op_desc.outputs_;
   attrs_ = op_desc.attrs_;
   need_update_ = true;
+  ArgsChanged();
 }
 
 OpDesc::OpDesc(const proto::OpDesc &desc, BlockDesc *block)
@@ -356,6 +357,7 @@ void OpDesc::SetInput(const std::string &param_name,
                       const std::vector<std::string> &args) {
   need_update_ = true;
   inputs_[param_name] = args;
+  ArgsChanged();
 }
 
 const std::vector<std::string> &OpDesc::Output(const std::string &name) const {
@@ -381,6 +383,7 @@ void OpDesc::SetOutput(const std::string &param_name,
                        const std::vector<std::string> &args) {
   need_update_ = true;
   this->outputs_[param_name] = args;
+  ArgsChanged();
 }
 
 bool OpDesc::HasProtoAttr(const std::string &name) const {
@@ -553,6 +556,12 @@ const std::unordered_map<std::string, Attribute> &OpDesc::GetAttrMap() const {
   return attrs_;
 }
 
+void OpDesc::ArgsChanged() {
+  if (block_ != nullptr) {
+    block_->IncreaseArgsVersion();
+  }
+}
+
 void OpDesc::Rename(const std::string &old_name, const std::string &new_name) {
   RenameInput(old_name, new_name);
   RenameOutput(old_name, new_name);
@@ -565,6 +574,7 @@ void OpDesc::RenameOutput(const std::string &old_name,
     std::replace(output.second.begin(), output.second.end(), old_name,
                  new_name);
   }
+  ArgsChanged();
 
   auto it = attrs_.find(framework::OpProtoAndCheckerMaker::OpRoleVarAttrName());
   if (it != attrs_.end()) {
@@ -580,6 +590,7 @@ void OpDesc::RenameInput(const std::string &old_name,
   for (auto &input : inputs_) {
     std::replace(input.second.begin(), input.second.end(), old_name, new_name);
   }
+  ArgsChanged();
 
   auto it = attrs_.find(framework::OpProtoAndCheckerMaker::OpRoleVarAttrName());
   if (it != attrs_.end()) {
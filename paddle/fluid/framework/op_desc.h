@@ -149,8 +149,11 @@ class OpDesc {
     return ret_val;
   }
 
+  // Tell the block that the inputs or outputs of this op are changed.
+  void ArgsChanged();
+
   proto::OpDesc desc_;
-  BlockDesc *block_;  // not_own
+  BlockDesc *block_{nullptr};  // not_own
   // input arg name => input variable names
   VariableNameMap inputs_;
   // output arg name => output variable names
@@ -16,10 +16,13 @@
 
 #include "paddle/fluid/imperative/all_reduce.h"
 
+#include <mutex>  // NOLINT
 #include <string>
+#include <unordered_map>
 #include <utility>
 
 #include "paddle/fluid/framework/scope.h"
+#include "paddle/fluid/platform/cuda_device_guard.h"
 #include "paddle/fluid/platform/device_context.h"
 #include "paddle/fluid/platform/nccl_helper.h"
 #include "paddle/fluid/string/string_helper.h"
@@ -199,6 +202,65 @@ void AllReduce(const framework::Variable &src, framework::Variable *dst,
   AllReduce(src, dst, strategy, stream);
 }
 
+struct CommStream {
+  cudaStream_t stream;
+  cudaEvent_t event;
+};
+
+// NOTE: the communication streams are created once for each device and kept
+// until the process exits.
+static const CommStream &GetCommStream(const platform::CUDAPlace &place) {
+  static std::mutex mutex;
+  static std::unordered_map<int, CommStream> comm_streams;
+  std::lock_guard<std::mutex> guard(mutex);
+  auto iter = comm_streams.find(place.device);
+  if (iter == comm_streams.end()) {
+    platform::CUDADeviceGuard device_guard(place.device);
+    CommStream comm_stream;
+    PADDLE_ENFORCE_CUDA_SUCCESS(cudaStreamCreateWithFlags(
+        &comm_stream.stream, cudaStreamNonBlocking));
+    PADDLE_ENFORCE_CUDA_SUCCESS(cudaEventCreateWithFlags(
+        &comm_stream.event, cudaEventDisableTiming));
+    iter = comm_streams.emplace(place.device, comm_stream).first;
+  }
+  return iter->second;
+}
+
+void AllReduceAsync(const framework::Variable &src, framework::Variable *dst,
+                    const ParallelStrategy &strategy) {
+  // The SelectedRows all-reduce allocates the result on the computation
+  // stream and frees the input in-place, so it cannot run asynchronously.
+  PADDLE_ENFORCE_EQ(
+      src.IsType<framework::LoDTensor>(), true,
+      platform::errors::Unimplemented(
+          "Only LoDTensor can be allreduced asynchronously, but got %s.",
+          platform::demangle(framework::ToTypeName(src.Type()))));
+  const auto &place = GetVarPlace(src);
+  PADDLE_ENFORCE_EQ(
+      platform::is_gpu_place(place), true,
+      platform::errors::Unimplemented(
+          "Imperative mode does not support multi-CPU training yet."));
+  auto *dev_ctx = static_cast<platform::CUDADeviceContext *>(
+      platform::DeviceContextPool::Instance().Get(place));
+  const auto &comm_stream =
+      GetCommStream(BOOST_GET_CONST(platform::CUDAPlace, place));
+  PADDLE_ENFORCE_CUDA_SUCCESS(
+      cudaEventRecord(comm_stream.event, dev_ctx->stream()));
+  PADDLE_ENFORCE_CUDA_SUCCESS(
+      cudaStreamWaitEvent(comm_stream.stream, comm_stream.event, 0));
+  AllReduce(src, dst, strategy, comm_stream.stream);
+}
+
+void WaitAllReduce(const platform::CUDAPlace &place) {
+  auto *dev_ctx = static_cast<platform::CUDADeviceContext *>(
+      platform::DeviceContextPool::Instance().Get(place));
+  const auto &comm_stream = GetCommStream(place);
+  PADDLE_ENFORCE_CUDA_SUCCESS(
+      cudaEventRecord(comm_stream.event, comm_stream.stream));
+  PADDLE_ENFORCE_CUDA_SUCCESS(
+      cudaStreamWaitEvent(dev_ctx->stream(), comm_stream.event, 0));
+}
+
 }  // namespace imperative
 }  // namespace paddle
 
@@ -31,6 +31,16 @@ namespace imperative {
 void AllReduce(const framework::Variable &src, framework::Variable *dst,
                const ParallelStrategy &strategy);
 
+// All-reduce the LoDTensor on the communication stream of its place, which
+// waits for the computation enqueued on the computation stream so far, so
+// that the all-reduce overlaps with the computation enqueued after it.
+void AllReduceAsync(const framework::Variable &src, framework::Variable *dst,
+                    const ParallelStrategy &strategy);
+
+// Make the computation stream of the place wait for the all-reduces launched
+// by AllReduceAsync.
+void WaitAllReduce(const platform::CUDAPlace &place);
+
 }  // namespace imperative
 }  // namespace paddle
 
@@ -201,6 +201,11 @@ void BasicEngine::Execute() {
               platform::errors::NotFound("Cannot find gradient of variable %s",
                                          var->Name()));
 
+          if (iter->second->IncreaseFinishedCnt() &&
+              !var->GradReadyHooks().empty()) {
+            ready_var_list_.emplace_back(var);
+          }
+
           if (!var->OverridedStopGradient() && iter->second->RefCnt() == 1) {
             continue;
           }
@@ -225,11 +230,28 @@ void BasicEngine::Execute() {
 
       need_accu_var_list_.clear();
 
+      // Step 3: Run the hooks of gradients which are final. The engine is
+      // cleared if a hook throws, e.g. an exception raised in python, so that
+      // the next backward does not start with the states of this one.
+      try {
+        for (auto& var : ready_var_list_) {
+          VLOG(3) << "Run grad ready hooks of " << var->Name();
+          for (auto& hook : var->GradReadyHooks()) {
+            hook();
+          }
+        }
+      } catch (...) {
+        Clear();
+        throw;
+      }
+
+      ready_var_list_.clear();
+
       VLOG(3) << "Remove op after op " << cur_op.Type() << " runs";
       cur_op.ClearBackwardTrace();
     }
 
-    // Step 3: Collect ready ops
+    // Step 4: Collect ready ops
     for (auto& grad_pending_node : shared_cur_node->GradPendingNodes()) {
       PADDLE_ENFORCE_NOT_NULL(grad_pending_node,
                               platform::errors::NotFound(
@@ -254,6 +276,7 @@ void BasicEngine::Clear() {
   node_deps_.clear();
   accumulators_.clear();
   need_accu_var_list_.clear();
+  ready_var_list_.clear();
 }
 
 }  // namespace imperative
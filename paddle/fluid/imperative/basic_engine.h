@@ -51,6 +51,7 @@ class BasicEngine : public Engine {
       accumulators_;
   std::vector<std::pair<GradientAccumulator*, std::shared_ptr<VariableWrapper>>>
       need_accu_var_list_;
+  std::vector<std::shared_ptr<VariableWrapper>> ready_var_list_;
 };
 
 }  // namespace imperative
@@ -35,9 +35,14 @@ class GradientAccumulator {
 
   inline size_t RefCnt() const { return ref_cnt_; }
 
+  // Count a grad op writing var_ as finished, returns whether it is the last
+  // one, after which the gradient in var_ is final.
+  inline bool IncreaseFinishedCnt() { return ++finished_cnt_ == ref_cnt_; }
+
  protected:
   VariableWrapper* var_;
   size_t ref_cnt_{0};
+  size_t finished_cnt_{0};
 };
 
 class EagerGradientAccumulator : public GradientAccumulator {
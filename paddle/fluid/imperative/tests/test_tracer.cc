@@ -17,6 +17,7 @@
 //
 
 #include <paddle/fluid/framework/op_registry.h>
+#include <algorithm>
 #include <memory>
 #include <set>
 #include <string>
@@ -379,6 +380,85 @@ TEST(test_tracer, test_var_without_grad_var) {
   }
 }
 
+TEST(test_tracer, test_grad_ready_hooks) {
+  // loss = reduce_sum(mul(x, y) + mul(x, z)), the grad of x is summed up by
+  // two mul_grad ops, while the grads of y and z are written directly
+  imperative::Tracer tracer;
+  platform::CPUPlace place;
+  std::vector<float> src_data(10, 2.0);
+  auto new_var = [&](const std::string& name, int64_t rows, int64_t cols) {
+    std::shared_ptr<imperative::VarBase> var(
+        new imperative::VarBase(true, name));
+    var->SetOverridedStopGradient(false);
+    auto* tensor = var->MutableVar()->GetMutable<framework::LoDTensor>();
+    tensor->Resize(framework::make_ddim({rows, cols}));
+    auto* data = tensor->mutable_data<float>(place);
+    paddle::memory::Copy(place, data, place, src_data.data(),
+                         sizeof(float) * src_data.size());
+    return var;
+  };
+  auto x = new_var("x", 2, 5);
+  auto y = new_var("y", 5, 2);
+  auto z = new_var("z", 5, 2);
+  std::shared_ptr<imperative::VarBase> xy(new imperative::VarBase(true, "xy"));
+  std::shared_ptr<imperative::VarBase> xz(new imperative::VarBase(true, "xz"));
+  std::shared_ptr<imperative::VarBase> sum(
+      new imperative::VarBase(true, "sum"));
+  std::shared_ptr<imperative::VarBase> loss(
+      new imperative::VarBase(true, "loss"));
+
+  framework::AttributeMap attr_map;
+  attr_map["use_mkldnn"] = false;
+  imperative::NameVarBaseMap xy_ins = {var_pair("X", vb_vector(1, x)),
+                                       var_pair("Y", vb_vector(1, y))};
+  imperative::NameVarBaseMap xy_outs = {var_pair("Out", vb_vector(1, xy))};
+  tracer.TraceOp("mul", xy_ins, xy_outs, attr_map, place, true);
+  imperative::NameVarBaseMap xz_ins = {var_pair("X", vb_vector(1, x)),
+                                       var_pair("Y", vb_vector(1, z))};
+  imperative::NameVarBaseMap xz_outs = {var_pair("Out", vb_vector(1, xz))};
+  tracer.TraceOp("mul", xz_ins, xz_outs, attr_map, place, true);
+  imperative::NameVarBaseMap sum_ins = {var_pair("X", vb_vector(1, xy)),
+                                        var_pair("Y", vb_vector(1, xz))};
+  imperative::NameVarBaseMap sum_outs = {var_pair("Out", vb_vector(1, sum))};
+  tracer.TraceOp("elementwise_add", sum_ins, sum_outs, attr_map, place, true);
+  imperative::NameVarBaseMap loss_ins = {var_pair("X", vb_vector(1, sum))};
+  imperative::NameVarBaseMap loss_outs = {
+      var_pair("Out", vb_vector(1, loss))};
+  framework::AttributeMap reduce_attr_map;
+  tracer.TraceOp("reduce_sum", loss_ins, loss_outs, reduce_attr_map, place,
+                 true);
+
+  std::vector<std::string> ready_vars;
+  std::vector<float> ready_grads;
+  for (auto& var : {x, y, z}) {
+    var->MutableGradVarBase()->SharedVar()->AddGradReadyHook(
+        [&ready_vars, &ready_grads, var]() {
+          ready_vars.emplace_back(var->Name());
+          ready_grads.emplace_back(
+              var->GradVar().Get<framework::LoDTensor>().data<float>()[0]);
+        });
+  }
+
+  detail::BackwardStrategy back_st;
+  imperative::BasicEngine engine;
+  engine.Init(loss.get(), back_st);
+  engine.Execute();
+
+  // each hook runs once with the final grad
+  ASSERT_EQ(ready_vars.size(), 3UL);
+  for (size_t i = 0; i < ready_vars.size(); ++i) {
+    ASSERT_EQ(std::count(ready_vars.begin(), ready_vars.end(), ready_vars[i]),
+              1);
+    ASSERT_EQ(ready_grads[i], ready_vars[i] == "x" ? 8.0 : 4.0);
+  }
+
+  // the hooks refer to the vars, which are released after clearing them
+  for (auto& var : {x, y, z}) {
+    var->GradVarBase()->SharedVar()->ClearGradReadyHooks();
+    ASSERT_TRUE(var->GradVarBase()->SharedVar()->GradReadyHooks().empty());
+  }
+}
+
 template <typename T>
 using WeakPtrSet =
     std::set<std::weak_ptr<T>, std::owner_less<std::weak_ptr<T>>>;
@@ -14,8 +14,11 @@
 
 #pragma once
 
+#include <functional>
 #include <memory>
 #include <string>
+#include <utility>
+#include <vector>
 #include "paddle/fluid/framework/variable.h"
 
 namespace paddle {
@@ -91,6 +94,19 @@ class VariableWrapper {
 
   bool HasGradNode() const { return !grad_node_.expired(); }
 
+  // The hooks are run by the engine once the gradient held by this var is
+  // final in backward, i.e., after all the grad ops writing it have run and
+  // their outputs have been summed up.
+  void AddGradReadyHook(std::function<void()> hook) {
+    grad_ready_hooks_.emplace_back(std::move(hook));
+  }
+
+  const std::vector<std::function<void()>>& GradReadyHooks() const {
+    return grad_ready_hooks_;
+  }
+
+  void ClearGradReadyHooks() { grad_ready_hooks_.clear(); }
+
   framework::proto::VarType::Type DataType() const {
     const framework::Tensor* tensor = nullptr;
     if (var_.IsInitialized()) {
@@ -151,6 +167,8 @@ class VariableWrapper {
 
   std::weak_ptr<VariableWrapper> grad_var_;
   std::weak_ptr<GradOpNode> grad_node_;
+
+  std::vector<std::function<void()>> grad_ready_hooks_;
 };
 
 }  // namespace imperative
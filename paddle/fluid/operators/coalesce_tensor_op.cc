@@ -93,6 +93,11 @@ class CoalesceTensorOpKernel : public framework::OpKernel<T> {
     auto out_tensors = context.MultiOutput<framework::LoDTensor>("Output");
     size_t offset = 0;
     if (context.Attr<bool>("copy_data")) {
+      // Set the padding between the tensors with the constant, so that the
+      // uninitialized memory is not used when the FusedOutput is computed
+      // as a whole, e.g. all-reduced.
+      bool set_padding = context.Attr<bool>("set_constant");
+      math::SetConstant<DeviceContext, T> set_constant;
       for (size_t i = 0; i < in_var_names.size(); ++i) {
         size_t len = static_cast<size_t>(in_tensors[i]->numel());
         auto sub_tensor = fused_tensor->Slice(
@@ -100,8 +105,17 @@ class CoalesceTensorOpKernel : public framework::OpKernel<T> {
         framework::TensorCopy(*in_tensors[i], context.GetPlace(), dev_ctx,
                               &sub_tensor);
 
-        offset += platform::Alignment(len * size_of_dtype, context.GetPlace()) /
-                  size_of_dtype;
+        size_t aligned_len =
+            platform::Alignment(len * size_of_dtype, context.GetPlace()) /
+            size_of_dtype;
+        if (set_padding && aligned_len > len) {
+          auto padding =
+              fused_tensor->Slice(static_cast<int64_t>(offset + len),
+                                  static_cast<int64_t>(offset + aligned_len));
+          set_constant(dev_ctx, &padding,
+                       static_cast<T>(context.Attr<float>("constant")));
+        }
+        offset += aligned_len;
       }
     } else if (context.Attr<bool>("set_constant")) {
       math::SetConstant<DeviceContext, T> set_constant;
@@ -193,7 +207,9 @@ class CoalesceTensorOpMaker : public framework::OpProtoAndCheckerMaker {
     AddAttr<bool>("copy_data", "Whether to copy the Input value to Output.")
         .SetDefault(false);
     AddAttr<bool>("set_constant",
-                  "Whether to set the Output with a constant value.")
+                  "Whether to set the Output with a constant value. If "
+                  "copy_data is also true, only the padding between the "
+                  "Output is set with the constant value.")
         .SetDefault(false);
     AddAttr<float>("constant",
                    "If set_constant is true, the constant value will be used "
@@ -759,15 +759,54 @@ void BindImperative(py::module *m_ptr) {
              return std::shared_ptr<imperative::VarBase>(nullptr);
            },
            py::return_value_policy::copy)
+      .def("_register_grad_ready_hook",
+           [](imperative::VarBase &self, const py::object &hook) {
+             PADDLE_ENFORCE_EQ(
+                 PyCallable_Check(hook.ptr()), 1,
+                 platform::errors::InvalidArgument(
+                     "The grad ready hook of %s should be callable.",
+                     self.Name()));
+             // NOTE: the hook may be run and released by the engine without
+             // GIL, so GIL is acquired to call and to decrease the reference
+             // of the python object.
+             std::shared_ptr<py::object> py_hook(
+                 new py::object(hook), [](py::object *obj) {
+                   py::gil_scoped_acquire acquire;
+                   delete obj;
+                 });
+             self.MutableGradVarBase()->SharedVar()->AddGradReadyHook(
+                 [py_hook]() {
+                   py::gil_scoped_acquire acquire;
+                   (*py_hook)();
+                 });
+           },
+           R"DOC(
+        Register a hook called without arguments in backward once the
+        gradient of this variable is final, i.e., after all the grad ops
+        writing it have run. It is called each time backward generates the
+        gradient, until the hooks are cleared by `_clear_grad_ready_hooks`.
+      )DOC")
+      .def("_clear_grad_ready_hooks",
+           [](imperative::VarBase &self) {
+             if (self.HasGradVar()) {
+               self.GradVarBase()->SharedVar()->ClearGradReadyHooks();
+             }
+           })
       .def("_is_sparse",
            [](imperative::VarBase &self) {
              return self.Var().IsType<framework::SelectedRows>();
            })
       .def("_allreduce",
            [](imperative::VarBase &self,
-              const imperative::ParallelStrategy &strategy) {
+              const imperative::ParallelStrategy &strategy,
+              bool use_calc_stream) {
              if (strategy.nranks_ > 1) {
 #ifdef PADDLE_WITH_NCCL
+               if (!use_calc_stream) {
+                 imperative::AllReduceAsync(self.Var(), self.MutableVar(),
+                                            strategy);
+                 return;
+               }
 #if NCCL_VERSION_CODE >= 2212
                imperative::AllReduce(self.Var(), self.MutableVar(), strategy);
 #else
@@ -788,6 +827,7 @@ void BindImperative(py::module *m_ptr) {
 #endif  // PADDLE_WITH_NCCL
              }
            },
+           py::arg("strategy"), py::arg("use_calc_stream") = true,
            py::call_guard<py::gil_scoped_release>())
       .def("_copy_to",
            [](const imperative::VarBase &self, const platform::CPUPlace &place,
@@ -960,6 +1000,12 @@ void BindImperative(py::module *m_ptr) {
       .def(py::init<const imperative::ParallelStrategy &,
                     const platform::CUDAPlace &>())
       .def("init", [](imperative::NCCLParallelContext &self) { self.Init(); });
+
+  m.def("_wait_allreduce",
+        [](const platform::CUDAPlace &place) {
+          imperative::WaitAllReduce(place);
+        },
+        py::call_guard<py::gil_scoped_release>());
 #endif
 }
 
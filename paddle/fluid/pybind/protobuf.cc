@@ -138,8 +138,14 @@ void BindBlockDesc(pybind11::module *m) {
            pybind11::return_value_policy::reference)
       .def("all_vars", &pd::BlockDesc::AllVars,
            pybind11::return_value_policy::reference)
+      .def("var_size", &pd::BlockDesc::VarSize)
       .def("op_size", &pd::BlockDesc::OpSize)
       .def("op", &pd::BlockDesc::Op, pybind11::return_value_policy::reference)
+      .def("all_ops", &pd::BlockDesc::AllOps,
+           pybind11::return_value_policy::reference)
+      .def("_ops_version", &pd::BlockDesc::OpsVersion)
+      .def("_vars_version", &pd::BlockDesc::VarsVersion)
+      .def("_args_version", &pd::BlockDesc::ArgsVersion)
       .def("serialize_to_string", SerializeMessage<pd::BlockDesc>);
 }
 
@@ -172,10 +172,12 @@ class ProgramStats(object):
                 attrs={'seed': seed})
             self.ops.insert(op_idx, added_op)
             # modify dropout op desc so that it accept a seed var as input
+            synced = self.block._var_index_synced()
             op.desc.set_input("Seed", [var_unique_name])
             op.desc.remove_attr("fix_seed")
             op.desc.remove_attr("seed")
             self.block._sync_with_cpp()
+            self.block._reindex_op(op, synced)
             op_idx += 2
 
 
@@ -1608,50 +1610,82 @@ def _find_op_path_(block,
     if op_path_dict is None:
         op_path_dict = dict()
 
-    relevant_op_flags = [True] * len(block.ops)
+    positions = block._positions()
+
+    def _reach_ops(names, forward):
+        # Walk the producer/consumer index from `names` rather than sweeping
+        # all ops of the block. An op is reached if it has grad op maker and
+        # consumes (forward) a var output by a reached op before it, or
+        # produces (backward) a var input of a reached op after it. Vars in
+        # no_grad_set do not propagate. Returns the reached ops by position
+        # and, for each var, the furthest position it propagates from.
+        bounds = dict()
+        reached = dict()
+        rejected = set()
+        start = -1 if forward else len(block.ops)
+        stack = [(name, start) for name in names]
+        while stack:
+            name, pos = stack.pop()
+            old = bounds.get(name)
+            if old is not None and (pos >= old if forward else pos <= old):
+                continue
+            bounds[name] = pos
+            if forward:
+                ops = block._consumer_ops(name)
+                low, high = pos + 1, len(block.ops) if old is None else old + 1
+            else:
+                ops = block._producer_ops(name)
+                low, high = 0 if old is None else old, pos
+            for op in ops:
+                idx = positions[id(op)]
+                if idx < low or idx >= high or idx in reached or \
+                        idx in rejected:
+                    continue
+                if not core.has_non_empty_grad_op_maker(op.type):
+                    rejected.add(idx)
+                    continue
+                reached[idx] = op
+                next_names = op.desc.output_arg_names() if forward \
+                    else op.desc.input_arg_names()
+                for next_name in next_names:
+                    if next_name not in no_grad_set:
+                        stack.append((next_name, idx))
+        return reached, bounds
+
+    relevant_ops, output_bounds = _reach_ops(output_names, forward=False)
 
     # All the inputs of the block are used if inputs is empty,
     if inputs:
-        for i, op in enumerate(block.ops):
-            if _some_in_set_(
-                    op.desc.input_arg_names(),
-                    input_names) and core.has_non_empty_grad_op_maker(op.type):
-                for name in op.desc.output_arg_names():
-                    if name not in no_grad_set:
-                        input_names.add(name)
-            else:
-                relevant_op_flags[i] = False
-
-    for i, op in reversed(list(enumerate(block.ops))):
-        if op.has_attr("sub_block"):
-            sub_block_id = op._block_attr_id("sub_block")
-            sub_block = block.program.block(sub_block_id)
-            sub_block_target_names = output_names & set(op.output_arg_names)
-            sub_block_path = _get_sub_block_path(sub_block, op,
-                                                 set(), op_path_dict,
-                                                 sub_block_target_names)
-            op_path_dict[sub_block_id] = sub_block_path
-
-        if _some_in_set_(
-                op.desc.output_arg_names(),
-                output_names) and core.has_non_empty_grad_op_maker(op.type):
-            for name in op.desc.input_arg_names():
-                if name not in no_grad_set:
-                    output_names.add(name)
-        else:
-            relevant_op_flags[i] = False
+        input_relevant_ops, input_bounds = _reach_ops(
+            input_names, forward=True)
+        input_names = set(input_bounds)
+        relevant_ops = dict((idx, op) for idx, op in six.iteritems(relevant_ops)
+                            if idx in input_relevant_ops)
+
+    # ops owning sub-blocks are only possible if there are sub-blocks
+    if block.program.num_blocks > 1:
+        for i, op in reversed(list(enumerate(block.ops))):
+            if op.has_attr("sub_block"):
+                sub_block_id = op._block_attr_id("sub_block")
+                sub_block = block.program.block(sub_block_id)
+                # the names that ops after this op need
+                sub_block_target_names = set([
+                    name for name in op.output_arg_names
+                    if output_bounds.get(name, -1) > i
+                ])
+                sub_block_path = _get_sub_block_path(sub_block, op,
+                                                     set(), op_path_dict,
+                                                     sub_block_target_names)
+                op_path_dict[sub_block_id] = sub_block_path
 
     if is_while:
         # If block is while block, dealing with op specifically again.
         # TODO(liym27): Consider special types of ops.
-        for i, op in reversed(list(enumerate(block.ops))):
-            if relevant_op_flags[i] == False \
-                    and _some_in_set_(op.desc.output_arg_names(),output_names):
-                relevant_op_flags[i] = True
+        for name in output_bounds:
+            for op in block._producer_ops(name):
+                relevant_ops[positions[id(op)]] = op
 
-    op_path = [
-        block.ops[i] for i in range(len(block.ops)) if relevant_op_flags[i]
-    ]
+    op_path = [relevant_ops[idx] for idx in sorted(relevant_ops)]
 
     if inputs:
         for op in op_path:
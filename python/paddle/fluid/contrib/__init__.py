@@ -36,6 +36,10 @@ from . import mixed_precision
 from .mixed_precision import *
 from . import layers
 from .layers import *
+from . import shared_predictor
+from .shared_predictor import *
+from . import dynamic_batching
+from .dynamic_batching import *
 
 __all__ = []
 __all__ += decoder.__all__
@@ -48,3 +52,5 @@ __all__ += utils.__all__
 __all__ += extend_optimizer.__all__
 __all__ += ['mixed_precision']
 __all__ += layers.__all__
+__all__ += shared_predictor.__all__
+__all__ += dynamic_batching.__all__
@@ -0,0 +1,367 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+In-process dynamic batching of inference requests, which merges the small
+requests from many threads into batches, runs the model once per batch and
+splits the outputs back to the callers.
+"""
+
+from __future__ import print_function
+
+import threading
+import time
+
+import numpy as np
+import six
+from six.moves import queue
+
+from .shared_predictor import SharedWeightsPredictor
+
+__all__ = ['DynamicBatcher']
+
+_STOP = object()
+
+
+class _Request(object):
+    """
+    The handle of a submitted request, `result` waits for the outputs of it.
+    """
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.batch_size = inputs[0].shape[0]
+        self.signature = tuple((x.dtype.str, x.shape[1:]) for x in inputs)
+        self._event = threading.Event()
+        self._outputs = None
+        self._exception = None
+
+    def _set_result(self, outputs):
+        self._outputs = outputs
+        self._event.set()
+
+    def _set_exception(self, exception):
+        self._exception = exception
+        self._event.set()
+
+    def done(self):
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Wait for the outputs of the request.
+
+        Args:
+            timeout (float, optional): The max seconds to wait. Default None
+                means waiting until the request is run.
+
+        Returns:
+            list: The outputs of the request, a numpy array for each output
+            of the model, whose first dimension is the batch size of the
+            request.
+
+        Raises:
+            RuntimeError: If the request is not run in `timeout` seconds.
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError("The request is not finished in %s seconds" %
+                               timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._outputs
+
+
+class _LayerRunner(object):
+    def __init__(self, layer):
+        self._layer = layer
+
+    def __call__(self, inputs):
+        from ..dygraph.base import no_grad, to_variable
+        with no_grad():
+            outputs = self._layer(*[to_variable(x) for x in inputs])
+        if not isinstance(outputs, (list, tuple)):
+            outputs = [outputs]
+        return [output.numpy() for output in outputs]
+
+
+class DynamicBatcher(object):
+    """
+    DynamicBatcher serves the inference requests submitted from many threads.
+    Requests are queued, and each worker thread takes the requests in the
+    queue into a batch until it has `max_batch_size` samples or the first
+    request has waited for `timeout_ms`, runs the batch once and splits the
+    outputs back to the requests.
+
+    A request is a list of numpy arrays, one for each input of the model,
+    whose first dimension is the batch size of the request. Only requests
+    with the same dtypes and the same shapes except the first dimension are
+    merged, and the model should return outputs whose first dimension is the
+    batch size of the batch.
+
+    Args:
+        predict_fn (callable|list): The function running a batch, which takes
+            a list of numpy arrays and returns a list of numpy arrays. If it
+            is a list of functions, a worker thread is started for each of
+            them, otherwise `num_workers` threads call it concurrently.
+        max_batch_size (int, optional): The max number of samples in a batch,
+            a request larger than it is run as a batch alone. Default 32.
+        timeout_ms (float, optional): The max milliseconds to wait for more
+            requests after the first request of a batch is taken. Default 5.
+        num_workers (int, optional): The number of worker threads when
+            `predict_fn` is a function. Default 1.
+
+    Examples:
+        .. code-block:: python
+
+            import numpy as np
+            from paddle.fluid.contrib import DynamicBatcher
+
+            # the model saved by fluid.io.save_inference_model, with an
+            # input of shape [-1, 784]
+            with DynamicBatcher.from_inference_model(
+                    'mnist.inference.model', num_workers=2) as batcher:
+                # called concurrently in the threads serving requests
+                image = np.random.random([1, 784]).astype('float32')
+                prediction, = batcher.run([image])
+    """
+
+    def __init__(self,
+                 predict_fn,
+                 max_batch_size=32,
+                 timeout_ms=5.0,
+                 num_workers=1):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size should be positive, but got %s" %
+                             max_batch_size)
+        if isinstance(predict_fn, (list, tuple)):
+            predict_fns = list(predict_fn)
+        else:
+            predict_fns = [predict_fn] * num_workers
+        if not predict_fns:
+            raise ValueError("DynamicBatcher needs at least one worker")
+        self._max_batch_size = max_batch_size
+        self._timeout = timeout_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {'requests': 0, 'batches': 0, 'samples': 0}
+        self._workers = []
+        for fn in predict_fns:
+            worker = threading.Thread(target=self._work, args=(fn, ))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    @staticmethod
+    def from_inference_model(dirname,
+                             place=None,
+                             model_filename=None,
+                             params_filename=None,
+                             num_workers=1,
+                             max_batch_size=32,
+                             timeout_ms=5.0):
+        """
+        Create a DynamicBatcher serving the model saved by
+        :ref:`api_fluid_io_save_inference_model` . The parameters are loaded
+        once by a SharedWeightsPredictor, and each worker runs a
+        PredictorInstance of it. The inputs of requests are in the order of
+        the feed targets of the model.
+
+        Args:
+            dirname (str): The directory of the model.
+            place (CPUPlace|CUDAPlace, optional): The place to run the model.
+                Default None means CPUPlace.
+            model_filename (str, optional): The file name of the program, see
+                :ref:`api_fluid_io_load_inference_model` . Default None.
+            params_filename (str, optional): The file name of all parameters,
+                see :ref:`api_fluid_io_load_inference_model` . Default None.
+            num_workers (int, optional): The number of workers. Default 1.
+            max_batch_size (int, optional): Same as DynamicBatcher. Default 32.
+            timeout_ms (float, optional): Same as DynamicBatcher. Default 5.
+
+        Returns:
+            DynamicBatcher: The batcher serving the model, whose `feed_names`
+            and `fetch_names` are the names of the inputs and outputs.
+        """
+        predictor = SharedWeightsPredictor(
+            dirname,
+            place=place,
+            model_filename=model_filename,
+            params_filename=params_filename)
+        instances = [
+            predictor.create_instance() for _ in six.moves.range(num_workers)
+        ]
+        batcher = DynamicBatcher(
+            instances, max_batch_size=max_batch_size, timeout_ms=timeout_ms)
+        batcher.feed_names = predictor.feed_names
+        batcher.fetch_names = predictor.fetch_names
+        return batcher
+
+    @staticmethod
+    def from_layer(layer, max_batch_size=32, timeout_ms=5.0):
+        """
+        Create a DynamicBatcher serving a dygraph Layer, such as the
+        TranslatedLayer loaded by :ref:`api_imperative_jit_load` . The batches
+        are run by one worker since a Layer is not thread-safe, and the
+        dygraph mode should be kept enabled while serving.
+
+        Args:
+            layer (Layer): The Layer in eval mode, whose outputs are a
+                Variable or a list of Variables.
+            max_batch_size (int, optional): Same as DynamicBatcher. Default 32.
+            timeout_ms (float, optional): Same as DynamicBatcher. Default 5.
+
+        Returns:
+            DynamicBatcher: The batcher serving the layer.
+        """
+        return DynamicBatcher(
+            _LayerRunner(layer),
+            max_batch_size=max_batch_size,
+            timeout_ms=timeout_ms)
+
+    def submit(self, inputs):
+        """
+        Submit a request without waiting for it.
+
+        Args:
+            inputs (list): The numpy arrays of inputs, whose first dimension
+                is the batch size of the request.
+
+        Returns:
+            The handle of the request, whose `result(timeout=None)` waits for
+            and returns the list of outputs, or raises the error of running
+            the batch of it.
+        """
+        if isinstance(inputs, np.ndarray):
+            inputs = [inputs]
+        inputs = [np.asarray(x) for x in inputs]
+        if not inputs or any(x.ndim == 0 for x in inputs):
+            raise ValueError("The inputs of a request should be arrays with "
+                             "the batch dimension")
+        if any(x.shape[0] != inputs[0].shape[0] for x in inputs):
+            raise ValueError("The inputs of a request should have the same "
+                             "batch size, but got shapes %s" %
+                             [x.shape for x in inputs])
+        request = _Request(inputs)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The DynamicBatcher is closed")
+            self._stats['requests'] += 1
+            self._queue.put(request)
+        return request
+
+    def run(self, inputs, timeout=None):
+        """
+        Submit a request and wait for its outputs.
+
+        Args:
+            inputs (list): The numpy arrays of inputs, whose first dimension
+                is the batch size of the request.
+            timeout (float, optional): The max seconds to wait. Default None.
+
+        Returns:
+            list: The numpy arrays of outputs of the request.
+        """
+        return self.submit(inputs).result(timeout)
+
+    def stats(self):
+        """
+        Get the statistics of batching.
+
+        Returns:
+            dict: The numbers of 'requests', 'batches' and 'samples' run, and
+            'avg_batch_size' which is the average samples in a batch.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['avg_batch_size'] = float(stats['samples']) / stats[
+            'batches'] if stats['batches'] > 0 else 0.0
+        return stats
+
+    def close(self):
+        """
+        Stop the workers after the submitted requests are run.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._workers:
+                self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def _work(self, predict_fn):
+        pending = None
+        while True:
+            first = self._queue.get() if pending is None else pending
+            pending = None
+            if first is _STOP:
+                return
+            batch = [first]
+            batch_size = first.batch_size
+            deadline = time.time() + self._timeout
+            while batch_size < self._max_batch_size:
+                remaining = deadline - time.time()
+                try:
+                    if remaining > 0:
+                        request = self._queue.get(timeout=remaining)
+                    else:
+                        request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                # the request not fitting in is the first of next batch
+                if request is _STOP or request.signature != first.signature \
+                        or batch_size + request.batch_size > \
+                        self._max_batch_size:
+                    pending = request
+                    break
+                batch.append(request)
+                batch_size += request.batch_size
+            self._run_batch(predict_fn, batch, batch_size)
+
+    def _run_batch(self, predict_fn, batch, batch_size):
+        try:
+            if len(batch) == 1:
+                inputs = batch[0].inputs
+            else:
+                inputs = [
+                    np.concatenate([request.inputs[i] for request in batch])
+                    for i in six.moves.range(len(batch[0].inputs))
+                ]
+            outputs = [np.asarray(output) for output in predict_fn(inputs)]
+            for output in outputs:
+                if output.ndim == 0 or output.shape[0] != batch_size:
+                    raise ValueError(
+                        "The outputs should have the batch dimension of "
+                        "size %d, but got shape %s" %
+                        (batch_size, output.shape))
+        except Exception as e:
+            for request in batch:
+                request._set_exception(e)
+        else:
+            offset = 0
+            for request in batch:
+                end = offset + request.batch_size
+                request._set_result([output[offset:end] for output in outputs])
+                offset = end
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['samples'] += batch_size
@@ -27,7 +27,7 @@ import six
 from .. import core
 from ..framework import Program, Variable
 
-__all__ = ['memory_usage']
+__all__ = ['memory_usage', 'peak_memory_usage', 'PeakMemoryUsage']
 
 dtype_to_size = {
     core.VarDesc.VarType.FP16: 2,
@@ -47,6 +47,10 @@ def memory_usage(program, batch_size):
     """
     Get the estimate memory usage of program with input batch size.
 
+    It sums up all LoDTensor outputs of the global block, see
+    :code:`peak_memory_usage` for an estimation considering the lifetime
+    of variables.
+
     Args:
         program(Program): The current Program.
         batch_size(int): The current input data batch_size.
@@ -119,3 +123,175 @@ def memory_usage(program, batch_size):
     max_total_memory = total_memory * 1.1
 
     return min_total_memory, max_total_memory, unit_str
+
+
+class PeakMemoryUsage(object):
+    """
+    The result of :code:`peak_memory_usage`, all sizes are in bytes.
+
+    Attributes:
+        persistable_bytes(int): the size of persistable variables, such as
+            parameters and optimizer states, which are alive all the time.
+        timeline(list<int>): the size of alive non-persistable variables
+            while running each op of the global block.
+        peak_bytes(int): the peak memory usage, which is persistable_bytes
+            plus the max of timeline.
+        peak_step(int): the index of the op in global block reaching peak.
+        peak_op(Operator): the op reaching peak.
+        peak_vars(list): (name, bytes) of the non-persistable variables
+            alive at peak, sorted by size in descending order.
+    """
+
+    def __init__(self, persistable_bytes, timeline, peak_step, peak_op,
+                 peak_vars):
+        self.persistable_bytes = persistable_bytes
+        self.timeline = timeline
+        self.peak_step = peak_step
+        self.peak_op = peak_op
+        self.peak_vars = peak_vars
+        self.peak_bytes = persistable_bytes + (timeline[peak_step]
+                                               if timeline else 0)
+
+
+def _var_bytes(var, batch_size):
+    if var.type != core.VarDesc.VarType.LOD_TENSOR:
+        return 0
+    numel = 1
+    batch_dim_found = False
+    for x in var.shape:
+        if x < 0:
+            # the first unknown dim is the batch dim, others (e.g. the
+            # length of sequence) are unknown and treated as 1
+            if not batch_dim_found:
+                numel *= batch_size * (-x)
+                batch_dim_found = True
+        else:
+            numel *= x
+    return numel * core.size_of_dtype(var.dtype)
+
+
+def _sub_block_ids(op):
+    ids = []
+    for name in op.desc.attr_names():
+        attr_type = op.desc.attr_type(name)
+        if attr_type == core.AttrType.BLOCK:
+            ids.append(op._block_attr_id(name))
+        elif attr_type == core.AttrType.BLOCKS:
+            ids.extend(op._blocks_attr_ids(name))
+    return ids
+
+
+def _block_var_names(program, block_id, cache):
+    """
+    Get names of all variables used by a sub block and its sub blocks.
+    """
+    if block_id not in cache:
+        names = set()
+        for op in program.block(block_id).ops:
+            names.update(op.input_arg_names)
+            names.update(op.output_arg_names)
+            for sub_id in _sub_block_ids(op):
+                names.update(_block_var_names(program, sub_id, cache))
+        cache[block_id] = names
+    return cache[block_id]
+
+
+def peak_memory_usage(program, batch_size):
+    """
+    Estimate the peak memory usage of running program with input batch
+    size, by the lifetime of variables.
+
+    Ops in the global block are walked in order, a non-persistable
+    variable is alive from the op it is first used to the op it is last
+    used, which is when it is released by garbage collection. Variables
+    used in the sub blocks of an op (e.g. while, conditional_block) are
+    considered used by that op. Persistable variables are alive all the
+    time. Only LoDTensors are counted, and the first negative dim of
+    shapes is taken as batch size.
+
+    Args:
+        program(Program): The program to estimate.
+        batch_size(int): The input data batch_size.
+
+    Returns:
+        PeakMemoryUsage: the peak usage, the op reaching peak and the
+            memory usage of each op.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle.fluid as fluid
+
+            x = fluid.data(name='x', shape=[None, 13], dtype='float32')
+            y = fluid.layers.fc(input=x, size=1)
+            loss = fluid.layers.mean(y)
+            fluid.optimizer.SGD(learning_rate=0.01).minimize(loss)
+
+            usage = fluid.contrib.peak_memory_usage(
+                fluid.default_main_program(), batch_size=10)
+            print("peak memory usage: %d bytes at op %s" %
+                  (usage.peak_bytes, usage.peak_op.type))
+    """
+    if not isinstance(program, Program):
+        raise TypeError(
+            "Calculating Memory Usage requires Program as its Parameter."
+            "But you passed in %s" % (type(program)))
+    if batch_size <= 0:
+        raise ValueError("The batch size need to be positive.")
+
+    # the var of global block wins if names conflict
+    all_vars = {}
+    for block in reversed(program.blocks):
+        all_vars.update(block.vars)
+
+    ops = program.global_block().ops
+    first_use = {}
+    last_use = {}
+    sub_block_cache = {}
+    for step, op in enumerate(ops):
+        names = op.input_arg_names + op.output_arg_names
+        for sub_id in _sub_block_ids(op):
+            names.extend(_block_var_names(program, sub_id, sub_block_cache))
+        for name in names:
+            if name not in first_use:
+                first_use[name] = step
+            last_use[name] = step
+
+    persistable_bytes = 0
+    for var in six.itervalues(program.global_block().vars):
+        if var.persistable:
+            persistable_bytes += _var_bytes(var, batch_size)
+
+    # add the size of a variable at its first use and subtract it after
+    # its last use, fed data is alive before running the first op
+    delta = [0] * (len(ops) + 1)
+    lifetimes = {}
+    for name, start in six.iteritems(first_use):
+        var = all_vars.get(name)
+        if var is None or var.persistable:
+            continue
+        size = _var_bytes(var, batch_size)
+        if size == 0:
+            continue
+        if var.is_data:
+            start = 0
+        lifetimes[name] = (start, last_use[name], size)
+        delta[start] += size
+        delta[last_use[name] + 1] -= size
+
+    timeline = []
+    alive = 0
+    for step in range(len(ops)):
+        alive += delta[step]
+        timeline.append(alive)
+
+    if not timeline:
+        return PeakMemoryUsage(persistable_bytes, timeline, 0, None, [])
+    peak_step = max(range(len(timeline)), key=lambda i: timeline[i])
+    peak_vars = sorted(
+        [(name, size) for name, (start, end, size) in six.iteritems(lifetimes)
+         if start <= peak_step <= end],
+        key=lambda v: -v[1])
+    return PeakMemoryUsage(persistable_bytes, timeline, peak_step,
+                           ops[peak_step], peak_vars)
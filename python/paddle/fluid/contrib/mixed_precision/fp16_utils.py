@@ -48,71 +48,149 @@ def _dtype_to_str(dtype):
         return 'fp32'
 
 
-def _insert_cast_op(block, op, idx, src_dtype, dest_dtype):
+class _CastInserter(object):
     """
-    Insert cast op and rename args of input and output.
+    Insert the cast ops needed by the ops of a block, walking the ops in
+    order. It tracks the version of each variable, i.e. the number of ops
+    writing it so far, so that:
 
-    Args:
-        block (Program): The block in which the operator is.
-        op (Operator): The operator to insert cast op.
-        idx (int): The index of current operator.
-        src_dtype (VarType): The input variable dtype of cast op.
-        dest_dtype (VarType): The output variable dtype of cast op.
+    1. A variable is cast to a dtype once for each version, and the casts
+       are shared by all the ops reading that version.
+    2. A variable cast from fp16 to fp32 is not cast back, the ops needing
+       it in fp16 read the fp16 variable instead.
+    3. The casts of persistable variables not written before, e.g.
+       parameters, are put together at the front of the block.
 
-    Returns:
-        num_cast_op (int): The number of cast ops that have been inserted.
+    The cast ops are recorded and inserted at one go by `apply`.
+
+    Args:
+        block (Block): The block to rewrite.
     """
-    num_cast_ops = 0
+
     valid_types = [
         core.VarDesc.VarType.LOD_TENSOR, core.VarDesc.VarType.SELECTED_ROWS,
         core.VarDesc.VarType.LOD_TENSOR_ARRAY
     ]
 
-    for in_name in op.input_names:
-        if src_dtype == core.VarDesc.VarType.FP32 and op.type == 'batch_norm':
-            if in_name != 'X':
-                continue
-        for in_var_name in op.input(in_name):
-            in_var = block.var(in_var_name)
-            if in_var.type not in valid_types:
-                continue
-            if in_var.dtype == src_dtype:
-                cast_name = in_var.name + '.cast_' + _dtype_to_str(dest_dtype)
-                out_var = block.vars.get(cast_name)
-                if out_var is None or out_var.dtype != dest_dtype:
-                    out_var = block.create_var(
-                        name=cast_name,
-                        dtype=dest_dtype,
-                        persistable=False,
-                        stop_gradient=False)
-
-                    block._insert_op(
-                        idx,
-                        type="cast",
-                        inputs={"X": in_var},
-                        outputs={"Out": out_var},
-                        attrs={
-                            "in_dtype": in_var.dtype,
-                            "out_dtype": out_var.dtype
-                        })
-                    num_cast_ops += 1
-                _rename_arg(op, in_var.name, out_var.name)
-            else:
-                if op.has_attr('in_dtype'):
-                    op._set_attr('in_dtype', dest_dtype)
-    if src_dtype == core.VarDesc.VarType.FP32:
-        for out_name in op.output_names:
-            if op.type == 'batch_norm' and out_name != 'Y':
-                continue
-            for out_var_name in op.output(out_name):
-                out_var = block.var(out_var_name)
-                if out_var.type not in valid_types:
+    def __init__(self, block):
+        self.block = block
+        self.versions = {}
+        # (var name, version, dtype) -> name of the cast var
+        self.casts = {}
+        # name of var cast from fp16 to fp32 -> (fp16 var name, its version,
+        # version of the cast var)
+        self.widened = {}
+        # (index, kwargs) of cast ops to insert
+        self.cast_ops = []
+        self.num_round_trips = 0
+
+    def _cast_var_name(self, var_name, dtype):
+        name = var_name + '.cast_' + _dtype_to_str(dtype)
+        suffix = 0
+        while self.block.has_var(name):
+            suffix += 1
+            name = '%s.cast_%s_%d' % (var_name, _dtype_to_str(dtype), suffix)
+        return name
+
+    def _cast_var(self, op, idx, in_var, dest_dtype):
+        """
+        Get the name of the variable holding in_var in dest_dtype for op.
+        """
+        version = self.versions.get(in_var.name, 0)
+        origin = self.widened.get(in_var.name)
+        if dest_dtype == core.VarDesc.VarType.FP16 and origin is not None \
+                and origin[2] == version \
+                and self.versions.get(origin[0], 0) == origin[1] \
+                and in_var.name not in op.output_arg_names:
+            self.num_round_trips += 1
+            return origin[0]
+
+        key = (in_var.name, version, dest_dtype)
+        if key not in self.casts:
+            out_var = self.block.create_var(
+                name=self._cast_var_name(in_var.name, dest_dtype),
+                dtype=dest_dtype,
+                persistable=False,
+                stop_gradient=False)
+            if in_var.persistable and version == 0:
+                idx = 0
+            self.cast_ops.append((idx, dict(
+                type="cast",
+                inputs={"X": in_var},
+                outputs={"Out": out_var},
+                attrs={"in_dtype": in_var.dtype,
+                       "out_dtype": out_var.dtype})))
+            if in_var.dtype == core.VarDesc.VarType.FP16:
+                self.widened[out_var.name] = (in_var.name, version, 0)
+            self.casts[key] = out_var.name
+        return self.casts[key]
+
+    def insert(self, op, idx, src_dtype, dest_dtype):
+        """
+        Cast the src_dtype inputs of op to dest_dtype, and rename args of
+        input and output.
+
+        Args:
+            op (Operator): The operator to insert cast op.
+            idx (int): The index of current operator.
+            src_dtype (VarType): The input variable dtype of cast op.
+            dest_dtype (VarType): The output variable dtype of cast op.
+        """
+        block = self.block
+        for in_name in op.input_names:
+            if src_dtype == core.VarDesc.VarType.FP32 and \
+                    op.type == 'batch_norm':
+                if in_name != 'X':
+                    continue
+            for in_var_name in op.input(in_name):
+                in_var = block.var(in_var_name)
+                if in_var.type not in self.valid_types:
                     continue
-                if out_var.dtype == core.VarDesc.VarType.FP32:
-                    out_var.desc.set_dtype(core.VarDesc.VarType.FP16)
-                    if op.has_attr('out_dtype'):
-                        op._set_attr('out_dtype', core.VarDesc.VarType.FP16)
-    return num_cast_ops
+                if in_var.dtype == src_dtype:
+                    _rename_arg(op, in_var.name,
+                                self._cast_var(op, idx, in_var, dest_dtype))
+                else:
+                    if op.has_attr('in_dtype'):
+                        op._set_attr('in_dtype', dest_dtype)
+        if src_dtype == core.VarDesc.VarType.FP32:
+            for out_name in op.output_names:
+                if op.type == 'batch_norm' and out_name != 'Y':
+                    continue
+                for out_var_name in op.output(out_name):
+                    out_var = block.var(out_var_name)
+                    if out_var.type not in self.valid_types:
+                        continue
+                    if out_var.dtype == core.VarDesc.VarType.FP32:
+                        out_var.desc.set_dtype(core.VarDesc.VarType.FP16)
+                        if op.has_attr('out_dtype'):
+                            op._set_attr('out_dtype',
+                                         core.VarDesc.VarType.FP16)
+
+    def update(self, op):
+        """
+        Update the versions of the outputs of op after it is visited.
+        """
+        for out_var_name in op.output_arg_names:
+            self.versions[out_var_name] = \
+                self.versions.get(out_var_name, 0) + 1
+        if op.type == 'cast':
+            in_var = self.block.var(op.input('X')[0])
+            out_var = self.block.var(op.output('Out')[0])
+            if in_var.dtype == core.VarDesc.VarType.FP16 and \
+                    out_var.dtype == core.VarDesc.VarType.FP32:
+                self.widened[out_var.name] = (
+                    in_var.name, self.versions.get(in_var.name, 0),
+                    self.versions[out_var.name])
+
+    def apply(self):
+        """
+        Insert the recorded cast ops into the block.
+
+        Returns:
+            int: The number of cast ops inserted.
+        """
+        self.block._insert_ops(self.cast_ops)
+        return len(self.cast_ops)
 
 
 def find_true_prev_op(ops, cur_op, var_name):
@@ -204,11 +282,21 @@ def rewrite_program(main_prog, amp_lists):
        computed in fp32 mode, while white set op will be computed in 
        fp16 mode.
 
+    The casts are computed by walking the ops once, each variable is cast
+    to a dtype once for each time it is written, variables cast from fp16
+    to fp32 are not cast back to fp16, and the casts of parameters are put
+    at the front of the block. All the cast ops are inserted at one go.
+
     Args:
         main_prog (Program): The main program for training.
+        amp_lists (AutoMixedPrecisionLists): An AutoMixedPrecisionLists object.
+
+    Returns:
+        tuple: The number of cast ops in the block before and after the
+            rewrite.
     """
     block = main_prog.global_block()
-    ops = block.ops
+    ops = list(block.ops)
     white_op_set = set()
     black_op_set = set()
     for op in ops:
@@ -256,22 +344,19 @@ def rewrite_program(main_prog, amp_lists):
             # are not determined which list they should stay.
             black_op_set.add(op)
 
-    idx = 0
-    while idx < len(ops):
-        op = ops[idx]
-        num_cast_ops = 0
+    num_cast_ops_before = len([op for op in ops if op.type == 'cast'])
+    inserter = _CastInserter(block)
+    for idx, op in enumerate(ops):
         if op in black_op_set:
-            num_cast_ops = _insert_cast_op(block, op, idx,
-                                           core.VarDesc.VarType.FP16,
-                                           core.VarDesc.VarType.FP32)
+            inserter.insert(op, idx, core.VarDesc.VarType.FP16,
+                            core.VarDesc.VarType.FP32)
         elif op in white_op_set:
-            num_cast_ops = _insert_cast_op(block, op, idx,
-                                           core.VarDesc.VarType.FP32,
-                                           core.VarDesc.VarType.FP16)
-        else:
-            pass
-
-        idx += num_cast_ops + 1
+            inserter.insert(op, idx, core.VarDesc.VarType.FP32,
+                            core.VarDesc.VarType.FP16)
+        inserter.update(op)
+    inserter.apply()
+    num_cast_ops_after = len([op for op in block.ops if op.type == 'cast'])
+    return num_cast_ops_before, num_cast_ops_after
 
 
 def update_role_var_grad(main_prog, params_grads):
@@ -20,7 +20,7 @@ Example:
     | No. |       TYPE |          INPUT |         OUTPUT |  PARAMs |      FLOPs |
     +-----+------------+----------------+----------------+---------+------------+
     |   0 |     conv2d |  (3, 200, 200) | (64, 100, 100) |    9408 |  188160000 |
-    |   1 | batch_norm | (64, 100, 100) | (64, 100, 100) |     256 |     640000 |
+    |   1 | batch_norm | (64, 100, 100) | (64, 100, 100) |     256 |    1280000 |
     |   2 |       relu | (64, 100, 100) | (64, 100, 100) |       0 |     640000 |
     |   3 |     pool2d | (64, 100, 100) |   (64, 50, 50) |       0 |    1440000 |
     ...
@@ -30,17 +30,39 @@ Example:
     | 179 |       relu |   (2048, 7, 7) |   (2048, 7, 7) |       0 |     100352 |
     | 180 |     pool2d |   (2048, 7, 7) |   (2048, 1, 1) |       0 |     100352 |
     +-----+------------+----------------+----------------+---------+------------+
-    Total PARAMs: 48017344(0.0480G)
-    Total FLOPs: 11692747751(11.69G)
+    Total PARAMs: 48017344(48.0173M)
+    Total FLOPs: 11701848423(11.70G)
+
+For FLOPs, params and activation memory traffic of every op and name scope,
+use profile_program for Program and profile_layer for dygraph Layer.
 '''
 from collections import OrderedDict
+from functools import partial
+
+import six
 from prettytable import PrettyTable
 
+from .. import core
+from ..framework import Parameter, in_dygraph_mode
+from ..dygraph.base import no_grad
+
+__all__ = [
+    'summary', 'profile_program', 'profile_layer', 'register_op_flops',
+    'register_layer_flops', 'ModelProfile'
+]
+
+# op type -> function(op) computing FLOPs of the op, the op is an _OpView
+_OP_FLOPS = {}
+# class name of Layer -> function(layer, input_shapes, output_shapes)
+_LAYER_FLOPS = {}
+
 
 def summary(main_prog):
     '''
     It can summary model's PARAMS, FLOPs until now.
     It support common operator like conv, fc, pool, relu, sigmoid, bn etc. 
+    The ops and the FLOPs counted are kept as they were, use profile_program
+    to count FLOPs of all the ops with the rules of register_op_flops.
     Args:
         main_prog: main program 
     Returns:
@@ -140,6 +162,671 @@ def _summary_model(block_vars, one_op):
     return in_data_shape, out_data_shape, params, flops
 
 
+def register_op_flops(*op_types):
+    '''
+    Register a function computing FLOPs of ops, it is used as a decorator.
+    The function takes an op whose :code:`input(slot)` and
+    :code:`output(slot)` return lists of shapes, and :code:`attr(name,
+    default)` returns attributes. A multiply-add counts as 2 FLOPs.
+
+    The FLOPs of a grad op :code:`{type}_grad` are taken as twice of its
+    forward op if not registered.
+
+    Args:
+        op_types(str): the op types computed by the function.
+
+    Examples:
+        .. code-block:: python
+
+            from paddle.fluid.contrib.model_stat import register_op_flops
+
+            @register_op_flops('my_op')
+            def my_op_flops(op):
+                return 2 * np.prod(op.output('Out')[0])
+    '''
+
+    def decorator(func):
+        for op_type in op_types:
+            _OP_FLOPS[op_type] = func
+        return func
+
+    return decorator
+
+
+def register_layer_flops(*class_names):
+    '''
+    Register a function computing FLOPs of dygraph Layers by their class
+    names, it is used as a decorator. The function takes the layer, the
+    shapes of its inputs and the shapes of its outputs.
+
+    Args:
+        class_names(str): the class names of layers computed by the
+            function, subclasses are computed by it too.
+    '''
+
+    def decorator(func):
+        for class_name in class_names:
+            _LAYER_FLOPS[class_name] = func
+        return func
+
+    return decorator
+
+
+class _OpView(object):
+    """
+    Shapes and attributes of an op, from a static op or a dygraph layer.
+    """
+
+    def __init__(self, type, inputs, outputs, attrs=None):
+        self.type = type
+        self._inputs = inputs
+        self._outputs = outputs
+        self._attrs = attrs
+
+    def input(self, slot):
+        return self._inputs.get(slot, [])
+
+    def output(self, slot):
+        return self._outputs.get(slot, [])
+
+    def attr(self, name, default=None):
+        if self._attrs is None:
+            return default
+        if isinstance(self._attrs, dict):
+            return self._attrs.get(name, default)
+        # a static op
+        if not self._attrs.has_attr(name):
+            return default
+        return self._attrs.attr(name)
+
+
+def _numel(shape):
+    numel = 1
+    for x in shape:
+        numel *= x
+    return numel
+
+
+def _first_output(op):
+    for slot in ['Out', 'Y', 'Output']:
+        if op.output(slot):
+            return op.output(slot)[0]
+    raise ValueError("Can not find the output of op %s" % op.type)
+
+
+@register_op_flops('conv2d', 'depthwise_conv2d', 'conv3d')
+def _conv_flops(op):
+    # filter is [c_out, c_in / groups, k_h, k_w]
+    kernel = _numel(op.input('Filter')[0][1:])
+    out = _numel(op.output('Output')[0])
+    flops = 2 * out * kernel
+    if op.input('Bias'):
+        flops += out
+    return flops
+
+
+@register_op_flops('conv2d_transpose', 'depthwise_conv2d_transpose',
+                   'conv3d_transpose')
+def _conv_transpose_flops(op):
+    # filter is [c_in, c_out / groups, k_h, k_w]
+    kernel = _numel(op.input('Filter')[0][1:])
+    flops = 2 * _numel(op.input('Input')[0]) * kernel
+    if op.input('Bias'):
+        flops += _numel(op.output('Output')[0])
+    return flops
+
+
+@register_op_flops('mul')
+def _mul_flops(op):
+    x = op.input('X')[0]
+    y = op.input('Y')[0]
+    x_num_col_dims = op.attr('x_num_col_dims', 1)
+    y_num_col_dims = op.attr('y_num_col_dims', 1)
+    return 2 * _numel(x[:x_num_col_dims]) * _numel(x[
+        x_num_col_dims:]) * _numel(y[y_num_col_dims:])
+
+
+@register_op_flops('fc')
+def _fc_flops(op):
+    x = op.input('Input')[0]
+    w = op.input('W')[0]
+    in_num_col_dims = op.attr('in_num_col_dims', 1)
+    rows = _numel(x[:in_num_col_dims])
+    flops = 2 * rows * _numel(x[in_num_col_dims:]) * w[1]
+    if op.input('Bias'):
+        flops += rows * w[1]
+    return flops
+
+
+@register_op_flops('matmul', 'matmul_v2', 'bmm')
+def _matmul_flops(op):
+    x = op.input('X')[0]
+    transpose_x = op.attr('transpose_X', op.attr('trans_x', False))
+    if len(x) == 1:
+        k = x[0]
+    else:
+        k = x[-2] if transpose_x else x[-1]
+    return 2 * _numel(op.output('Out')[0]) * k
+
+
+@register_op_flops('multihead_matmul')
+def _multihead_matmul_flops(op):
+    # input is [batch, seq_len, hidden], w is [hidden, 3, hidden]
+    x = op.input('Input')[0]
+    hidden = x[-1]
+    tokens = _numel(x[:-1])
+    seq_len = x[-2] if len(x) > 2 else 1
+    heads = op.attr('head_number', 1)
+    # projection of query, key and value
+    flops = 2 * tokens * _numel(op.input('W')[0]) + 3 * tokens * hidden
+    # attention scores, softmax and the weighted sum of values
+    flops += 2 * tokens * seq_len * hidden
+    flops += 3 * tokens * seq_len * heads
+    flops += 2 * tokens * seq_len * hidden
+    return flops
+
+
+@register_op_flops('fused_embedding_eltwise_layernorm')
+def _fused_embedding_flops(op):
+    out = _numel(op.output('Out')[0])
+    return out * (len(op.input('Ids')) - 1) + 7 * out
+
+
+_ELEMENTWISE_OPS = [
+    'elementwise_add', 'elementwise_sub', 'elementwise_mul',
+    'elementwise_div', 'elementwise_max', 'elementwise_min',
+    'elementwise_pow', 'relu', 'relu6', 'sigmoid', 'tanh', 'leaky_relu',
+    'prelu', 'elu', 'gelu', 'swish', 'hard_swish', 'hard_sigmoid', 'softplus',
+    'softsign', 'exp', 'log', 'sqrt', 'rsqrt', 'square', 'abs', 'scale',
+    'dropout', 'clip', 'pow'
+]
+
+
+@register_op_flops(*_ELEMENTWISE_OPS)
+def _elementwise_flops(op):
+    return _numel(_first_output(op))
+
+
+@register_op_flops('sum')
+def _sum_flops(op):
+    return _numel(op.output('Out')[0]) * (len(op.input('X')) - 1)
+
+
+@register_op_flops('softmax', 'log_softmax', 'sequence_softmax')
+def _softmax_flops(op):
+    # exp, sum and div
+    return 3 * _numel(op.input('X')[0])
+
+
+@register_op_flops('softmax_with_cross_entropy')
+def _softmax_with_cross_entropy_flops(op):
+    return 4 * _numel(op.input('Logits')[0])
+
+
+@register_op_flops('cross_entropy', 'cross_entropy2')
+def _cross_entropy_flops(op):
+    return _numel(op.input('X')[0])
+
+
+@register_op_flops('batch_norm', 'sync_batch_norm')
+def _batch_norm_flops(op):
+    numel = _numel(op.input('X')[0])
+    if op.attr('is_test', False) or op.attr('use_global_stats', False):
+        # normalize by saved statistics, scale and shift
+        return 2 * numel
+    return 7 * numel
+
+
+@register_op_flops('layer_norm', 'instance_norm', 'group_norm')
+def _norm_flops(op):
+    # mean (1), variance (2), normalize (2), scale and shift (2)
+    return 7 * _numel(op.input('X')[0])
+
+
+@register_op_flops('pool2d', 'pool3d')
+def _pool_flops(op):
+    if op.attr('global_pooling', False) or op.attr('adaptive', False):
+        return _numel(op.input('X')[0])
+    return _numel(op.output('Out')[0]) * _numel(op.attr('ksize'))
+
+
+@register_op_flops('reduce_sum', 'reduce_mean', 'reduce_max', 'reduce_min',
+                   'reduce_prod', 'mean', 'sequence_pool')
+def _reduce_flops(op):
+    return _numel(op.input('X')[0])
+
+
+@register_op_flops('sequence_conv')
+def _sequence_conv_flops(op):
+    x = op.input('X')[0]
+    f = op.input('Filter')[0]
+    return 2 * _numel(x[:-1]) * f[0] * f[1]
+
+
+@register_op_flops('lstm', 'gru')
+def _rnn_flops(op):
+    # input is the projected [T, 4D] or [T, 3D], weight is [D, 4D] or [D, 3D]
+    rows = _numel(op.input('Input')[0][:-1])
+    w = op.input('Weight')[0]
+    return 2 * rows * w[0] * w[1] + rows * w[1]
+
+
+# ops moving data only
+@register_op_flops(
+    'lookup_table', 'lookup_table_v2', 'reshape2', 'transpose2', 'concat',
+    'split', 'slice', 'gather', 'squeeze2', 'unsqueeze2', 'flatten2', 'stack',
+    'expand', 'cast', 'assign', 'feed', 'fetch', 'fill_constant', 'shape',
+    'sequence_expand', 'sequence_expand_as', 'sequence_concat',
+    'sequence_reshape', 'sequence_pad', 'sequence_unpad')
+def _zero_flops(op):
+    return 0
+
+
+def _op_flops(op):
+    """
+    Returns FLOPs of op, or None if it is not supported.
+    """
+    scale = 1
+    if op.type not in _OP_FLOPS and op.type.endswith('_grad'):
+        # forward inputs and grads of forward outputs are inputs of grad op
+        inputs = {}
+        outputs = {}
+        for slot, shapes in six.iteritems(op._inputs):
+            if slot.endswith(core.grad_var_suffix()):
+                outputs[slot[:-len(core.grad_var_suffix())]] = shapes
+            else:
+                inputs[slot] = shapes
+        op = _OpView(op.type[:-len('_grad')], inputs, outputs, op._attrs)
+        scale = 2
+    if op.type not in _OP_FLOPS:
+        return None
+    try:
+        return scale * int(_OP_FLOPS[op.type](op))
+    except (IndexError, KeyError, ValueError, TypeError):
+        # the shapes needed are missing, e.g. not LoDTensors
+        return None
+
+
+def _tensor_bytes(shape, dtype):
+    return _numel(shape) * core.size_of_dtype(dtype)
+
+
+class ModelProfile(object):
+    """
+    The result of :code:`profile_program` and :code:`profile_layer`.
+
+    Attributes:
+        ops(list<dict>): the statistics of each op (or leaf layer of
+            dygraph) with keys type, scope, input_shape, output_shape,
+            flops, params, bytes and supported. bytes is the size of
+            non-parameter inputs and outputs, i.e. the activation memory
+            traffic. supported is False if FLOPs of the op is unknown.
+        scopes(OrderedDict): the total flops, params and bytes of ops in
+            each name scope, including all its parent scopes.
+        total(dict): the total flops, params and bytes.
+    """
+
+    def __init__(self, separator):
+        self.ops = []
+        self.scopes = OrderedDict()
+        self.total = {'flops': 0, 'params': 0, 'bytes': 0}
+        self._separator = separator
+        self._params = {}
+
+    def _parent_scopes(self, scope):
+        parts = scope.strip(self._separator).split(self._separator)
+        scopes = ['']
+        for i in range(len(parts)):
+            if parts[i]:
+                scopes.append(self._separator.join(parts[:i + 1]))
+        return scopes
+
+    def _add(self, type, scope, input_shape, output_shape, flops, params,
+             bytes):
+        """
+        params is a dict from parameter names to sizes, parameters shared
+        by ops are counted once.
+        """
+        scopes = self._parent_scopes(scope)
+        self.ops.append({
+            'type': type,
+            'scope': scopes[-1],
+            'input_shape': input_shape,
+            'output_shape': output_shape,
+            'flops': flops or 0,
+            'params': sum(params.values()),
+            'bytes': bytes,
+            'supported': flops is not None,
+        })
+        for name in scopes:
+            if name not in self.scopes:
+                self.scopes[name] = {'flops': 0, 'params': 0, 'bytes': 0}
+                self._params[name] = set()
+            stat = self.scopes[name]
+            stat['flops'] += flops or 0
+            stat['bytes'] += bytes
+            for param, size in six.iteritems(params):
+                if param not in self._params[name]:
+                    self._params[name].add(param)
+                    stat['params'] += size
+        self.total = self.scopes['']
+
+    def unsupported_types(self):
+        """
+        Get the op types whose FLOPs are unknown.
+        """
+        return sorted(set(o['type'] for o in self.ops if not o['supported']))
+
+    def summary(self, max_depth=None):
+        """
+        Print FLOPs, params, bytes and arithmetic intensity (FLOPs per
+        byte) of each scope.
+
+        Args:
+            max_depth(int|None): only print scopes not deeper than it.
+                None means printing all scopes. Default None.
+        """
+        table = PrettyTable(
+            ["SCOPE", "PARAMs", "FLOPs", "BYTEs", "FLOPs/BYTE"])
+        table.align = 'r'
+        table.align["SCOPE"] = 'l'
+        for name, stat in six.iteritems(self.scopes):
+            depth = len(self._parent_scopes(name)) - 1
+            if max_depth is not None and depth > max_depth:
+                continue
+            intensity = float(stat['flops']) / stat['bytes'] if stat[
+                'bytes'] else 0.0
+            table.add_row([
+                '  ' * depth + (name or '(total)'), stat['params'],
+                stat['flops'], stat['bytes'], '{:.2f}'.format(intensity)
+            ])
+        print(table)
+        unsupported = self.unsupported_types()
+        if unsupported:
+            print("Notice: FLOPs of ops {} are not counted".format(
+                unsupported))
+
+
+def _static_shape(var, batch_size):
+    shape = list(var.shape)
+    batch_dim_found = False
+    for i, x in enumerate(shape):
+        if x < 0:
+            # the first unknown dim is the batch dim, others are unknown
+            # and taken as 1
+            shape[i] = 1 if batch_dim_found else batch_size * (-x)
+            batch_dim_found = True
+    return shape
+
+
+def _static_slots(slots, get_names, all_vars, batch_size, shapes):
+    """
+    Get shapes of LoDTensors in slots, shapes of all the tensors are also
+    put into shapes by their names.
+    """
+    views = {}
+    for slot in slots:
+        views[slot] = []
+        for name in get_names(slot):
+            var = all_vars.get(name)
+            if var is None or var.type != core.VarDesc.VarType.LOD_TENSOR:
+                continue
+            if name not in shapes:
+                shapes[name] = _static_shape(var, batch_size)
+            views[slot].append(shapes[name])
+    return views
+
+
+def profile_program(program, batch_size=1):
+    """
+    Profile FLOPs, params and activation memory traffic of each op of a
+    static program, ops of all blocks are counted once.
+
+    Args:
+        program(Program): the program to profile.
+        batch_size(int): the batch size used as the first negative dim of
+            shapes. Default 1.
+
+    Returns:
+        ModelProfile: the statistics of ops and name scopes.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle.fluid as fluid
+            from paddle.fluid.contrib.model_stat import profile_program
+
+            x = fluid.data(name='x', shape=[None, 3, 32, 32], dtype='float32')
+            with fluid.name_scope('backbone'):
+                y = fluid.layers.conv2d(x, num_filters=8, filter_size=3)
+            with fluid.name_scope('head'):
+                y = fluid.layers.fc(y, size=10)
+
+            profile = profile_program(fluid.default_main_program(), batch_size=8)
+            profile.summary()
+    """
+    all_vars = {}
+    for block in reversed(program.blocks):
+        all_vars.update(block.vars)
+
+    profile = ModelProfile('/')
+    for block in program.blocks:
+        for op in block.ops:
+            shapes = OrderedDict()
+            inputs = _static_slots(op.input_names, op.input, all_vars,
+                                   batch_size, shapes)
+            num_inputs = len(shapes)
+            outputs = _static_slots(op.output_names, op.output, all_vars,
+                                    batch_size, shapes)
+
+            param_sizes = {}
+            activations = []
+            num_bytes = 0
+            for i, (name, shape) in enumerate(six.iteritems(shapes)):
+                var = all_vars[name]
+                if i < num_inputs and isinstance(var, Parameter):
+                    param_sizes[name] = _numel(shape)
+                    continue
+                activations.append((i < num_inputs, shape))
+                num_bytes += _tensor_bytes(shape, var.dtype)
+
+            input_shape = next((s for is_in, s in activations if is_in), [])
+            output_shape = next((s for is_in, s in activations if not is_in),
+                                [])
+            scope = op.attr('op_namescope') if op.has_attr(
+                'op_namescope') else '/'
+            view = _OpView(op.type, inputs, outputs, op)
+            profile._add(op.type, scope, input_shape, output_shape,
+                         _op_flops(view), param_sizes, num_bytes)
+    return profile
+
+
+@register_layer_flops('Linear')
+def _linear_layer_flops(layer, inputs, outputs):
+    flops = 2 * _numel(inputs[0][:-1]) * _numel(layer.weight.shape)
+    if layer.bias is not None:
+        flops += _numel(outputs[0])
+    return flops
+
+
+def _bias_shapes(layer):
+    return [] if layer.bias is None else [layer.bias.shape]
+
+
+@register_layer_flops('Conv2D', 'Conv3D')
+def _conv_layer_flops(layer, inputs, outputs):
+    return _conv_flops(
+        _OpView('conv2d', {'Filter': [layer.weight.shape],
+                           'Bias': _bias_shapes(layer)},
+                {'Output': outputs[:1]}))
+
+
+@register_layer_flops('Conv2DTranspose', 'Conv3DTranspose')
+def _conv_transpose_layer_flops(layer, inputs, outputs):
+    return _conv_transpose_flops(
+        _OpView('conv2d_transpose', {
+            'Input': inputs[:1],
+            'Filter': [layer.weight.shape],
+            'Bias': _bias_shapes(layer)
+        }, {'Output': outputs[:1]}))
+
+
+@register_layer_flops('Pool2D')
+def _pool_layer_flops(layer, inputs, outputs):
+    return _pool_flops(
+        _OpView('pool2d', {'X': inputs[:1]}, {'Out': outputs[:1]}, {
+            'global_pooling': layer._global_pooling,
+            'ksize': layer._pool_size
+        }))
+
+
+@register_layer_flops('BatchNorm')
+def _batch_norm_layer_flops(layer, inputs, outputs):
+    return _batch_norm_flops(
+        _OpView('batch_norm', {'X': inputs[:1]}, {'Y': outputs[:1]}, {
+            'is_test': layer._is_test or not layer.training,
+            'use_global_stats': layer._use_global_stats
+        }))
+
+
+@register_layer_flops('LayerNorm', 'InstanceNorm', 'GroupNorm')
+def _norm_layer_flops(layer, inputs, outputs):
+    return _norm_flops(_OpView('layer_norm', {'X': inputs[:1]}, {}))
+
+
+@register_layer_flops('Embedding')
+def _embedding_layer_flops(layer, inputs, outputs):
+    return 0
+
+
+@register_layer_flops('PRelu', 'Dropout', 'ReLU', 'LeakyReLU', 'Sigmoid')
+def _elementwise_layer_flops(layer, inputs, outputs):
+    return _numel(outputs[0])
+
+
+@register_layer_flops('LogSoftmax')
+def _softmax_layer_flops(layer, inputs, outputs):
+    return _softmax_flops(_OpView('log_softmax', {'X': inputs[:1]}, {}))
+
+
+@register_layer_flops('GRUUnit')
+def _gru_unit_layer_flops(layer, inputs, outputs):
+    return _rnn_flops(
+        _OpView('gru', {'Input': inputs[:1],
+                        'Weight': [layer.weight.shape]}, {}))
+
+
+@register_layer_flops('BilinearTensorProduct')
+def _bilinear_layer_flops(layer, inputs, outputs):
+    # weight is [size, x_dim, y_dim]
+    return 2 * _numel(inputs[0][:-1]) * _numel(layer.weight.shape)
+
+
+def _layer_flops_func(layer):
+    for cls in type(layer).__mro__:
+        if cls.__name__ in _LAYER_FLOPS:
+            return _LAYER_FLOPS[cls.__name__]
+    return None
+
+
+def _flatten_tensors(values):
+    if isinstance(values, core.VarBase):
+        return [values]
+    tensors = []
+    if isinstance(values, (list, tuple)):
+        for v in values:
+            tensors.extend(_flatten_tensors(v))
+    return tensors
+
+
+def _profile_layer_hook(profile, name, layer, inputs, outputs):
+    inputs = _flatten_tensors(inputs)
+    outputs = _flatten_tensors(outputs)
+    input_shapes = [list(t.shape) for t in inputs]
+    output_shapes = [list(t.shape) for t in outputs]
+    num_bytes = 0
+    for t in inputs + outputs:
+        num_bytes += _tensor_bytes(t.shape, t.dtype)
+    param_sizes = {}
+    for param in layer.parameters():
+        param_sizes[param.name] = _numel(param.shape)
+
+    func = _layer_flops_func(layer)
+    flops = None
+    if func is not None:
+        flops = int(func(layer, input_shapes, output_shapes))
+    profile._add(
+        type(layer).__name__, name, input_shapes[0] if input_shapes else [],
+        output_shapes[0] if output_shapes else [], flops, param_sizes,
+        num_bytes)
+
+
+def _register_profile_hooks(layer, name, profile, hooks, visited):
+    """
+    Register hooks on the registered layers and the leaf layers, the
+    sublayers of a registered layer are not profiled again.
+    """
+    if id(layer) in visited:
+        return
+    visited.add(id(layer))
+    sublayers = [(n, l) for n, l in six.iteritems(layer._sub_layers)
+                 if l is not None]
+    if _layer_flops_func(layer) is not None or not sublayers:
+        hooks.append(
+            layer.register_forward_post_hook(
+                partial(_profile_layer_hook, profile, name)))
+        return
+    for sub_name, sublayer in sublayers:
+        _register_profile_hooks(sublayer, name + '.' + sub_name
+                                if name else sub_name, profile, hooks, visited)
+
+
+def profile_layer(layer, inputs):
+    """
+    Profile FLOPs, params and activation memory traffic of a dygraph
+    Layer by running its forward with inputs. The registered layers and
+    the leaf layers are profiled by forward post-hooks, the computations
+    called directly in forward of other layers are not counted. The name
+    scopes are the names of sublayers.
+
+    Args:
+        layer(Layer): the layer to profile.
+        inputs(Variable|list<Variable>): the inputs of forward.
+
+    Returns:
+        ModelProfile: the statistics of layers and name scopes.
+
+    Examples:
+        .. code-block:: python
+
+            import numpy as np
+            import paddle.fluid as fluid
+            from paddle.fluid.contrib.model_stat import profile_layer
+
+            with fluid.dygraph.guard():
+                model = fluid.dygraph.Sequential(
+                    fluid.dygraph.Linear(16, 32, act='relu'),
+                    fluid.dygraph.Linear(32, 10))
+                x = fluid.dygraph.to_variable(
+                    np.random.random([8, 16]).astype('float32'))
+                profile = profile_layer(model, x)
+                profile.summary()
+    """
+    assert in_dygraph_mode(), "profile_layer should be called in dygraph mode"
+    if not isinstance(inputs, (list, tuple)):
+        inputs = [inputs]
+    profile = ModelProfile('.')
+    hooks = []
+    _register_profile_hooks(layer, '', profile, hooks, set())
+    try:
+        with no_grad():
+            layer(*inputs)
+    finally:
+        for hook in hooks:
+            hook.remove()
+    return profile
+
+
 def _format_summary(collected_ops_list):
     '''
     Format summary report.
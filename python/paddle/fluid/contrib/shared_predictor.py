@@ -0,0 +1,177 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Serving an inference model from many threads with one copy of parameters.
+"""
+
+from __future__ import print_function
+
+import threading
+
+from .. import core
+from .. import io
+from ..executor import Executor, scope_guard
+
+__all__ = ['SharedWeightsPredictor', 'PredictorInstance']
+
+
+class PredictorInstance(object):
+    """
+    A lightweight execution context of SharedWeightsPredictor, which has its
+    own copy of program, Executor and child scope of the shared parameters.
+    It should be created by `SharedWeightsPredictor.create_instance`, and
+    used by one thread at a time.
+    """
+
+    def __init__(self, predictor, index):
+        self._predictor = predictor
+        self._program = predictor._program.clone()
+        self._executor = Executor(predictor._place)
+        # the temporary variables are created in the child scope, while the
+        # persistable ones, including the feed and fetch holders, are
+        # created in the root scope by Executor, so the holders are named by
+        # instances to not be overwritten by other threads.
+        self._scope = predictor._scope.new_scope()
+        self._feed_var_name = 'feed_%d' % index
+        self._fetch_var_name = 'fetch_%d' % index
+
+    def run(self, inputs, return_numpy=True):
+        """
+        Run the model.
+
+        Args:
+            inputs (list|dict): The inputs in the order of `feed_names` of
+                the predictor, or a dict from feed names to inputs. The
+                inputs can be numpy arrays or LoDTensors.
+            return_numpy (bool, optional): Whether to convert the outputs to
+                numpy arrays. Default True.
+
+        Returns:
+            list: The outputs in the order of `fetch_names` of the predictor.
+        """
+        if not isinstance(inputs, dict):
+            inputs = dict(zip(self._predictor.feed_names, inputs))
+        return self._executor.run(
+            self._program,
+            feed=inputs,
+            fetch_list=self._predictor.fetch_names,
+            feed_var_name=self._feed_var_name,
+            fetch_var_name=self._fetch_var_name,
+            scope=self._scope,
+            return_numpy=return_numpy,
+            use_program_cache=True)
+
+    __call__ = run
+
+
+class SharedWeightsPredictor(object):
+    """
+    SharedWeightsPredictor loads the model saved by
+    :ref:`api_fluid_io_save_inference_model` once into a scope, and creates
+    PredictorInstances sharing the parameters in it, so that the memory of
+    parameters does not grow with the number of threads serving the model.
+    The parameters are read-only after loading.
+
+    `run` is thread-safe, it runs the model with an instance created for the
+    calling thread on its first call. Instances can also be created by
+    `create_instance` and assigned to threads explicitly.
+
+    Args:
+        dirname (str): The directory of the model.
+        place (CPUPlace|CUDAPlace, optional): The place to run the model.
+            Default None means CPUPlace.
+        model_filename (str, optional): The file name of the program, see
+            :ref:`api_fluid_io_load_inference_model` . Default None.
+        params_filename (str, optional): The file name of all parameters, see
+            :ref:`api_fluid_io_load_inference_model` . Default None.
+
+    Examples:
+        .. code-block:: python
+
+            import threading
+            import numpy as np
+            from paddle.fluid.contrib import SharedWeightsPredictor
+
+            # the model saved by fluid.io.save_inference_model, with an
+            # input of shape [-1, 784]
+            predictor = SharedWeightsPredictor('mnist.inference.model')
+
+            def serve():
+                image = np.random.random([1, 784]).astype('float32')
+                prediction, = predictor.run([image])
+
+            threads = [threading.Thread(target=serve) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+    """
+
+    def __init__(self,
+                 dirname,
+                 place=None,
+                 model_filename=None,
+                 params_filename=None):
+        self._place = core.CPUPlace() if place is None else place
+        self._scope = core.Scope()
+        with scope_guard(self._scope):
+            self._program, self.feed_names, fetch_vars = \
+                io.load_inference_model(
+                    dirname,
+                    Executor(self._place),
+                    model_filename=model_filename,
+                    params_filename=params_filename)
+        self.fetch_names = [var.name for var in fetch_vars]
+        self._lock = threading.Lock()
+        self._num_instances = 0
+        self._local = threading.local()
+
+    @property
+    def num_instances(self):
+        """
+        The number of instances created.
+        """
+        return self._num_instances
+
+    def create_instance(self):
+        """
+        Create a PredictorInstance sharing the parameters.
+
+        Returns:
+            PredictorInstance: The instance, which has a `run` method the same
+            as SharedWeightsPredictor.
+        """
+        with self._lock:
+            index = self._num_instances
+            self._num_instances += 1
+            return PredictorInstance(self, index)
+
+    def run(self, inputs, return_numpy=True):
+        """
+        Run the model with the instance of the calling thread.
+
+        Args:
+            inputs (list|dict): The inputs in the order of `feed_names`, or a
+                dict from feed names to inputs.
+            return_numpy (bool, optional): Whether to convert the outputs to
+                numpy arrays. Default True.
+
+        Returns:
+            list: The outputs in the order of `fetch_names`.
+        """
+        instance = getattr(self._local, 'instance', None)
+        if instance is None:
+            instance = self.create_instance()
+            self._local.instance = instance
+        return instance.run(inputs, return_numpy)
@@ -13,8 +13,10 @@
 # limitations under the License.
 
 import logging
-import socket
-from threading import Thread
+import struct
+from threading import Thread, Event
+from six.moves import queue
+from six.moves import socketserver
 from ....log_helper import get_logger
 
 __all__ = ['ControllerServer']
@@ -24,10 +26,86 @@ _logger = get_logger(
     logging.INFO,
     fmt='ControllerServer-%(asctime)s-%(levelname)s: %(message)s')
 
+# every message is prefixed by its length in bytes
+_HEADER = struct.Struct('!I')
+
+
+def _recv_bytes(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def _send_message(sock, message):
+    """Send a framed message."""
+    data = message.encode()
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_message(sock):
+    """Receive a framed message. None means the connection is closed."""
+    header = _recv_bytes(sock, _HEADER.size)
+    if header is None:
+        return None
+    data = _recv_bytes(sock, _HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return data.decode()
+
+
+class _Request(object):
+    """
+    A request waiting for the controller thread. update is None or a
+    pair of tokens and reward, tokens is set to the list of num_tokens
+    token lists, or None if the server is closed.
+    """
+
+    def __init__(self, update, num_tokens):
+        self.update = update
+        self.num_tokens = num_tokens
+        self.tokens = None
+        self.done = Event()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """
+    Serve the framed requests of a connection until it is closed.
+    """
+
+    def handle(self):
+        controller_server = self.server.controller_server
+        while True:
+            message = _recv_message(self.request)
+            if message is None:
+                break
+            reply = controller_server._handle(message, self.client_address)
+            if reply is None:
+                break
+            _send_message(self.request, reply)
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
 
 class ControllerServer(object):
     """
     The controller wrapper with a socket server to handle the request of search agent.
+
+    Each connection is served by its own thread, and the controller is only
+    accessed by a controller thread. The rewards reported while the controller
+    is busy are batched, they update the controller together before tokens
+    are generated for them.
+
+    Messages are framed by a 4-byte length header. A request is either
+    "next_tokens[\\t<num>]" or "<key>\\t<tokens>\\t<reward>[\\t<num>]", and
+    the reply is <num> token lists separated by "\\n", so that an agent can
+    prefetch several token lists by one request. <num> defaults to 1.
     """
 
     def __init__(self,
@@ -42,7 +120,7 @@ class ControllerServer(object):
             address(tuple): The address of current server binding with format (ip, port). Default: ('', 0).
                             which means setting ip automatically
             max_client_num(int): The maximum number of clients connecting to current server simultaneously. Default: 100.
-            search_steps(int): The total steps of searching. None means never stopping. Default: None 
+            search_steps(int): The total steps of searching. None means never stopping. Default: None
         """
         self._controller = controller
         self._address = address
@@ -52,21 +130,35 @@ class ControllerServer(object):
         self._port = address[1]
         self._ip = address[0]
         self._key = key
+        self._requests = queue.Queue()
+        self._socket_server = None
 
     def start(self):
-        self._socket_server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self._socket_server.bind(self._address)
-        self._socket_server.listen(self._max_client_num)
-        self._port = self._socket_server.getsockname()[1]
-        self._ip = self._socket_server.getsockname()[0]
+        self._socket_server = _ThreadingServer(
+            self._address, _RequestHandler, bind_and_activate=False)
+        self._socket_server.request_queue_size = self._max_client_num
+        self._socket_server.controller_server = self
+        self._socket_server.server_bind()
+        self._socket_server.server_activate()
+        self._port = self._socket_server.server_address[1]
+        self._ip = self._socket_server.server_address[0]
         _logger.info("listen on: [{}:{}]".format(self._ip, self._port))
+        self._controller_thread = Thread(target=self._update_loop)
+        self._controller_thread.daemon = True
+        self._controller_thread.start()
         thread = Thread(target=self.run)
         thread.start()
         return str(thread)
 
     def close(self):
         """Close the server."""
+        if self._closed:
+            return
         self._closed = True
+        # not started yet
+        if self._socket_server is not None:
+            self._socket_server.shutdown()
+        self._requests.put(None)
 
     def port(self):
         """Get the port."""
@@ -76,32 +168,94 @@ class ControllerServer(object):
         """Get the ip."""
         return self._ip
 
-    def run(self):
-        _logger.info("Controller Server run...")
-        while ((self._search_steps is None) or
-               (self._controller._iter <
-                (self._search_steps))) and not self._closed:
-            conn, addr = self._socket_server.accept()
-            message = conn.recv(1024).decode()
-            if message.strip("\n") == "next_tokens":
-                tokens = self._controller.next_tokens()
-                tokens = ",".join([str(token) for token in tokens])
-                conn.send(tokens.encode())
+    def _is_finished(self):
+        return (self._search_steps is not None) and (
+            self._controller._iter >= self._search_steps)
+
+    def _handle(self, message, addr):
+        """
+        Handle a request in the thread of its connection. Returns the reply,
+        or None to close the connection.
+        """
+        messages = message.strip('\n').split("\t")
+        try:
+            if messages[0] == "next_tokens":
+                update = None
+                num_tokens = int(messages[1]) if len(messages) > 1 else 1
             else:
-                _logger.info("recv message from {}: [{}]".format(addr, message))
-                messages = message.strip('\n').split("\t")
                 if (len(messages) < 3) or (messages[0] != self._key):
-                    _logger.info("recv noise from {}: [{}]".format(addr,
-                                                                   message))
-                    continue
-                tokens = messages[1]
-                reward = messages[2]
-                tokens = [int(token) for token in tokens.split(",")]
-                self._controller.update(tokens, float(reward))
-                tokens = self._controller.next_tokens()
-                tokens = ",".join([str(token) for token in tokens])
-                conn.send(tokens.encode())
-                _logger.info("send message to {}: [{}]".format(addr, tokens))
-            conn.close()
-        self._socket_server.close()
+                    raise ValueError()
+                tokens = [int(token) for token in messages[1].split(",")]
+                update = (tokens, float(messages[2]))
+                num_tokens = int(messages[3]) if len(messages) > 3 else 1
+        except ValueError:
+            _logger.info("recv noise from {}: [{}]".format(addr, message))
+            return None
+        if self._closed:
+            return None
+
+        request = _Request(update, num_tokens)
+        self._requests.put(request)
+        while not request.done.wait(1):
+            if not self._controller_thread.is_alive():
+                return None
+        if request.tokens is None:
+            return None
+        return "\n".join([
+            ",".join([str(token) for token in tokens])
+            for tokens in request.tokens
+        ])
+
+    def _update_loop(self):
+        """
+        Apply the rewards of all pending requests to the controller, and
+        then generate tokens for them, until the server is closed.
+        """
+        while True:
+            requests = [self._requests.get()]
+            try:
+                while True:
+                    requests.append(self._requests.get_nowait())
+            except queue.Empty:
+                pass
+            if None in requests:
+                for request in requests:
+                    if request is not None:
+                        request.done.set()
+                break
+
+            try:
+                for request in requests:
+                    if request.update is not None and not self._is_finished():
+                        self._controller.update(*request.update)
+                for request in requests:
+                    request.tokens = [
+                        self._controller.next_tokens()
+                        for _ in range(request.num_tokens)
+                    ]
+            except Exception:
+                _logger.exception("failed to update controller")
+                for request in requests:
+                    request.tokens = None
+                self.close()
+            for request in requests:
+                request.done.set()
+            _logger.debug("updated controller by {} requests".format(
+                len(requests)))
+            if self._is_finished():
+                self.close()
+
+        # fail the requests arriving while closing
+        try:
+            while True:
+                request = self._requests.get_nowait()
+                if request is not None:
+                    request.done.set()
+        except queue.Empty:
+            pass
+
+    def run(self):
+        _logger.info("Controller Server run...")
+        self._socket_server.serve_forever()
+        self._socket_server.server_close()
         _logger.info("server closed!")
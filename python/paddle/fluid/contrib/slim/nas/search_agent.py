@@ -15,6 +15,7 @@
 import logging
 import socket
 from ....log_helper import get_logger
+from .controller_server import _send_message, _recv_message
 
 __all__ = ['SearchAgent']
 
@@ -27,17 +28,58 @@ class SearchAgent(object):
     Search agent.
     """
 
-    def __init__(self, server_ip=None, server_port=None, key=None):
+    def __init__(self, server_ip=None, server_port=None, key=None,
+                 prefetch=1):
         """
         Args:
             server_ip(str): The ip that controller server listens on. None means getting the ip automatically. Default: None.
             server_port(int): The port that controller server listens on. 0 means getting usable port automatically. Default: 0.
             key(str): The key used to identify legal agent for controller server. Default: "light-nas"
+            prefetch(int): The number of tokens fetched by one request. The prefetched tokens
+                           are generated before the rewards reported later are applied. Default: 1.
         """
+        assert prefetch >= 1, "prefetch should be at least 1."
         self.server_ip = server_ip
         self.server_port = server_port
-        self.socket_client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket_client = None
         self._key = key
+        self._prefetch = prefetch
+        self._tokens = []
+
+    def _request(self, message):
+        """
+        Send a request on the connection kept to the server, and return the
+        token lists in reply. The connection is reestablished once if broken.
+        """
+        for _ in range(2):
+            try:
+                if self.socket_client is None:
+                    self.socket_client = socket.create_connection(
+                        (self.server_ip, self.server_port))
+                _send_message(self.socket_client, message)
+                reply = _recv_message(self.socket_client)
+            except socket.error:
+                reply = None
+            if reply is not None:
+                break
+            self.close()
+        if reply is None:
+            raise RuntimeError("Failed to request controller server [{}:{}], "
+                               "it may be closed.".format(self.server_ip,
+                                                          self.server_port))
+        reply = reply.strip("\n")
+        if not reply:
+            return []
+        return [[int(token) for token in tokens.split(",")]
+                for tokens in reply.split("\n")]
+
+    def close(self):
+        """
+        Close the connection to server.
+        """
+        if self.socket_client is not None:
+            self.socket_client.close()
+            self.socket_client = None
 
     def update(self, tokens, reward):
         """
@@ -46,22 +88,18 @@ class SearchAgent(object):
             tokens(list<int>): The tokens generated in last step.
             reward(float): The reward of tokens.
         """
-        socket_client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        socket_client.connect((self.server_ip, self.server_port))
         tokens = ",".join([str(token) for token in tokens])
-        socket_client.send("{}\t{}\t{}".format(self._key, tokens, reward)
-                           .encode())
-        tokens = socket_client.recv(1024).decode()
-        tokens = [int(token) for token in tokens.strip("\n").split(",")]
-        return tokens
+        num = 0 if self._tokens else self._prefetch
+        self._tokens.extend(
+            self._request("{}\t{}\t{}\t{}".format(self._key, tokens, reward,
+                                                  num)))
+        return self._tokens.pop(0)
 
     def next_tokens(self):
         """
         Get next tokens.
         """
-        socket_client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        socket_client.connect((self.server_ip, self.server_port))
-        socket_client.send("next_tokens".encode())
-        tokens = socket_client.recv(1024).decode()
-        tokens = [int(token) for token in tokens.strip("\n").split(",")]
-        return tokens
+        if not self._tokens:
+            self._tokens.extend(
+                self._request("next_tokens\t{}".format(self._prefetch)))
+        return self._tokens.pop(0)
@@ -20,12 +20,16 @@ from .... import layers
 import prettytable as pt
 import numpy as np
 from scipy.optimize import leastsq
+import bisect
 import copy
 import re
 import os
 import pickle
 import logging
+import multiprocessing
 import sys
+import traceback
+from six.moves import queue
 
 __all__ = ['SensitivePruneStrategy', 'UniformPruneStrategy', 'PruneStrategy']
 
@@ -685,7 +689,9 @@ class SensitivePruneStrategy(PruneStrategy):
                  sensitivities_file='./sensitivities.data',
                  sensitivities={},
                  num_steps=1,
-                 eval_rate=None):
+                 eval_rate=None,
+                 num_workers=1,
+                 loss_threshold=None):
         """
         Args:
             pruner(slim.Pruner): The pruner used to prune the parameters.
@@ -701,6 +707,13 @@ class SensitivePruneStrategy(PruneStrategy):
             num_steps(int): The number of pruning steps. default: 1.
             eval_rate(float): The rate of sampled data used to calculate sensitivities.
                               None means using all the data. default: None.
+            num_workers(int): The number of processes forked to calculate sensitivities of
+                              different (parameter, ratio) pairs in parallel. Each worker
+                              holds a copy of the scope, so it is only supported on CPUPlace.
+                              default: 1.
+            loss_threshold(float): Stop pruning a parameter by larger ratios once its loss
+                                   exceeds this threshold. None means no early stopping.
+                                   default: None.
         """
         super(SensitivePruneStrategy, self).__init__(pruner, start_epoch,
                                                      end_epoch, target_ratio,
@@ -711,14 +724,20 @@ class SensitivePruneStrategy(PruneStrategy):
         self.sensitivities_file = sensitivities_file
         self.num_steps = num_steps
         self.eval_rate = eval_rate
+        self.num_workers = num_workers
+        self.loss_threshold = loss_threshold
         self.pruning_step = 1 - pow((1 - target_ratio), 1.0 / self.num_steps)
 
     def _save_sensitivities(self, sensitivities, sensitivities_file):
         """
         Save sensitivities into file.
         """
-        with open(sensitivities_file, 'wb') as f:
+        # write to a temporary file first so that an interrupted saving
+        # never leaves a broken sensitivities file to resume from
+        tmp_file = sensitivities_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
             pickle.dump(sensitivities, f)
+        getattr(os, 'replace', os.rename)(tmp_file, sensitivities_file)
 
     def _load_sensitivities(self, sensitivities_file):
         """
@@ -758,6 +777,183 @@ class SensitivePruneStrategy(PruneStrategy):
         _logger.debug('################################\n')
         _logger.debug(tb)
 
+    def _sensitivity_ratios(self):
+        """
+        Get the ratios used to calculate sensitivities.
+        """
+        ratios = []
+        ratio = self.delta_rate
+        while ratio < 1:
+            ratio = round(ratio, 2)
+            ratios.append(ratio)
+            ratio += self.delta_rate
+        return ratios
+
+    def _is_stopped(self, sensitivity, ratio):
+        """
+        Whether pruning a parameter by the ratio is skipped because its loss
+        exceeds loss_threshold by a smaller ratio.
+        """
+        if self.loss_threshold is None:
+            return False
+        for percent, loss in zip(sensitivity['pruned_percent'],
+                                 sensitivity['loss']):
+            if percent < ratio and loss > self.loss_threshold:
+                return True
+        return False
+
+    def _next_job(self, jobs, sensitivities, running=()):
+        """
+        Pop the next (parameter, ratio) pair to be computed from jobs, the
+        pairs that have been computed or stopped early are dropped. With
+        loss_threshold, the parameters in running are postponed as their
+        running jobs may stop them.
+        """
+        i = 0
+        while i < len(jobs):
+            param, ratio = jobs[i]
+            if ratio in sensitivities[param]['pruned_percent']:
+                _logger.debug('{}, {} has computed.'.format(param, ratio))
+                jobs.pop(i)
+                continue
+            if self._is_stopped(sensitivities[param], ratio):
+                _logger.debug('{}, {} is skipped by loss_threshold.'.format(
+                    param, ratio))
+                jobs.pop(i)
+                continue
+            if self.loss_threshold is not None and param in running:
+                i += 1
+                continue
+            return jobs.pop(i)
+        return None
+
+    def _compute_loss(self, context, param, ratio, metric, cached_id):
+        """
+        Compute the loss of metric after pruning the parameter by the ratio.
+        Returns the loss and the pruned parameters.
+        """
+        param_backup = {}
+        # prune parameter by ratio
+        self._prune_parameters(
+            context.eval_graph,
+            context.scope, [param], [ratio],
+            context.place,
+            lazy=True,
+            param_backup=param_backup)
+        pruned_params = list(self.pruned_list[0])
+        # get accuracy after pruning
+        pruned_metric = self._eval_graph(context, self.eval_rate, cached_id)
+
+        # restore pruned parameters
+        for param_name in param_backup.keys():
+            param_t = context.scope.find_var(param_name).get_tensor()
+            param_t.set(param_backup[param_name], context.place)
+        return metric - pruned_metric, pruned_params
+
+    def _update_sensitivities(self, sensitivities, param, ratio, loss,
+                              pruned_params):
+        """
+        Record the loss of pruning the parameter by the ratio. Ratios are
+        kept in ascending order as results of workers arrive out of order.
+        """
+        _logger.info("pruned param: {}; {}; loss={}".format(param, ratio,
+                                                            loss))
+        for brother in pruned_params:
+            if re.match(self.pruned_params, brother):
+                if brother not in sensitivities:
+                    sensitivities[brother] = {'pruned_percent': [], 'loss': []}
+                percents = sensitivities[brother]['pruned_percent']
+                if ratio in percents:
+                    continue
+                idx = bisect.bisect(percents, ratio)
+                percents.insert(idx, ratio)
+                sensitivities[brother]['loss'].insert(idx, loss)
+
+    def _sensitivity_worker(self, context, metric, cached_id, job_queue,
+                            result_queue):
+        """
+        The loop of worker processes computing losses of jobs.
+        """
+        while True:
+            job = job_queue.get()
+            if job is None:
+                break
+            param, ratio = job
+            try:
+                loss, pruned_params = self._compute_loss(
+                    context, param, ratio, metric, cached_id)
+                result_queue.put((param, ratio, loss, pruned_params, None))
+            except Exception:
+                result_queue.put(
+                    (param, ratio, None, None, traceback.format_exc()))
+
+    def _compute_in_workers(self, context, jobs, sensitivities,
+                            sensitivities_file, metric, cached_id):
+        """
+        Compute sensitivities by num_workers forked processes. Jobs are
+        dispatched one at a time to idle workers, so that the jobs stopped
+        early by results of other workers are never dispatched.
+        """
+        if hasattr(multiprocessing, 'get_context'):
+            mp = multiprocessing.get_context('fork')
+        else:
+            mp = multiprocessing
+        job_queue = mp.Queue()
+        result_queue = mp.Queue()
+        workers = []
+        for _ in range(self.num_workers):
+            worker = mp.Process(
+                target=self._sensitivity_worker,
+                args=(context, metric, cached_id, job_queue, result_queue))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        running = []
+        try:
+            for _ in workers:
+                job = self._next_job(jobs, sensitivities, running)
+                if job is None:
+                    break
+                job_queue.put(job)
+                running.append(job[0])
+
+            while running:
+                try:
+                    param, ratio, loss, pruned_params, error = \
+                        result_queue.get(timeout=1)
+                except queue.Empty:
+                    if not all(worker.is_alive() for worker in workers):
+                        raise RuntimeError(
+                            "Worker of computing sensitivities exited "
+                            "unexpectedly.")
+                    continue
+                running.remove(param)
+                if error is not None:
+                    raise RuntimeError(
+                        "Failed to compute sensitivity of {} by ratio {}:\n{}".
+                        format(param, ratio, error))
+                self._update_sensitivities(sensitivities, param, ratio, loss,
+                                           pruned_params)
+                self._save_sensitivities(sensitivities, sensitivities_file)
+
+                # one finished job may unblock several postponed ones
+                while len(running) < len(workers):
+                    job = self._next_job(jobs, sensitivities, running)
+                    if job is None:
+                        break
+                    job_queue.put(job)
+                    running.append(job[0])
+        except BaseException:
+            for worker in workers:
+                worker.terminate()
+            raise
+
+        for _ in workers:
+            job_queue.put(None)
+        for worker in workers:
+            worker.join()
+
     def _compute_sensitivities(self, context):
         """
         Computing the sensitivities of all parameters.
@@ -781,54 +977,34 @@ class SensitivePruneStrategy(PruneStrategy):
                     'size': param.shape()[0]
                 }
 
-        metric = None
-        for param in sensitivities.keys():
-            ratio = self.delta_rate
-            while ratio < 1:
-                ratio = round(ratio, 2)
-                if ratio in sensitivities[param]['pruned_percent']:
-                    _logger.debug('{}, {} has computed.'.format(param, ratio))
-                    ratio += self.delta_rate
-                    continue
-                if metric is None:
-                    metric = self._eval_graph(context, self.eval_rate,
-                                              cached_id)
-
-                param_backup = {}
-                # prune parameter by ratio
-                self._prune_parameters(
-                    context.eval_graph,
-                    context.scope, [param], [ratio],
-                    context.place,
-                    lazy=True,
-                    param_backup=param_backup)
-                self.pruned_list[0]
-                # get accuracy after pruning and update self.sensitivities
-                pruned_metric = self._eval_graph(context, self.eval_rate,
-                                                 cached_id)
-                loss = metric - pruned_metric
-                _logger.info("pruned param: {}; {}; loss={}".format(
-                    param, ratio, loss))
-                for brother in self.pruned_list[0]:
-                    if re.match(self.pruned_params, brother):
-                        if brother not in sensitivities:
-                            sensitivities[brother] = {
-                                'pruned_percent': [],
-                                'loss': []
-                            }
-                        sensitivities[brother]['pruned_percent'].append(ratio)
-                        sensitivities[brother]['loss'].append(loss)
-
-                self._save_sensitivities(sensitivities, sensitivities_file)
-
-                # restore pruned parameters
-                for param_name in param_backup.keys():
-                    param_t = context.scope.find_var(param_name).get_tensor()
-                    param_t.set(param_backup[param_name], context.place)
-
-#                pruned_metric = self._eval_graph(context)
-
-                ratio += self.delta_rate
+        # jobs of smaller ratios go first so that larger ratios of the
+        # parameters whose loss exceeds loss_threshold can be skipped
+        jobs = [(param, ratio)
+                for ratio in self._sensitivity_ratios()
+                for param in sensitivities.keys()]
+        job = self._next_job(jobs, sensitivities)
+        if job is None:
+            return sensitivities
+        jobs.insert(0, job)
+
+        # the sampled data is cached by the evaluation of baseline, and
+        # shared by all workers
+        metric = self._eval_graph(context, self.eval_rate, cached_id)
+        if self.num_workers > 1:
+            self._compute_in_workers(context, jobs, sensitivities,
+                                     sensitivities_file, metric, cached_id)
+            return sensitivities
+
+        while True:
+            job = self._next_job(jobs, sensitivities)
+            if job is None:
+                break
+            param, ratio = job
+            loss, pruned_params = self._compute_loss(context, param, ratio,
+                                                     metric, cached_id)
+            self._update_sensitivities(sensitivities, param, ratio, loss,
+                                       pruned_params)
+            self._save_sensitivities(sensitivities, sensitivities_file)
         return sensitivities
 
     def _get_best_ratios(self, context, sensitivities, target_ratio):
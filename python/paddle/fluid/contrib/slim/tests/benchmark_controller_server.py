@@ -0,0 +1,69 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import threading
+import time
+import unittest
+from paddle.fluid.contrib.slim.nas import ControllerServer, SearchAgent
+from paddle.fluid.contrib.slim.searcher import SAController
+
+# This is a benchmark of the controller server of light nas, it reports
+# the rewards per second reported by many local search agents.
+
+
+class BenchmarkControllerServer(unittest.TestCase):
+    def setUp(self):
+        self.num_agents = [1, 16, 128]
+        self.updates_per_agent = 50
+
+    def run_agents(self, num_agents, prefetch):
+        # slow annealing so that temperature stays positive for all updates
+        controller = SAController(reduce_rate=0.999)
+        controller.reset([8] * 20, [0] * 20)
+        server = ControllerServer(
+            controller=controller,
+            address=('127.0.0.1', 0),
+            max_client_num=num_agents,
+            key='benchmark')
+        server.start()
+
+        def search():
+            agent = SearchAgent(
+                '127.0.0.1', server.port(), key='benchmark', prefetch=prefetch)
+            tokens = agent.next_tokens()
+            for _ in range(self.updates_per_agent):
+                tokens = agent.update(tokens, float(sum(tokens)))
+            agent.close()
+
+        threads = [threading.Thread(target=search) for _ in range(num_agents)]
+        start = time.time()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapse = time.time() - start
+        server.close()
+        print("{} agents, prefetch {}: {:.1f} updates/sec".format(
+            num_agents, prefetch, controller._iter / elapse))
+
+    def test_timeit(self):
+        for num_agents in self.num_agents:
+            for prefetch in [1, 4]:
+                self.run_agents(num_agents, prefetch)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+from paddle.fluid.contrib.slim.nas import ControllerServer, SearchAgent
+from paddle.fluid.contrib.slim.searcher import SAController
+
+
+class TestControllerServer(unittest.TestCase):
+    def setUp(self):
+        self.range_table = [4, 5, 6]
+        self.controller = SAController()
+        self.controller.reset(self.range_table, [0, 0, 0])
+
+    def start_server(self, search_steps=None):
+        server = ControllerServer(
+            controller=self.controller,
+            address=('127.0.0.1', 0),
+            search_steps=search_steps,
+            key='test')
+        server.start()
+        return server
+
+    def check_tokens(self, tokens):
+        self.assertEqual(len(tokens), len(self.range_table))
+        for token, limit in zip(tokens, self.range_table):
+            self.assertTrue(0 <= token < limit)
+
+    def test_concurrent_agents(self):
+        search_steps = 200
+        server = self.start_server(search_steps)
+        errors = []
+
+        def search():
+            agent = SearchAgent('127.0.0.1', server.port(), key='test')
+            try:
+                tokens = agent.next_tokens()
+                while True:
+                    self.check_tokens(tokens)
+                    tokens = agent.update(tokens, float(sum(tokens)))
+            except RuntimeError:
+                # the server is closed after search_steps
+                pass
+            except Exception as e:
+                errors.append(e)
+            agent.close()
+
+        threads = [threading.Thread(target=search) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.controller._iter, search_steps)
+
+    def test_prefetch(self):
+        server = self.start_server()
+        agent = SearchAgent('127.0.0.1', server.port(), key='test', prefetch=3)
+        tokens = [agent.next_tokens() for _ in range(3)]
+        self.assertEqual(len(agent._tokens), 0)
+        for t in tokens:
+            self.check_tokens(t)
+        agent.update(tokens[0], 1.0)
+        self.assertEqual(len(agent._tokens), 2)
+        # rewards are reported without fetching more until tokens run out
+        agent.update(tokens[1], 1.0)
+        agent.update(tokens[2], 1.0)
+        self.assertEqual(len(agent._tokens), 0)
+        self.assertEqual(self.controller._iter, 3)
+
+        noise = SearchAgent('127.0.0.1', server.port(), key='noise')
+        with self.assertRaises(RuntimeError):
+            noise.update(tokens[0], 1.0)
+        self.assertEqual(self.controller._iter, 3)
+        agent.close()
+        server.close()
+
+    def test_close_before_start(self):
+        server = ControllerServer(controller=self.controller)
+        server.close()
+        server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from paddle.fluid.contrib.slim.prune import SensitivePruneStrategy
+
+
+class FakeParam(object):
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+    def shape(self):
+        return [8, 3, 3, 3]
+
+
+class FakeGraph(object):
+    def __init__(self, names):
+        self.params = [FakeParam(name) for name in names]
+
+    def all_parameters(self):
+        return self.params
+
+
+class FakeContext(object):
+    def __init__(self, names):
+        self.epoch_id = 0
+        self.eval_graph = FakeGraph(names)
+
+
+class FakeSensitivePruneStrategy(SensitivePruneStrategy):
+    """
+    Loss of pruning a parameter is its slope times the ratio.
+    """
+
+    def __init__(self, slopes, **kwargs):
+        super(FakeSensitivePruneStrategy, self).__init__(
+            pruned_params='conv.*', **kwargs)
+        self.slopes = slopes
+        self.computed = []
+
+    def _eval_graph(self, context, sampled_rate=None, cached_id=0):
+        return 1.0
+
+    def _compute_loss(self, context, param, ratio, metric, cached_id):
+        self.computed.append((param, ratio))
+        return self.slopes[param] * ratio, [param]
+
+
+class TestSensitivePruneStrategy(unittest.TestCase):
+    def setUp(self):
+        self.slopes = {'conv1_weights': 0.1, 'conv2_weights': 1.0}
+        self.context = FakeContext(sorted(self.slopes.keys()))
+        self.save_dir = tempfile.mkdtemp()
+        self.sensitivities_file = os.path.join(self.save_dir,
+                                               'sensitivities.data')
+
+    def tearDown(self):
+        shutil.rmtree(self.save_dir)
+
+    def strategy(self, **kwargs):
+        return FakeSensitivePruneStrategy(
+            self.slopes,
+            delta_rate=0.2,
+            sensitivities_file=self.sensitivities_file,
+            **kwargs)
+
+    def test_early_stop(self):
+        strategy = self.strategy(loss_threshold=0.3)
+        sensitivities = strategy._compute_sensitivities(self.context)
+        self.assertEqual(sensitivities['conv1_weights']['pruned_percent'],
+                         [0.2, 0.4, 0.6, 0.8])
+        # stopped after the loss 0.4 by ratio 0.4 exceeds the threshold
+        self.assertEqual(sensitivities['conv2_weights']['pruned_percent'],
+                         [0.2, 0.4])
+        self.assertEqual(len(strategy.computed), 6)
+
+    def test_resume(self):
+        strategy = self.strategy()
+        strategy._save_sensitivities({
+            'conv1_weights': {
+                'pruned_percent': [0.2, 0.6],
+                'loss': [0.02, 0.06],
+                'size': 8
+            }
+        }, self.sensitivities_file)
+        sensitivities = strategy._compute_sensitivities(self.context)
+        self.assertNotIn(('conv1_weights', 0.2), strategy.computed)
+        self.assertNotIn(('conv1_weights', 0.6), strategy.computed)
+        self.assertEqual(len(strategy.computed), 6)
+        for param in self.slopes:
+            self.assertEqual(sensitivities[param]['pruned_percent'],
+                             [0.2, 0.4, 0.6, 0.8])
+        self.assertEqual(
+            strategy._load_sensitivities(self.sensitivities_file),
+            sensitivities)
+
+    def test_workers(self):
+        serial = self.strategy(loss_threshold=0.3)._compute_sensitivities(
+            self.context)
+        os.remove(self.sensitivities_file)
+        strategy = self.strategy(loss_threshold=0.3, num_workers=2)
+        sensitivities = strategy._compute_sensitivities(self.context)
+        self.assertEqual(sensitivities, serial)
+        self.assertEqual(
+            strategy._load_sensitivities(self.sensitivities_file),
+            sensitivities)
+
+
+if __name__ == '__main__':
+    unittest.main()
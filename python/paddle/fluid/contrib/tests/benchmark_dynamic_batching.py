@@ -0,0 +1,115 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+from paddle.fluid.contrib import DynamicBatcher
+
+# This is a benchmark of serving single-sample requests from many client
+# threads, it reports the throughput and the latency percentiles of running
+# every request with one shared Executor under a lock, and of DynamicBatcher
+# with different numbers of workers and timeouts.
+
+
+class BenchmarkDynamicBatching(unittest.TestCase):
+    def setUp(self):
+        self.num_clients = 32
+        self.requests_per_client = 50
+        self.model_dir = tempfile.mkdtemp()
+        main = fluid.Program()
+        startup = fluid.Program()
+        with fluid.program_guard(main, startup):
+            x = fluid.data(name='x', shape=[None, 256], dtype='float32')
+            hidden = fluid.layers.fc(input=x, size=1024, act='relu')
+            hidden = fluid.layers.fc(input=hidden, size=1024, act='relu')
+            y = fluid.layers.fc(input=hidden, size=10, act='softmax')
+        exe = fluid.Executor(fluid.CPUPlace())
+        self.scope = fluid.Scope()
+        with fluid.scope_guard(self.scope):
+            exe.run(startup)
+            fluid.io.save_inference_model(self.model_dir, ['x'], [y], exe,
+                                          main)
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def serve(self, name, predict):
+        latencies = []
+        lock = threading.Lock()
+
+        def client():
+            x = np.random.random([1, 256]).astype('float32')
+            for _ in range(self.requests_per_client):
+                start = time.time()
+                predict([x])
+                with lock:
+                    latencies.append(time.time() - start)
+
+        clients = [
+            threading.Thread(target=client) for _ in range(self.num_clients)
+        ]
+        start = time.time()
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        elapsed = time.time() - start
+        latencies = np.array(latencies) * 1e3
+        print("{}: {:.1f} requests/s, latency p50 {:.2f} ms, p99 {:.2f} ms".
+              format(name, len(latencies) / elapsed,
+                     np.percentile(latencies, 50), np.percentile(latencies,
+                                                                 99)))
+
+    def test_locked_executor(self):
+        exe = fluid.Executor(fluid.CPUPlace())
+        with fluid.scope_guard(self.scope):
+            program, feed_names, fetch_vars = fluid.io.load_inference_model(
+                self.model_dir, exe)
+        lock = threading.Lock()
+
+        def predict(inputs):
+            with lock:
+                return exe.run(program,
+                               feed={feed_names[0]: inputs[0]},
+                               fetch_list=fetch_vars,
+                               scope=self.scope,
+                               use_program_cache=True)
+
+        self.serve("locked Executor", predict)
+
+    def test_dynamic_batcher(self):
+        for num_workers in [1, 2, 4]:
+            for timeout_ms in [0, 2]:
+                with DynamicBatcher.from_inference_model(
+                        self.model_dir,
+                        num_workers=num_workers,
+                        max_batch_size=32,
+                        timeout_ms=timeout_ms) as batcher:
+                    self.serve("DynamicBatcher workers {} timeout {} ms".format(
+                        num_workers, timeout_ms), batcher.run)
+                    stats = batcher.stats()
+                print("  average batch size {:.1f}".format(stats[
+                    'avg_batch_size']))
+
+
+if __name__ == '__main__':
+    unittest.main()
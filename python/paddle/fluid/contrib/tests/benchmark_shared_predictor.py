@@ -0,0 +1,118 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import gc
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+from paddle.fluid.contrib import SharedWeightsPredictor
+
+# This is a benchmark of serving a model with about 128 MB of parameters
+# from 1 to 8 threads on CPU, it reports the resident memory and the
+# throughput of SharedWeightsPredictor, whose memory should stay flat as
+# threads are added, and of loading the model once per thread.
+
+
+def resident_memory_mb():
+    # linux only
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * 4096.0 / 1024 / 1024
+
+
+class BenchmarkSharedWeightsPredictor(unittest.TestCase):
+    def setUp(self):
+        self.thread_nums = [1, 2, 4, 8]
+        self.iters = 20
+        self.model_dir = tempfile.mkdtemp()
+        main = fluid.Program()
+        startup = fluid.Program()
+        with fluid.program_guard(main, startup):
+            x = fluid.data(name='x', shape=[None, 2048], dtype='float32')
+            hidden = x
+            for _ in range(8):
+                hidden = fluid.layers.fc(input=hidden, size=2048, act='relu')
+        exe = fluid.Executor(fluid.CPUPlace())
+        with fluid.scope_guard(fluid.Scope()):
+            exe.run(startup)
+            fluid.io.save_inference_model(self.model_dir, ['x'], [hidden],
+                                          exe, main)
+        self.inputs = np.random.random([16, 2048]).astype('float32')
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def serve(self, predict_fns):
+        def serve(predict):
+            for _ in range(self.iters):
+                predict([self.inputs])
+
+        threads = [
+            threading.Thread(
+                target=serve, args=(fn, )) for fn in predict_fns
+        ]
+        start = time.time()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return len(predict_fns) * self.iters / (time.time() - start)
+
+    def load(self):
+        exe = fluid.Executor(fluid.CPUPlace())
+        scope = fluid.Scope()
+        with fluid.scope_guard(scope):
+            program, feed_names, fetch_vars = fluid.io.load_inference_model(
+                self.model_dir, exe)
+
+        def predict(inputs):
+            return exe.run(program,
+                           feed={feed_names[0]: inputs[0]},
+                           fetch_list=fetch_vars,
+                           scope=scope,
+                           use_program_cache=True)
+
+        return predict
+
+    def report(self, name, create_predict_fns):
+        for num in self.thread_nums:
+            gc.collect()
+            base = resident_memory_mb()
+            predict_fns = create_predict_fns(num)
+            throughput = self.serve(predict_fns)
+            print("{} threads {}: {:.1f} MB, {:.1f} batches/s".format(
+                name, num, resident_memory_mb() - base, throughput))
+            del predict_fns
+
+    def test_shared_weights(self):
+        def create(num):
+            predictor = SharedWeightsPredictor(self.model_dir)
+            return [predictor.create_instance() for _ in range(num)]
+
+        self.report("SharedWeightsPredictor", create)
+
+    def test_load_per_thread(self):
+        self.report("load per thread",
+                    lambda num: [self.load() for _ in range(num)])
+
+
+if __name__ == '__main__':
+    unittest.main()
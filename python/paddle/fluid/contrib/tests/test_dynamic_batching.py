@@ -0,0 +1,174 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+import paddle.fluid.dygraph as dg
+from paddle.fluid.contrib import DynamicBatcher
+
+
+class RecordingModel(object):
+    def __init__(self, gate=None):
+        self.batch_sizes = []
+        self.gate = gate
+        self.entered = threading.Event()
+
+    def __call__(self, inputs):
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait()
+        x, y = inputs
+        self.batch_sizes.append(x.shape[0])
+        return [x + y, x.sum(axis=1)]
+
+
+class TestDynamicBatcher(unittest.TestCase):
+    def request(self, batch_size, width=3):
+        x = np.random.random([batch_size, width]).astype('float32')
+        y = np.random.random([batch_size, width]).astype('float32')
+        return [x, y]
+
+    def check(self, handle, inputs):
+        x, y = inputs
+        add, reduce = handle.result(timeout=10)
+        self.assertTrue(np.allclose(add, x + y))
+        self.assertTrue(np.allclose(reduce, x.sum(axis=1)))
+
+    def test_merge_and_split(self):
+        gate = threading.Event()
+        model = RecordingModel(gate)
+        with DynamicBatcher(model, max_batch_size=8, timeout_ms=0) as batcher:
+            # the worker blocks in the first batch while requests queue up
+            first = self.request(1)
+            handles = [batcher.submit(first)]
+            model.entered.wait()
+            requests = [self.request(n) for n in [3, 2, 3, 1, 4]]
+            handles += [batcher.submit(r) for r in requests]
+            gate.set()
+            for handle, inputs in zip(handles, [first] + requests):
+                self.check(handle, inputs)
+        self.assertEqual(model.batch_sizes, [1, 8, 5])
+        stats = batcher.stats()
+        self.assertEqual(stats['requests'], 6)
+        self.assertEqual(stats['samples'], 14)
+        self.assertEqual(stats['batches'], len(model.batch_sizes))
+
+    def test_timeout(self):
+        model = RecordingModel()
+        with DynamicBatcher(
+                model, max_batch_size=64, timeout_ms=50) as batcher:
+            inputs = self.request(2)
+            self.check(batcher.submit(inputs), inputs)
+        self.assertEqual(model.batch_sizes, [2])
+
+    def test_different_shapes(self):
+        gate = threading.Event()
+        model = RecordingModel(gate)
+        with DynamicBatcher(model, max_batch_size=8, timeout_ms=0) as batcher:
+            requests = [
+                self.request(1), self.request(2), self.request(
+                    2, width=4), self.request(2)
+            ]
+            handles = [batcher.submit(requests[0])]
+            model.entered.wait()
+            handles += [batcher.submit(r) for r in requests[1:]]
+            gate.set()
+            for handle, inputs in zip(handles, requests):
+                self.check(handle, inputs)
+        self.assertEqual(model.batch_sizes, [1, 2, 2, 2])
+
+    def test_errors(self):
+        def bad_model(inputs):
+            return [inputs[0][:1]]
+
+        with DynamicBatcher(bad_model) as batcher:
+            self.assertRaises(ValueError, batcher.run, self.request(2))
+            self.assertRaises(ValueError, batcher.submit,
+                              [np.zeros([2, 3]), np.zeros([3, 3])])
+        self.assertRaises(RuntimeError, batcher.submit, self.request(1))
+        self.assertRaises(ValueError, DynamicBatcher, bad_model, 0)
+
+    def test_threads(self):
+        model = RecordingModel()
+        batcher = DynamicBatcher(
+            model, max_batch_size=16, timeout_ms=2, num_workers=2)
+
+        def client():
+            for _ in range(20):
+                inputs = self.request(1)
+                self.check(batcher.submit(inputs), inputs)
+
+        clients = [threading.Thread(target=client) for _ in range(8)]
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        batcher.close()
+        self.assertEqual(sum(model.batch_sizes), 160)
+        self.assertEqual(batcher.stats()['requests'], 160)
+
+
+class TestDynamicBatcherModel(unittest.TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def test_inference_model(self):
+        main = fluid.Program()
+        startup = fluid.Program()
+        with fluid.program_guard(main, startup):
+            x = fluid.data(name='x', shape=[None, 13], dtype='float32')
+            y = fluid.layers.fc(input=x, size=4, act='relu')
+        exe = fluid.Executor(fluid.CPUPlace())
+        scope = fluid.Scope()
+        with fluid.scope_guard(scope):
+            exe.run(startup)
+            fluid.io.save_inference_model(self.model_dir, ['x'], [y], exe,
+                                          main)
+            inputs = np.random.random([10, 13]).astype('float32')
+            expected, = exe.run(main, feed={'x': inputs}, fetch_list=[y])
+
+        with DynamicBatcher.from_inference_model(
+                self.model_dir, num_workers=2) as batcher:
+            self.assertEqual(batcher.feed_names, ['x'])
+            handles = [
+                batcher.submit([inputs[i:i + 2]]) for i in range(0, 10, 2)
+            ]
+            outputs = np.concatenate([h.result(timeout=10)[0] for h in handles])
+        self.assertTrue(np.allclose(outputs, expected, atol=1e-6))
+
+    def test_layer(self):
+        with dg.guard(fluid.CPUPlace()):
+            linear = dg.Linear(13, 4)
+            linear.eval()
+            inputs = np.random.random([6, 13]).astype('float32')
+            expected = linear(dg.to_variable(inputs)).numpy()
+            with DynamicBatcher.from_layer(linear) as batcher:
+                handles = [batcher.submit([inputs[i:i + 3]]) for i in [0, 3]]
+                outputs = np.concatenate(
+                    [h.result(timeout=10)[0] for h in handles])
+        self.assertTrue(np.allclose(outputs, expected, atol=1e-6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@ import unittest
 import paddle.fluid as fluid
 from paddle.fluid import core
 from paddle.fluid.contrib.mixed_precision import fp16_utils
+from paddle.fluid.contrib.mixed_precision import AutoMixedPrecisionLists
 
 
 class AMPTest(unittest.TestCase):
@@ -38,6 +39,49 @@ class AMPTest(unittest.TestCase):
         res = fp16_utils.find_true_post_op(block.ops, op1, "Y")
         assert (res == [op2])
 
+    def test_rewrite_program(self):
+        main_prog = fluid.Program()
+        startup_prog = fluid.Program()
+        with fluid.program_guard(main_prog, startup_prog):
+            x = fluid.data(name='x', shape=[None, 16], dtype='float16')
+            y = fluid.data(name='y', shape=[None, 16], dtype='float32')
+            x_fp32 = fluid.layers.cast(x, 'float32')
+            hidden = fluid.layers.fc(x_fp32, 16) + fluid.layers.fc(y, 16) + \
+                fluid.layers.fc(y, 16)
+            out = fluid.layers.softmax(hidden)
+            loss = fluid.layers.mean(out)
+
+        amp_lists = AutoMixedPrecisionLists()
+        num_casts = fp16_utils.rewrite_program(main_prog, amp_lists)
+        block = main_prog.global_block()
+        params = [p.name for p in block.all_parameters()]
+        casts = [op for op in block.ops if op.type == 'cast']
+        # the cast of x, casts of 6 params, y and the input of softmax
+        self.assertEqual(num_casts, (1, 9))
+        self.assertEqual(len(casts), 9)
+
+        # casts of params are at the front of the block
+        self.assertEqual([op.type for op in block.ops[:6]], ['cast'] * 6)
+        self.assertEqual(
+            sorted([op.input('X')[0] for op in block.ops[:6]]),
+            sorted(params))
+
+        # x is not cast back to fp16, y is cast once
+        muls = [op for op in block.ops if op.type == 'mul']
+        self.assertEqual(muls[0].input('X'), [x.name])
+        self.assertEqual(muls[1].input('X'), muls[2].input('X'))
+        self.assertEqual(
+            block.var(muls[1].input('X')[0]).dtype, core.VarDesc.VarType.FP16)
+
+        for op in block.ops:
+            if op.type in amp_lists.white_list:
+                for name in op.input_arg_names:
+                    self.assertEqual(
+                        block.var(name).dtype, core.VarDesc.VarType.FP16)
+        softmax = [op for op in block.ops if op.type == 'softmax'][0]
+        self.assertEqual(
+            block.var(softmax.input('X')[0]).dtype, core.VarDesc.VarType.FP32)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,97 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+from paddle.fluid.contrib import SharedWeightsPredictor
+
+
+class TestSharedWeightsPredictor(unittest.TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        main = fluid.Program()
+        startup = fluid.Program()
+        with fluid.program_guard(main, startup):
+            x = fluid.data(name='x', shape=[None, 13], dtype='float32')
+            y = fluid.layers.fc(input=x, size=4)
+        exe = fluid.Executor(fluid.CPUPlace())
+        scope = fluid.Scope()
+        self.inputs = np.random.random([8, 13]).astype('float32')
+        with fluid.scope_guard(scope):
+            exe.run(startup)
+            fluid.io.save_inference_model(self.model_dir, ['x'], [y], exe,
+                                          main)
+            self.expected, = exe.run(main,
+                                     feed={'x': self.inputs},
+                                     fetch_list=[y])
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def run_threads(self, predictor, num_threads):
+        outputs = [None] * num_threads
+
+        def serve(i):
+            for _ in range(5):
+                outputs[i], = predictor.run([self.inputs])
+
+        threads = [
+            threading.Thread(
+                target=serve, args=(i, )) for i in range(num_threads)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return outputs
+
+    def test_threads(self):
+        predictor = SharedWeightsPredictor(self.model_dir)
+        self.assertEqual(predictor.feed_names, ['x'])
+        for output in self.run_threads(predictor, 4):
+            self.assertTrue(np.allclose(output, self.expected, atol=1e-6))
+        self.assertEqual(predictor.num_instances, 4)
+
+        # the same thread reuses its instance
+        predictor.run({'x': self.inputs})
+        predictor.run({'x': self.inputs})
+        self.assertEqual(predictor.num_instances, 5)
+
+    def test_shared_parameters(self):
+        predictor = SharedWeightsPredictor(self.model_dir)
+        instances = [predictor.create_instance() for _ in range(3)]
+        weight = [
+            var for var in predictor._program.list_vars()
+            if var.persistable and
+            var.type == fluid.core.VarDesc.VarType.LOD_TENSOR and
+            len(var.shape) == 2
+        ][0]
+        # all instances see the parameters of the shared scope
+        predictor._scope.find_var(weight.name).get_tensor().set(
+            np.zeros(weight.shape, dtype='float32'), fluid.CPUPlace())
+        outputs = [instance.run([self.inputs])[0] for instance in instances]
+        for output in outputs[1:]:
+            self.assertTrue(np.array_equal(output, outputs[0]))
+        self.assertTrue(np.allclose(outputs[0], outputs[0][:1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@ from . import core
 import numpy as np
 import os
 import six
+import itertools
 from six.moves import zip, range, xrange
 import multiprocessing
 import warnings
@@ -131,7 +132,44 @@ def check_dtype(input_dtype,
              extra_message))
 
 
+def _stack_arrays(arrays):
+    """
+    Stack the samples into a batch by one copy if all of them are ndarrays
+    of the same shape, otherwise return None.
+    """
+    if len(arrays) == 0 or not isinstance(arrays[0], np.ndarray):
+        return None
+    shape = arrays[0].shape
+    for arr in arrays:
+        if not isinstance(arr, np.ndarray) or arr.shape != shape:
+            return None
+    return np.stack(arrays)
+
+
+def _concat_arrays(arrays):
+    """
+    Concatenate the sequences into a flat batch by one copy if all of them
+    are ndarrays with the same shape except the length, otherwise return
+    None.
+    """
+    if len(arrays) == 0 or not isinstance(arrays[0], np.ndarray):
+        return None
+    shape = arrays[0].shape[1:]
+    for arr in arrays:
+        if not isinstance(arr, np.ndarray) or arr.ndim == 0 or \
+                arr.shape[1:] != shape:
+            return None
+    return np.concatenate(arrays)
+
+
 class DataToLoDTensorConverter(object):
+    """
+    Convert the samples fed one by one into a LoDTensor. For lod_level 0,
+    `data` keeps the samples. Otherwise it keeps the sequences of the last
+    LoD level, which are concatenated as a whole in `done`, so that the
+    samples and sequences given as numpy arrays are copied only once.
+    """
+
     def __init__(self, place, lod_level, shape, dtype):
         self.place = place
         self.lod_level = lod_level
@@ -156,11 +194,29 @@ class DataToLoDTensorConverter(object):
     def _feed_impl_(self, data, lod, lod_level):
         if lod_level == 0:
             self.data.append(data)
+        elif lod_level == 1:
+            lod[0].append(len(data))
+            self.data.append(data)
         else:
             lod[0].append(len(data))
             for each_data in data:
                 self._feed_impl_(each_data, lod[1:], lod_level - 1)
 
+    def _to_array(self, dtype=None):
+        if self.lod_level == 0:
+            arr = _stack_arrays(self.data)
+            if arr is None:
+                return np.array(self.data, dtype=dtype)
+        else:
+            arr = _concat_arrays(self.data)
+            if arr is None:
+                return np.array(
+                    list(itertools.chain.from_iterable(self.data)),
+                    dtype=dtype)
+        if dtype is not None and arr.dtype != dtype:
+            arr = arr.astype(dtype)
+        return arr
+
     def _check_shape(self, shape):
         for s1, s2 in zip(self.shape, shape):
             if s1 != s2 and s1 >= 0 and s2 >= 0:
@@ -169,7 +225,7 @@ class DataToLoDTensorConverter(object):
                     format(self.shape, shape))
 
     def done(self):
-        arr = np.array(self.data, dtype=self.dtype)
+        arr = self._to_array(self.dtype)
         if self.shape:
             if len(arr.shape) != len(self.shape):
                 try:
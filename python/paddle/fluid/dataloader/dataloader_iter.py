@@ -31,6 +31,7 @@ else:
 
 from .. import core
 from ..framework import in_dygraph_mode
+from ..span_profiler import span
 from ..multiprocess_utils import CleanupFuncRegistrar, _cleanup_mmap, _set_SIGCHLD_handler
 
 # multi-process worker check indices queue interval, avoid
@@ -163,23 +164,26 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
     def _thread_loop(self):
         try:
             for indices in self._sampler_iter:
-                # read data from dataset in mini-batch
-                batch = [self._dataset[i] for i in indices]
-                if self._collate_fn is not None:
-                    batch = self._collate_fn(batch)
-
-                # pack as LoDTensorArray
-                array = core.LoDTensorArray()
-                for slot in batch:
-                    if not isinstance(slot, core.LoDTensor):
-                        self._check_input_array(slot)
-                        tmp = core.LoDTensor()
-                        tmp.set(slot, core.CPUPlace())
-                        slot = tmp
-
-                    array.append(slot)
-
-                if not self._blocking_queue.push(array):
+                with span('dataloader.collate'):
+                    # read data from dataset in mini-batch
+                    batch = [self._dataset[i] for i in indices]
+                    if self._collate_fn is not None:
+                        batch = self._collate_fn(batch)
+
+                    # pack as LoDTensorArray
+                    array = core.LoDTensorArray()
+                    for slot in batch:
+                        if not isinstance(slot, core.LoDTensor):
+                            self._check_input_array(slot)
+                            tmp = core.LoDTensor()
+                            tmp.set(slot, core.CPUPlace())
+                            slot = tmp
+
+                        array.append(slot)
+
+                with span('dataloader.queue_push'):
+                    pushed = self._blocking_queue.push(array)
+                if not pushed:
                     break
 
             self._blocking_queue.close()
@@ -203,13 +207,14 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
 
     def __next__(self):
         try:
-            if in_dygraph_mode():
-                return self._reader.read_next_var_list()
-            else:
-                if self._return_list:
-                    return self._reader.read_next_list()
+            with span('dataloader.wait', 'input'):
+                if in_dygraph_mode():
+                    return self._reader.read_next_var_list()
                 else:
-                    return self._reader.read_next()
+                    if self._return_list:
+                        return self._reader.read_next_list()
+                    else:
+                        return self._reader.read_next()
         except StopIteration:
             self._reader.reset()
             six.reraise(*sys.exc_info())
@@ -417,7 +422,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
     def _thread_loop(self):
         while not self._thread_done_event.is_set():
-            batch = self._get_data()
+            with span('dataloader.worker_wait'):
+                batch = self._get_data()
             if not self._thread_done_event.is_set():
                 if batch is None:
                     self._exit_thread_expectedly()
@@ -441,7 +447,9 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                                     slot = tmp
                                 array.append(slot)
 
-                        if not self._blocking_queue.push(array):
+                        with span('dataloader.queue_push'):
+                            pushed = self._blocking_queue.push(array)
+                        if not pushed:
                             self._blocking_queue.close()
                     except:
                         self._exit_thread_unexpectedly()
@@ -527,18 +535,19 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                 self._thread_done_event.set()
                 self._blocking_queue.close()
 
-            if in_dygraph_mode():
-                data = self._reader.read_next_var_list()
-            else:
-                if self._return_list:
-                    data = self._reader.read_next_list()
-                    # static graph organized data on multi-device with list, if
-                    # place number is 1, there is only 1 device, extra the data
-                    # from list for devices to be compatible with dygraph mode
-                    if len(self._places) == 1:
-                        data = data[0]
+            with span('dataloader.wait', 'input'):
+                if in_dygraph_mode():
+                    data = self._reader.read_next_var_list()
                 else:
-                    data = self._reader.read_next()
+                    if self._return_list:
+                        data = self._reader.read_next_list()
+                        # static graph organized data on multi-device with list, if
+                        # place number is 1, there is only 1 device, extra the data
+                        # from list for devices to be compatible with dygraph mode
+                        if len(self._places) == 1:
+                            data = data[0]
+                    else:
+                        data = self._reader.read_next()
             self._on_output_batch()
             return data
         except StopIteration:
@@ -23,6 +23,7 @@ import inspect
 import pdb
 import re
 import types
+import weakref
 
 import numpy
 import six
@@ -35,6 +36,13 @@ DECORATOR_NAMES = ['declarative', 'dygraph_to_static_func']
 program_translator = ProgramTranslator()
 to_static_func = program_translator.get_func
 
+# Caches the decisions of `convert_call`, keyed by the function, the function
+# of a method, the Layer or the class of other callable objects. The keys are
+# weak references so that the cache does not pin them or their modules. The
+# values are weak references to the converted functions, which are kept by
+# the cache of ProgramTranslator, or None if the call is not converted.
+_convert_call_cache = weakref.WeakKeyDictionary()
+
 
 def is_builtin(func):
     if isinstance(func, types.BuiltinFunctionType):
@@ -95,26 +103,71 @@ def convert_call(func):
           #  [1. 1. 1.]]
 
     """
-    func_self = None
-    converted_call = None
-
     if is_builtin_len(func):
         return convert_len
 
-    if is_builtin(func) or is_paddle_func(func):
+    if isinstance(func, types.BuiltinFunctionType):
+        return func
+
+    if program_translator.enable_declarative:
+        converted_call = _cached_convert_call(func)
+    else:
+        converted_call = _convert_call(func)
+
+    if converted_call is None:
+        return func
+
+    if inspect.isfunction(func):
+        return converted_call
+    # the converted function of a method, a Layer or a callable object takes
+    # self as its first argument
+    func_self = func.__self__ if inspect.ismethod(func) else func
+    return functools.partial(converted_call, func_self)
+
+
+def _cache_key(func):
+    if inspect.isfunction(func) or isinstance(func, Layer):
         return func
+    if inspect.ismethod(func):
+        return func.__func__
+    return func.__class__
+
+
+def _cached_convert_call(func):
+    try:
+        key = _cache_key(func)
+        converted_ref = _convert_call_cache.get(key, False)
+    except TypeError:
+        # can not be weakly referenced
+        return _convert_call(func)
+
+    if converted_ref is None:
+        return None
+    converted_call = converted_ref() if converted_ref else None
+    if converted_call is None:
+        converted_call = _convert_call(func)
+        _convert_call_cache[key] = None if converted_call is None \
+            else weakref.ref(converted_call)
+    return converted_call
 
+
+def _convert_call(func):
+    """
+    Returns the converted function of `func` without binding self, or None
+    if it is not converted.
+    """
+    if is_builtin(func) or is_paddle_func(func):
+        return None
+
+    converted_call = None
     if inspect.isfunction(func):
         # TODO(liym27): If func is a lambda function, special conversion is needed.
         if func.__name__ == '<lambda>':
-            return func
+            return None
         try:
-            global_funcs = set([
-                fn for fn in func.__globals__.values() if inspect.isfunction(fn)
-            ])
-            if func in global_funcs:
+            if func.__globals__.get(func.__name__) is func or any(
+                    fn is func for fn in six.itervalues(func.__globals__)):
                 converted_call = to_static_func(func)
-                func_self = getattr(func, '__self__', None)
         except AttributeError:
             # NOTE:
             # If func is not in __globals__, it does not need to be transformed
@@ -128,7 +181,6 @@ def convert_call(func):
     elif inspect.ismethod(func):
         try:
             converted_call = to_static_func(func)
-            func_self = getattr(func, '__self__', None)
         except (IOError, OSError):
             # NOTE: func may have been decorated.
             converted_call = None
@@ -138,25 +190,20 @@ def convert_call(func):
             try:
                 forward_func = to_static_func(func.forward)
                 setattr(func, 'forward', forward_func)
-                func_self = func
+                # the Layer is called with itself, which goes to the
+                # converted forward set on it.
+                converted_call = func
             except Exception:
                 # NOTE: func.forward may have been decorated.
-                func_self = None if func_self else func_self
-            converted_call = func
+                converted_call = None
         else:
             try:
                 call_func = func.__class__.__call__
                 converted_call = to_static_func(call_func)
-                func_self = func
             except Exception:
                 # NOTE:
                 # If `func` is a class which is being initialized, for example `convert_call(Foo)()`,
                 # it doesn't need to be transformed
-                func_self = None if func_self else func_self
-
-    if converted_call is None:
-        return func
+                converted_call = None
 
-    if func_self:
-        converted_call = functools.partial(converted_call, func_self)
     return converted_call
@@ -13,6 +13,9 @@
 # limitations under the License.
 import os
 import six
+import time
+import functools
+import weakref
 import numpy as np
 from collections import OrderedDict
 from .. import core
@@ -222,6 +225,54 @@ class ParallelEnv(object):
 Env = ParallelEnv
 
 
+class _GradBucket(object):
+    """
+    A group of gradients all-reduced together. The dense gradients of a
+    bucket are copied into a fused buffer kept across steps, and become
+    views of it, so that the buffer is all-reduced in place without
+    splitting it back.
+
+    NOTE: the sparse (SelectedRows) gradients of a dtype are put in a bucket
+    only to all-reduce them in a fixed order after the dense buckets and to
+    report their stats. They are not fused, each of them is still
+    all-reduced by its own call, i.e. its rows are gathered one by one.
+    """
+
+    def __init__(self, params, dtype, is_sparse):
+        self.params = params
+        self.dtype = dtype
+        self.is_sparse = is_sparse
+        self.numel = 0 if is_sparse else int(
+            sum([np.prod(param.shape) for param in params]))
+        self.buffer = None
+        # the names of parameters whose gradients are final in this step
+        self.ready = set()
+        self.allreduce_calls = 0
+        self.allreduce_time = 0.0
+
+    def stats(self):
+        # the fused buffer pads each gradient to the alignment of the place
+        numel = self.numel if self.buffer is None else int(
+            np.prod(self.buffer.shape))
+        return {
+            'num_params': len(self.params),
+            'numel': numel,
+            'bytes': numel * core.size_of_dtype(self.dtype),
+            'dtype': self.dtype,
+            'is_sparse': self.is_sparse,
+            'allreduce_calls': self.allreduce_calls,
+            'allreduce_time_ms': self.allreduce_time * 1e3
+        }
+
+
+def _grad_ready_hook(data_parallel_ref, name):
+    # NOTE: the hook refers to DataParallel weakly, since it is held by the
+    # gradient of parameter in C++ which python gc cannot track.
+    data_parallel = data_parallel_ref()
+    if data_parallel is not None:
+        data_parallel._on_grad_ready(name)
+
+
 class DataParallel(layers.Layer):
     """
     Run the dygraph module with data parallelism.
@@ -235,6 +286,27 @@ class DataParallel(layers.Layer):
         layers(Layer): The module that should be executed by data parallel.
         strategy(ParallelStrategy): The strategy of data parallelism, contains 
             environment configuration related to parallel execution.
+        comm_buffer_size(float, optional): The max megabytes of the dense
+            gradients all-reduced together in a bucket. Default 128.
+        allreduce_fn(callable, optional): The function summing a gradient
+            Variable in place across trainers, which is called with the
+            fused buffer of each dense bucket and with each sparse gradient.
+            It can be used to run on CPU with other backends such as gloo.
+            Default None means the NCCL all-reduce of `strategy`.
+        overlap_allreduce(bool, optional): Whether to all-reduce a bucket in
+            backward as soon as the gradients in it are final, so that the
+            communication overlaps with the rest of backward. The buckets
+            are all-reduced in the same order as without overlapping, and
+            `apply_collective_grads` all-reduces the buckets not done in
+            backward and waits for the outstanding ones. It takes effect
+            from the second step, since the buckets are built in the first
+            `apply_collective_grads`. With NCCL, the dense buckets are
+            all-reduced on a separate CUDA stream. A step starts from the
+            forward of DataParallel, and every backward until
+            `apply_collective_grads` all-reduces the gradients, so all the
+            trainers must run the same backward, and the gradients should
+            not be accumulated over backward without `clear_gradients` in
+            between. Default False.
 
     Returns:
         Layer: The data paralleled module.
@@ -279,16 +351,48 @@ class DataParallel(layers.Layer):
                linear.clear_gradients()
     """
 
-    def __init__(self, layers, strategy):
+    def __init__(self,
+                 layers,
+                 strategy,
+                 comm_buffer_size=128,
+                 allreduce_fn=None,
+                 overlap_allreduce=False):
         super(DataParallel,
               self).__init__(layers.full_name() + "_data_parallel")
 
         self._layers = layers
         self._strategy = strategy
+        self._comm_buffer_size = int(comm_buffer_size * 1024 * 1024)
+        self._allreduce_fn = allreduce_fn
+        self._overlap_allreduce = overlap_allreduce
+        self._grad_buckets = []
+        self._grad_buckets_key = None
+        # the index of bucket of each parameter, the number of buckets
+        # all-reduced in this step, and whether the gradients are all-reduced
+        # in backward, i.e., a step is started by forward
+        self._grad_bucket_index = {}
+        self._next_grad_bucket = 0
+        self._in_step = False
+        self._hooked_params = set()
+        self._comm_place = None
 
     def forward(self, *inputs, **kwargs):
+        tracer = framework._dygraph_tracer()
+        if self._overlap_allreduce and tracer._train_mode:
+            # a step starts, in case the last one did not run
+            # apply_collective_grads after backward
+            self._reset_step(True)
         return self._layers(*inputs, **kwargs)
 
+    def _reset_step(self, in_step):
+        # wait for the all-reduce launched in backward before the gradients
+        # are used or cleared
+        self._wait_allreduce()
+        self._next_grad_bucket = 0
+        for bucket in self._grad_buckets:
+            bucket.ready.clear()
+        self._in_step = in_step
+
     def scale_loss(self, loss):
         """
         Scale the loss. In data parallel mode, the loss should be scale with
@@ -341,49 +445,145 @@ class DataParallel(layers.Layer):
         loss = loss / loss_scale
         return loss
 
-    def _coalesce_tensors(self, var_groups):
-        from ..layers import nn
-        coalesced_grads_and_grad_vars = []
-        for group_id, grad_vars in var_groups.items():
-            flattened_vars = []
-            g_var_shapes = []
-            for g_var in grad_vars:
-                g_var_shapes.append(g_var.shape)
-                flattened_vars.append(
-                    nn.reshape(
-                        x=g_var, shape=[np.prod(g_var.shape)], inplace=True))
-            coalesced_grad = nn.concat(flattened_vars)
-            coalesced_grads_and_grad_vars.append(
-                [coalesced_grad, grad_vars, g_var_shapes])
-        return coalesced_grads_and_grad_vars
-
-    def _reshape_inplace(self, x, shape):
-        x_shape = self._helper.create_variable_for_type_inference(dtype=x.dtype)
-        self._helper.append_op(
-            type="reshape2",
-            inputs={'X': x},
-            attrs={'shape': shape},
-            outputs={'Out': x,
-                     'XShape': x_shape})
-
-    def _split_tensors(self, coalesced_grads_and_grad_vars):
-        from ..layers import nn
-        for coalesced_grad, origin_grad_vars, grad_shapes in coalesced_grads_and_grad_vars:
-            grad_var_len = [np.prod(g_shape) for g_shape in grad_shapes]
-            self._helper.main_program.current_block().append_op(
-                type='split',
-                inputs={'X': coalesced_grad},
-                outputs={'Out': origin_grad_vars},
-                attrs={'sections': grad_var_len,
-                       'axis': 0})
-            for g_var, g_shape in zip(origin_grad_vars, grad_shapes):
-                self._reshape_inplace(x=g_var, shape=g_shape)
-                assert g_var.shape == g_shape
+    def _build_grad_buckets(self, params):
+        # the buckets are kept until the parameters having gradients change,
+        # they are built in the same order on all trainers. The gradients of
+        # the last layers are ready first in backward, so they are put into
+        # the first buckets.
+        key = [(param.name, param._grad_ivar()._is_sparse())
+               for param in params]
+        if key == self._grad_buckets_key:
+            return False
+        self._grad_buckets_key = key
+
+        buckets = []
+        sparse_groups = OrderedDict()
+        bucket_params = []
+        bucket_bytes = 0
+        for param in reversed(params):
+            if param._grad_ivar()._is_sparse():
+                sparse_groups.setdefault(param.dtype, []).append(param)
+                continue
+            # Note: the dtype of the same bucket should be the same.
+            nbytes = np.prod(param.shape) * core.size_of_dtype(param.dtype)
+            if bucket_params and (
+                    bucket_bytes + nbytes > self._comm_buffer_size or
+                    param.dtype != bucket_params[0].dtype):
+                buckets.append(
+                    _GradBucket(bucket_params, bucket_params[0].dtype, False))
+                bucket_params = []
+                bucket_bytes = 0
+            bucket_params.append(param)
+            bucket_bytes += nbytes
+        if bucket_params:
+            buckets.append(
+                _GradBucket(bucket_params, bucket_params[0].dtype, False))
+        for dtype, sparse_params in sparse_groups.items():
+            sparse_params.sort(key=lambda param: param.name)
+            buckets.append(_GradBucket(sparse_params, dtype, True))
+        self._grad_buckets = buckets
+        self._grad_bucket_index = dict(
+            (param.name, i)
+            for i, bucket in enumerate(buckets) for param in bucket.params)
+        if self._overlap_allreduce:
+            for param in params:
+                if param.name not in self._hooked_params:
+                    param._register_grad_ready_hook(
+                        functools.partial(_grad_ready_hook,
+                                          weakref.ref(self), param.name))
+                    self._hooked_params.add(param.name)
+        return True
+
+    def _coalesce_grads(self, bucket):
+        grad_vars = [param._grad_ivar() for param in bucket.params]
+        if bucket.buffer is None:
+            bucket.buffer = self._helper.create_variable_for_type_inference(
+                dtype=bucket.dtype)
+        # NOTE: the buffer is reused since its size does not change, and the
+        # copy is skipped for the gradients which are still views of it,
+        # e.g. the ones written in place by their only grad op. The padding
+        # between the gradients is zeroed since it is all-reduced too.
+        self._helper.main_program.current_block().append_op(
+            type='coalesce_tensor',
+            inputs={'Input': grad_vars},
+            outputs={'Output': grad_vars,
+                     'FusedOutput': bucket.buffer},
+            attrs={
+                'copy_data': True,
+                'set_constant': True,
+                'constant': 0.0,
+                'dtype': bucket.dtype
+            })
+
+    def _allreduce(self, var, use_calc_stream=True):
+        if self._allreduce_fn is not None:
+            self._allreduce_fn(var)
+        else:
+            var._allreduce(self._strategy, use_calc_stream)
+            if not use_calc_stream:
+                self._comm_place = framework._current_expected_place()
+
+    def _wait_allreduce(self):
+        if self._comm_place is not None:
+            core._wait_allreduce(self._comm_place)
+            self._comm_place = None
+
+    def _allreduce_bucket(self, bucket):
+        start = time.time()
+        if bucket.is_sparse:
+            # NOTE: the NCCL communicator cannot be used by two streams at
+            # the same time, so the sparse gradients are all-reduced after
+            # the dense buckets. They are not fused, see _GradBucket.
+            self._wait_allreduce()
+            for param in bucket.params:
+                self._allreduce(param._grad_ivar())
+        else:
+            self._coalesce_grads(bucket)
+            self._allreduce(
+                bucket.buffer, use_calc_stream=not self._overlap_allreduce)
+        bucket.allreduce_calls += 1
+        bucket.allreduce_time += time.time() - start
+
+    @no_grad
+    def _on_grad_ready(self, name):
+        # run by the grad ready hooks in backward, the buckets are
+        # all-reduced in order once all the gradients in them are final.
+        index = self._grad_bucket_index.get(name)
+        if (not self._in_step or index is None or
+                index < self._next_grad_bucket):
+            return
+        self._grad_buckets[index].ready.add(name)
+        while self._next_grad_bucket < len(self._grad_buckets):
+            bucket = self._grad_buckets[self._next_grad_bucket]
+            if len(bucket.ready) < len(bucket.params):
+                break
+            self._allreduce_bucket(bucket)
+            self._next_grad_bucket += 1
+
+    def grad_bucket_stats(self):
+        """
+        Get the statistics of the gradient buckets built by the last
+        `apply_collective_grads`.
+
+        Returns:
+            list: A dict for each bucket in the order of all-reduce, which
+            has 'num_params', 'numel' and 'bytes' of the fused buffer
+            including the padding of each gradient (0 for sparse buckets),
+            'dtype', 'is_sparse', and 'allreduce_calls' and
+            'allreduce_time_ms' of the bucket. A sparse bucket is not fused,
+            its gradients are all-reduced one by one in each of its
+            'allreduce_calls'. The time is measured on the
+            host, which may not include the time of asynchronous
+            communication on GPU.
+        """
+        return [bucket.stats() for bucket in self._grad_buckets]
 
     @no_grad
     def apply_collective_grads(self):
         """
-        AllReduce the Parameters' gradient.
+        AllReduce the Parameters' gradient. If `overlap_allreduce` is True,
+        it all-reduces the buckets not all-reduced in backward, and waits for
+        the all-reduce launched in backward.
 
         Examples:
             .. code-block:: python
@@ -418,50 +618,28 @@ class DataParallel(layers.Layer):
         if not self._is_data_parallel_mode():
             return
 
-        grad_var_set = set()
-        grad_vars = []
-        sparse_grad_vars = []
-        for param in self._layers.parameters():
+        params = [
+            param for param in self._layers.parameters()
             # NOTE(zcd): The grad_ivar maybe no generated.
-            if param.trainable and (param._grad_ivar() is not None):
-                g_var = param._grad_ivar()
-                if g_var._is_sparse():
-                    sparse_grad_vars.append(g_var)
-                    continue
-                grad_vars.append(g_var)
-                assert g_var not in grad_var_set
-                grad_var_set.add(g_var)
-
-        if sparse_grad_vars:
-            sparse_grad_vars.sort(key=lambda x: x.name)
-            for grad_var in sparse_grad_vars:
-                grad_var._allreduce(self._strategy)
-
-        # FIXME(zcd): the type of the var should be LoDTensor, i.e
-        # the gradients should be dense, otherwise, the following
-        # logic should be updated.
-        # 128 MB as a group
-        mega_bytes = 128 * 1024 * 1024
-        group_idx = 0
-        memory_counter = 0
-        grad_var_groups = OrderedDict()
-        dtype = grad_vars[0].dtype
-        for g_var in grad_vars:
-            # Note: the dtype of the same group should be the same.
-            bytes = np.prod(g_var.shape) * core.size_of_dtype(g_var.dtype)
-            if memory_counter < mega_bytes and dtype == g_var.dtype:
-                memory_counter += bytes
-            else:
-                memory_counter = bytes
-                group_idx += 1
-            grad_var_groups.setdefault(group_idx, []).append(g_var)
-
-        coalesced_grads_and_vars = self._coalesce_tensors(grad_var_groups)
-
-        for coalesced_grad, _, _ in coalesced_grads_and_vars:
-            coalesced_grad._allreduce(self._strategy)
-
-        self._split_tensors(coalesced_grads_and_vars)
+            if param.trainable and (param._grad_ivar() is not None)
+        ]
+        done_buckets = self._grad_buckets[:self._next_grad_bucket]
+        if self._build_grad_buckets(params) and done_buckets:
+            # the parameters having gradients change after some buckets are
+            # all-reduced in backward, so the rest gradients are all-reduced
+            # one by one in this step.
+            self._wait_allreduce()
+            done = set(param.name
+                       for bucket in done_buckets for param in bucket.params)
+            for param in params:
+                if param.name not in done:
+                    self._allreduce(param._grad_ivar())
+        else:
+            # the buckets not all-reduced in backward, e.g., in the first
+            # step or having parameters not used in this step.
+            for bucket in self._grad_buckets[self._next_grad_bucket:]:
+                self._allreduce_bucket(bucket)
+        self._reset_step(False)
 
     def _is_data_parallel_mode(self):
         return self._strategy.nranks > 1
@@ -29,6 +29,7 @@ from . import compiler
 from .. import compat as cpt
 from .trainer_factory import TrainerFactory
 from .trainer_factory import FetchHandlerMonitor
+from .span_profiler import span, add_counter
 import copy
 
 __all__ = ['Executor', 'global_scope', 'scope_guard']
@@ -390,7 +391,7 @@ def _get_program_cache_key(feed, fetch_list):
     return str(feed_var_names + fetch_var_names)
 
 
-def _as_lodtensor(data, place, dtype=None):
+def _as_lodtensor(data, place, dtype=None, tensor=None):
     """
         Convert numpy.ndarray to Tensor, its only support Tensor without LoD information.
         For higher dimensional sequence data, please use LoDTensor directly.
@@ -407,6 +408,8 @@ def _as_lodtensor(data, place, dtype=None):
             data(numpy.ndarray|list|tuple|scalar): a instance of array, scalar, list or tuple
             data(core.Place): the place of created tensor
             dtype(core.VarDesc.VarType|str): the expected data type of created tensor
+            tensor(core.LoDTensor): the tensor to copy data into, its memory is
+                reused if it is large enough. A new tensor is created if None.
 
         Returns:
             LoDTensor
@@ -433,11 +436,35 @@ def _as_lodtensor(data, place, dtype=None):
                     type(data)))
 
     # convert numpy.ndarray to tensor
-    tensor = core.LoDTensor()
+    if tensor is None:
+        tensor = core.LoDTensor()
     tensor.set(data, place)
     return tensor
 
 
+class _FeedCache(object):
+    """
+    The feed targets of a cached program, with a persistent tensor and the
+    last validated (shape, dtype) signature of each target, so that feeding
+    data of the same signature neither allocates tensors nor validates it
+    again.
+    """
+
+    def __init__(self, program):
+        global_block = program.global_block()
+        # (feed target name, var, column in feed list)
+        self.targets = []
+        for op in global_block.ops:
+            if op.desc.type() == 'feed':
+                name = op.desc.output('Out')[0]
+                self.targets.append(
+                    (name, global_block.var(name), op.desc.attr('col')))
+            else:
+                break
+        self.tensors = dict()
+        self.signatures = dict()
+
+
 class FetchHandler(object):
     def __init__(self, var_dict=None, period_secs=60):
         assert var_dict != None
@@ -477,6 +504,14 @@ class Executor(object):
             will set the default device according to its installation version. If Paddle
             is CPU version, the default device would be set to `CPUPlace()` . If Paddle is
             GPU version, the default device would be set to `CUDAPlace(0)` . Default is None.
+        reuse_feed_tensors(bool): Whether to keep a tensor for each feed target of the
+            programs cached by `use_program_cache=True` , and copy the fed numpy arrays
+            into them instead of creating new tensors for every run. The fed data is
+            only validated when its shape or dtype changes. It speeds up running small
+            programs frequently, e.g. online inference, but the Executor should not be
+            run by multiple threads at the same time. A fed variable fetched with
+            `return_numpy=False` is copied, so it is not overwritten by the next run.
+            Default is False.
 
     Returns:
         Executor
@@ -540,7 +575,7 @@ class Executor(object):
                                fetch_list=[loss.name])
     """
 
-    def __init__(self, place=None):
+    def __init__(self, place=None, reuse_feed_tensors=False):
         if place is None:
             if core.is_compiled_with_cuda():
                 self.place = core.CUDAPlace(0)
@@ -552,7 +587,9 @@ class Executor(object):
         self.ctx_caches = dict()
         self.scope_caches = dict()
         self.var_caches = dict()
+        self.feed_caches = dict()
         self.pruned_program_caches = dict()
+        self._reuse_feed_tensors = reuse_feed_tensors
         p = core.Place()
         p.set_place(self.place)
         self._default_executor = core.Executor(p)
@@ -589,6 +626,12 @@ class Executor(object):
     def _add_scope_cache(self, scope_cache_key, scope):
         self.scope_caches[scope_cache_key] = scope
 
+    def _get_feed_cache(self, program_cache_key):
+        return self.feed_caches.get(program_cache_key, None)
+
+    def _add_feed_cache(self, program_cache_key, feed_cache):
+        self.feed_caches[program_cache_key] = feed_cache
+
     def _add_feed_fetch_ops(self, program, feed, fetch_list, feed_var_name,
                             fetch_var_name):
         tmp_program = program.clone()
@@ -655,6 +698,27 @@ class Executor(object):
             else:
                 break
 
+    def _feed_data_with_cache(self, feed_cache, feed, feed_var_name, scope):
+        for name, var, idx in feed_cache.targets:
+            cur_feed = feed[name]
+            if isinstance(cur_feed, np.ndarray):
+                signature = (cur_feed.shape, cur_feed.dtype)
+            else:
+                signature = None
+            if not isinstance(cur_feed, core.LoDTensor):
+                tensor = feed_cache.tensors.get(name, None)
+                if tensor is None:
+                    tensor = core.LoDTensor()
+                    feed_cache.tensors[name] = tensor
+                cur_feed = _as_lodtensor(cur_feed, self.place, var.dtype,
+                                         tensor)
+            if signature is None:
+                signature = (tuple(cur_feed.shape()), cur_feed._dtype())
+            if feed_cache.signatures.get(name, None) != signature:
+                check_feed_shape_type(var, cur_feed)
+                feed_cache.signatures[name] = signature
+            core.set_feed_variable(scope, cur_feed, feed_var_name, idx)
+
     def _fetch_data(self, fetch_list, fetch_var_name, scope):
         outs = [
             core.get_fetch_variable(scope, fetch_var_name, i)
@@ -852,46 +916,51 @@ class Executor(object):
         need_check_feed = program._program is not None
         if need_check_feed:
             global_block = program._program.global_block()
-        if isinstance(feed, dict):
-            feed_tensor_dict = dict()
-            for feed_name in feed:
-                feed_tensor = feed[feed_name]
-                var = global_block.var(feed_name) if need_check_feed else None
-                if not isinstance(feed_tensor, core.LoDTensor):
-                    # always set to CPU place, since the tensor need to be split
-                    # it is fast in CPU
-                    feed_tensor = _as_lodtensor(feed[feed_name],
-                                                core.CPUPlace(), var.dtype
-                                                if var else None)
-                if need_check_feed:
-                    check_feed_shape_type(var, feed_tensor, exe.device_count())
-                feed_tensor_dict[feed_name] = feed_tensor
-
-            exe.feed_and_split_tensor_into_local_scopes(feed_tensor_dict)
-        elif isinstance(feed, list) or isinstance(feed, tuple):
-            res = list()
-            for i, each in enumerate(feed):
-                if not isinstance(each, dict):
-                    raise TypeError(
-                        "Each element of feed list should be a dict")
-                res_dict = dict()
-                for feed_name in each:
-                    tensor = each[feed_name]
+        with span('executor.feed', 'python'):
+            if isinstance(feed, dict):
+                feed_tensor_dict = dict()
+                for feed_name in feed:
+                    feed_tensor = feed[feed_name]
                     var = global_block.var(
                         feed_name) if need_check_feed else None
-                    if not isinstance(tensor, core.LoDTensor):
-                        tensor = _as_lodtensor(each[feed_name],
-                                               program._places[i], var.dtype
-                                               if var else None)
+                    if not isinstance(feed_tensor, core.LoDTensor):
+                        # always set to CPU place, since the tensor need to be split
+                        # it is fast in CPU
+                        feed_tensor = _as_lodtensor(feed[feed_name],
+                                                    core.CPUPlace(), var.dtype
+                                                    if var else None)
                     if need_check_feed:
-                        check_feed_shape_type(var, tensor)
-                    res_dict[feed_name] = tensor
-                res.append(res_dict)
-            exe.feed_tensors_into_local_scopes(res)
+                        check_feed_shape_type(var, feed_tensor,
+                                              exe.device_count())
+                    feed_tensor_dict[feed_name] = feed_tensor
+
+                exe.feed_and_split_tensor_into_local_scopes(feed_tensor_dict)
+            elif isinstance(feed, list) or isinstance(feed, tuple):
+                res = list()
+                for i, each in enumerate(feed):
+                    if not isinstance(each, dict):
+                        raise TypeError(
+                            "Each element of feed list should be a dict")
+                    res_dict = dict()
+                    for feed_name in each:
+                        tensor = each[feed_name]
+                        var = global_block.var(
+                            feed_name) if need_check_feed else None
+                        if not isinstance(tensor, core.LoDTensor):
+                            tensor = _as_lodtensor(each[feed_name],
+                                                   program._places[i], var.dtype
+                                                   if var else None)
+                        if need_check_feed:
+                            check_feed_shape_type(var, tensor)
+                        res_dict[feed_name] = tensor
+                    res.append(res_dict)
+                exe.feed_tensors_into_local_scopes(res)
 
         fetch_var_names = list(map(_to_name_str, fetch_list))
-        tensors = exe.run(fetch_var_names, return_merged)._move_to_list()
-        return as_numpy(tensors) if return_numpy else tensors
+        with span('executor.run', 'compute'):
+            tensors = exe.run(fetch_var_names, return_merged)._move_to_list()
+        with span('executor.fetch', 'python'):
+            return as_numpy(tensors) if return_numpy else tensors
 
     def run(self,
             program=None,
@@ -1201,54 +1270,79 @@ class Executor(object):
                 % (type(program)))
 
         if use_program_cache:
-            cache_key = _get_strong_program_cache_key(program, feed, fetch_list)
-            cached_program = self._get_program_cache(cache_key)
-            cached_ctx = self._get_ctx_cache(cache_key)
-            cached_scope = self._get_scope_cache(cache_key)
+            with span('executor.program_cache', 'python'):
+                cache_key = _get_strong_program_cache_key(program, feed,
+                                                          fetch_list)
+                cached_program = self._get_program_cache(cache_key)
+                cached_ctx = self._get_ctx_cache(cache_key)
+                cached_scope = self._get_scope_cache(cache_key)
             if cached_program is None:
-                cached_program = self._add_feed_fetch_ops(
+                add_counter('executor.program_cache_miss')
+                with span('executor.prepare', 'python'):
+                    cached_program = self._add_feed_fetch_ops(
+                        program=program,
+                        feed=feed,
+                        fetch_list=fetch_list,
+                        feed_var_name=feed_var_name,
+                        fetch_var_name=fetch_var_name)
+                    self._add_program_cache(cache_key, cached_program)
+                    fetch_list_str = list(map(_to_name_str, fetch_list))
+                    cached_ctx = self._default_executor.prepare(
+                        cached_program.desc, 0, fetch_list_str, False)
+                    # currently, we cache program, vars, sub_scope here
+                    # we suppose that in a life cycle of training, a user
+                    # will not create many programs. So, here the basic
+                    # rule of caching is to cache all unseen (program, var, scope)
+                    # when a user use use_program_cache.
+                    cached_scope = scope.new_scope()
+                    self._default_executor.create_variables(cached_program.desc,
+                                                            cached_scope, 0)
+                    self._add_ctx_cache(cache_key, cached_ctx)
+                    self._add_scope_cache(cache_key, cached_scope)
+                    if self._reuse_feed_tensors:
+                        self._add_feed_cache(cache_key,
+                                             _FeedCache(cached_program))
+            else:
+                add_counter('executor.program_cache_hit')
+            program = cached_program
+            ctx = cached_ctx
+            scope = cached_scope
+        else:
+            with span('executor.prepare', 'python'):
+                program = self._add_feed_fetch_ops(
                     program=program,
                     feed=feed,
                     fetch_list=fetch_list,
                     feed_var_name=feed_var_name,
                     fetch_var_name=fetch_var_name)
-                self._add_program_cache(cache_key, cached_program)
-                fetch_list_str = list(map(_to_name_str, fetch_list))
-                cached_ctx = self._default_executor.prepare(
-                    cached_program.desc, 0, fetch_list_str, False)
-                # currently, we cache program, vars, sub_scope here
-                # we suppose that in a life cycle of training, a user
-                # will not create many programs. So, here the basic
-                # rule of caching is to cache all unseen (program, var, scope)
-                # when a user use use_program_cache.
-                cached_scope = scope.new_scope()
-                self._default_executor.create_variables(cached_program.desc,
-                                                        cached_scope, 0)
-                self._add_ctx_cache(cache_key, cached_ctx)
-                self._add_scope_cache(cache_key, cached_scope)
-            program = cached_program
-            ctx = cached_ctx
-            scope = cached_scope
-        else:
-            program = self._add_feed_fetch_ops(
-                program=program,
-                feed=feed,
-                fetch_list=fetch_list,
-                feed_var_name=feed_var_name,
-                fetch_var_name=fetch_var_name)
 
-        self._feed_data(program, feed, feed_var_name, scope)
-        if not use_program_cache:
-            self._default_executor.run(program.desc, scope, 0, True, True,
-                                       fetch_var_name)
-        else:
-            self._default_executor.run_prepared_ctx(ctx, scope, False, False,
-                                                    False)
-        arr = scope.find_var(fetch_var_name).get_fetch_list()
-        tensors = arr._move_to_list()
-        if return_numpy:
-            return as_numpy(tensors)
-        else:
+        with span('executor.feed', 'python'):
+            if use_program_cache and self._reuse_feed_tensors:
+                self._feed_data_with_cache(
+                    self._get_feed_cache(cache_key), feed, feed_var_name,
+                    scope)
+            else:
+                self._feed_data(program, feed, feed_var_name, scope)
+        with span('executor.run', 'compute'):
+            if not use_program_cache:
+                self._default_executor.run(program.desc, scope, 0, True, True,
+                                           fetch_var_name)
+            else:
+                self._default_executor.run_prepared_ctx(ctx, scope, False,
+                                                        False, False)
+        with span('executor.fetch', 'python'):
+            arr = scope.find_var(fetch_var_name).get_fetch_list()
+            tensors = arr._move_to_list()
+            if return_numpy:
+                return as_numpy(tensors)
+            if use_program_cache and self._reuse_feed_tensors:
+                # a fetched fed var may share memory with the cached feed
+                # tensor, which is overwritten by the next run
+                feed_tensors = self._get_feed_cache(cache_key).tensors
+                for i, name in enumerate(map(_to_name_str, fetch_list)):
+                    if name in feed_tensors and isinstance(tensors[i],
+                                                           core.LoDTensor):
+                        tensors[i] = tensors[i]._copy(core.CPUPlace())
             return tensors
 
     def _run_inference(self, exe, feed):
@@ -974,6 +974,8 @@ class Variable(object):
                 pass
 
         self.block.vars[name] = self
+        if is_new_var:
+            self.block._mirror_vars_change()
         self.op = None
         self._stop_gradient = stop_gradient
         self.is_data = is_data
@@ -2166,7 +2168,9 @@ class Operator(object):
         Returns:
             None
         """
+        synced = self.block._var_index_synced()
         self.desc._rename_input(old_name, new_name)
+        self.block._reindex_op(self, synced)
 
     def _rename_output(self, old_name, new_name):
         """
@@ -2179,7 +2183,9 @@ class Operator(object):
         Returns:
             None
         """
+        synced = self.block._var_index_synced()
         self.desc._rename_output(old_name, new_name)
+        self.block._reindex_op(self, synced)
 
     @property
     def input_names(self):
@@ -2426,6 +2432,19 @@ class Block(object):
         self.ops = list()  # operator list
         self.program = program
         self.removed_vars = collections.OrderedDict()
+        # versions of the op list and the var set of desc that the python
+        # side reflects, None means never synced.
+        self._ops_version = None
+        self._vars_version = None
+        # var name --> ops producing or consuming it, and the positions of
+        # ops, built on first lookup and then maintained by edits of ops.
+        # The index is rebuilt if the inputs or outputs of ops are changed
+        # through their descs, which is told by the args version of desc.
+        self._var_producers = None
+        self._var_consumers = None
+        self._op_var_names = None
+        self._index_args_version = None
+        self._op_positions = None
 
     def __str__(self):
         return self._to_readable_code()
@@ -2677,6 +2696,10 @@ class Block(object):
         else:
             raise ValueError("unsupported var type: %s", type(v))
         orig_var_type = v.type
+        renamed_ops = []
+        if self._var_index_synced():
+            renamed_ops = self._producer_ops(name) + self._consumer_ops(name)
+        synced = self._var_index_synced()
         self.desc._rename_var(cpt.to_bytes(name), cpt.to_bytes(new_name))
         # NOTE: v is destroyed by C++ after calling _rename_var.
         d = self.desc.find_var(cpt.to_bytes(new_name))
@@ -2716,13 +2739,152 @@ class Block(object):
         # new vars/ops to python side.
         self.vars[new_name] = var
         del self.vars[name]
+        self._mirror_vars_change()
         self._sync_with_cpp()
+        for op in renamed_ops:
+            self._reindex_op(op, synced)
+        self._mirror_args_change(synced)
         return var
 
     def _remove_var(self, name):
         self._sync_with_cpp()
         self.desc._remove_var(cpt.to_bytes(name))
         del self.vars[name]
+        self._mirror_vars_change()
+
+    def _mirror_ops_change(self):
+        # the python side has applied the same single change as the op list
+        # of desc, so it stays synced if it was synced before.
+        if self._ops_version is not None:
+            self._ops_version += 1
+
+    def _mirror_vars_change(self):
+        if self._vars_version is not None:
+            self._vars_version += 1
+
+    def _build_var_index(self):
+        self._var_producers = collections.defaultdict(list)
+        self._var_consumers = collections.defaultdict(list)
+        self._op_var_names = dict()
+        self._index_args_version = self.desc._args_version()
+        for op in self.ops:
+            self._index_op(op)
+
+    def _drop_var_index(self):
+        self._var_producers = None
+        self._var_consumers = None
+        self._op_var_names = None
+        self._op_positions = None
+
+    def _index_op(self, op):
+        if self._op_var_names is None:
+            return
+        input_names = set(op.desc.input_arg_names())
+        output_names = set(op.desc.output_arg_names())
+        self._op_var_names[id(op)] = (input_names, output_names)
+        for name in input_names:
+            self._var_consumers[name].append(op)
+        for name in output_names:
+            self._var_producers[name].append(op)
+
+    def _unindex_op(self, op):
+        if self._op_var_names is None or id(op) not in self._op_var_names:
+            return
+        input_names, output_names = self._op_var_names.pop(id(op))
+        for names, index in ((input_names, self._var_consumers),
+                             (output_names, self._var_producers)):
+            for name in names:
+                index[name].remove(op)
+                if not index[name]:
+                    del index[name]
+
+    def _var_index_synced(self):
+        # whether the index reflects the current inputs and outputs of ops
+        return self._op_var_names is not None and \
+            self._index_args_version == self.desc._args_version()
+
+    def _mirror_args_change(self, synced):
+        # the ops whose inputs or outputs have just changed are reindexed,
+        # so the index stays synced if it was synced before the change.
+        if synced:
+            self._index_args_version = self.desc._args_version()
+
+    def _reindex_op(self, op, synced):
+        """
+        Update the producer/consumer index after the inputs or outputs of
+        `op` are changed through its desc, `synced` is whether the index was
+        synced before the change.
+        """
+        if self._op_var_names is not None and id(op) in self._op_var_names:
+            self._unindex_op(op)
+            self._index_op(op)
+        self._mirror_args_change(synced)
+
+    def _shift_positions(self, start):
+        # update the cached positions of ops from start to the end
+        if self._op_positions is not None:
+            for i in six.moves.range(max(start, 0), len(self.ops)):
+                self._op_positions[id(self.ops[i])] = i
+
+    def _positions(self):
+        self._sync_with_cpp()
+        if self._op_positions is None:
+            self._op_positions = dict(
+                (id(op), i) for i, op in enumerate(self.ops))
+        return self._op_positions
+
+    def _indexed_ops(self, name, producer):
+        self._sync_with_cpp()
+        if not self._var_index_synced():
+            self._build_var_index()
+        index = self._var_producers if producer else self._var_consumers
+        ops = index.get(cpt.to_text(name))
+        if not ops:
+            return []
+        positions = self._positions()
+        return sorted(ops, key=lambda op: positions[id(op)])
+
+    def _producer_ops(self, name):
+        """
+        Get the operators which output the variable.
+
+        Args:
+            name(str): the name of the variable.
+
+        Returns:
+            list(Operator): the operators in the order of this block.
+        """
+        return self._indexed_ops(name, producer=True)
+
+    def _consumer_ops(self, name):
+        """
+        Get the operators which take the variable as input.
+
+        Args:
+            name(str): the name of the variable.
+
+        Returns:
+            list(Operator): the operators in the order of this block.
+        """
+        return self._indexed_ops(name, producer=False)
+
+    def _op_index(self, op):
+        """
+        Get the position of the operator in this block.
+
+        Args:
+            op(Operator): the operator.
+
+        Raises:
+            ValueError: If the operator is not in this block.
+
+        Returns:
+            int: the position of the operator.
+        """
+        positions = self._positions()
+        if id(op) not in positions:
+            raise ValueError("op %s is not in current block" % op.type)
+        return positions[id(op)]
 
     def create_parameter(self, *args, **kwargs):
         global_block = self.program.global_block()
@@ -2789,6 +2951,7 @@ class Block(object):
                                        if attrs else {},
                                        kwargs.get("stop_gradient", False))
         else:
+            synced = self._var_index_synced()
             op_desc = self.desc.append_op()
             op = Operator(
                 block=self,
@@ -2799,6 +2962,10 @@ class Block(object):
                 attrs=kwargs.get("attrs", None))
 
             self.ops.append(op)
+            self._mirror_ops_change()
+            self._index_op(op)
+            self._mirror_args_change(synced)
+            self._shift_positions(len(self.ops) - 1)
 
         return op
 
@@ -2813,9 +2980,14 @@ class Block(object):
             Operator: the insert Operator.
         """
         self._sync_with_cpp()
+        synced = self._var_index_synced()
         op_desc = self.desc._insert_op(index)
         op = Operator(block=self, desc=op_desc, *args, **kwargs)
         self.ops.insert(index, op)
+        self._mirror_ops_change()
+        self._index_op(op)
+        self._mirror_args_change(synced)
+        self._shift_positions(min(index, len(self.ops) - 1))
         return op
 
     def _remove_op(self, index):
@@ -2829,8 +3001,92 @@ class Block(object):
             None
         """
         self._sync_with_cpp()
+        self._unindex_op(self.ops[index])
         self.desc._remove_op(index, index + 1)
+        if self._op_positions is not None:
+            self._op_positions.pop(id(self.ops[index]), None)
         del self.ops[index]
+        self._mirror_ops_change()
+        self._shift_positions(index)
+
+    def _remove_ops(self, ops):
+        """
+        Remove the specific operators at one go, which costs one pass over
+        the block rather than one for each operator.
+
+        Args:
+            ops(list[Operator]): the operators to remove.
+
+        Raises:
+            ValueError: If any of the operators is not in this block, no
+                operator is removed in that case.
+
+        Returns:
+            None
+        """
+        indices = sorted(
+            set(self._op_index(op) for op in ops), reverse=True)
+        # remove from the back, consecutive operators in one call
+        i = 0
+        while i < len(indices):
+            end = indices[i] + 1
+            while i + 1 < len(indices) and indices[i + 1] == indices[i] - 1:
+                i += 1
+            self.desc._remove_op(indices[i], end)
+            self._mirror_ops_change()
+            i += 1
+
+        removed = set(indices)
+        for index in removed:
+            self._unindex_op(self.ops[index])
+        self.ops[:] = [
+            op for index, op in enumerate(self.ops) if index not in removed
+        ]
+        self._op_positions = None
+
+    def _insert_ops(self, ops):
+        """
+        Insert operators at one go, the op list is rebuilt once rather than
+        shifted for each operator.
+
+        Args:
+            ops(list[tuple]): list of (index, kwargs), the operator created
+                by kwargs as in append_op is inserted before the operator at
+                index of the op list, operators inserted at the same index
+                keep their order in ops.
+
+        Returns:
+            list[Operator]: the inserted operators.
+        """
+        self._sync_with_cpp()
+        old_ops = list(self.ops)
+        new_ops = [self.append_op(**kwargs) for _, kwargs in ops]
+        if not new_ops:
+            return new_ops
+        inserted = collections.defaultdict(list)
+        for (index, _), op in zip(ops, new_ops):
+            inserted[index].append(op)
+        ordered = []
+        for index, op in enumerate(old_ops):
+            ordered.extend(inserted[index])
+            ordered.append(op)
+        ordered.extend(inserted[len(old_ops)])
+
+        # append the descs in order and remove the old ones, the python
+        # operators are kept and point to the new descs
+        synced = self._var_index_synced()
+        num_ops = len(self.ops)
+        for op in ordered:
+            op_desc = self.desc.append_op()
+            op_desc.copy_from(op.desc)
+            op.desc = op_desc
+            self._mirror_ops_change()
+        self.desc._remove_op(0, num_ops)
+        self._mirror_ops_change()
+        self._mirror_args_change(synced)
+        self.ops[:] = ordered
+        self._op_positions = None
+        return new_ops
 
     def _slice_ops(self, start, end):
         """
@@ -2858,6 +3114,7 @@ class Block(object):
                                        if attrs else {},
                                        kwargs.get("stop_gradient", False))
         else:
+            synced = self._var_index_synced()
             op_desc = self.desc._prepend_op()
             op = Operator(
                 self,
@@ -2867,6 +3124,10 @@ class Block(object):
                 outputs=kwargs.get("outputs", None),
                 attrs=kwargs.get("attrs", None))
             self.ops.insert(0, op)
+            self._mirror_ops_change()
+            self._index_op(op)
+            self._mirror_args_change(synced)
+            self._shift_positions(0)
 
         return op
 
@@ -2874,67 +3135,47 @@ class Block(object):
         """
         Sync from the desc on the c++ end. This method is used to synchronize
         the c++ desc instance generated by backward.
-        """
-        # sync variables from cpp
-        for var in self.desc.all_vars():
-            if not self.has_var(var.name()):
-                self.create_var(name=var.name(), desc=var, type=var.type())
-
-        # sync variables removed from c++ end
-        for var in list(self.vars.keys()):
-            if not self.desc.find_var(cpt.to_bytes(var)):
-                self.vars.pop(var)
-
-        # sync operators from cpp
-        ops_in_cpp = []
-        for op_idx in range(0, self.desc.op_size()):
-            ops_in_cpp.append(self.desc.op(op_idx))
-
-        if len(self.ops) != 0:
-            first_op_in_python = self.ops[0].desc
-            last_op_in_python = self.ops[len(self.ops) - 1].desc
-            start_index = None
-            end_index = None
-            for index in range(len(ops_in_cpp)):
-                if first_op_in_python == ops_in_cpp[index]:
-                    start_index = index
-                if last_op_in_python == ops_in_cpp[index]:
-                    end_index = index
-            assert start_index is not None
-            assert end_index is not None
-            assert start_index <= end_index
-        else:
-            start_index = 0
-            end_index = -1
-
-        # sync ops append to the head of cpp_ops
-        for index in range((start_index - 1 - 1), -1, -1):
-            op_desc = ops_in_cpp[index]
-            op = Operator(self, op_desc)
-            self.ops.insert(0, op)
-
-        # sync ops append to the end of cpp_ops
-        for index in range((end_index + 1), len(ops_in_cpp)):
-            op_desc = ops_in_cpp[index]
-            op = Operator(self, op_desc)
-            self.ops.append(op)
-
-        # sync ops removed from c++ end
-        if end_index != -1 and end_index < len(self.ops):
-            ops_in_cpp_index = 0
-            ops_in_python_index = 0
-            while ops_in_python_index < len(
-                    self.ops) and ops_in_cpp_index < len(ops_in_cpp):
-                if self.ops[ops_in_python_index].desc != ops_in_cpp[
-                        ops_in_cpp_index]:
-                    del self.ops[ops_in_python_index]
-                else:
-                    ops_in_cpp_index += 1
-                    ops_in_python_index += 1
 
-        assert len(self.ops) == len(ops_in_cpp)
-        for index in range(len(self.ops)):
-            assert self.ops[index].desc == ops_in_cpp[index]
+        The op list and the var set are only walked if they have changed
+        since last sync, so that calling it before every edit is cheap. The
+        changes on the c++ end are detected by the versions of desc, and the
+        ops or vars removed only from `self.ops` or `self.vars` by their
+        sizes. Other edits made only on the python end, e.g. replacing an
+        op in `self.ops`, are not detected and should be made through the
+        methods of Block instead.
+        """
+        vars_version = self.desc._vars_version()
+        if vars_version != self._vars_version or \
+                len(self.vars) != self.desc.var_size():
+            # sync variables from cpp
+            var_names_in_cpp = set()
+            for var in self.desc.all_vars():
+                name = var.name()
+                var_names_in_cpp.add(cpt.to_text(name))
+                if not self.has_var(name):
+                    self.create_var(name=name, desc=var, type=var.type())
+
+            # sync variables removed from c++ end
+            for var in list(self.vars.keys()):
+                if var not in var_names_in_cpp:
+                    self.vars.pop(var)
+            self._vars_version = vars_version
+
+        ops_version = self.desc._ops_version()
+        if ops_version != self._ops_version or \
+                len(self.ops) != self.desc.op_size():
+            # sync operators from cpp, the python Operator of an op desc is
+            # reused, so ops added or removed at any position are handled.
+            ops_in_python = dict((id(op.desc), op) for op in self.ops)
+            ops = []
+            for op_desc in self.desc.all_ops():
+                op = ops_in_python.get(id(op_desc))
+                if op is None or op.desc is not op_desc:
+                    op = Operator(self, op_desc)
+                ops.append(op)
+            self.ops[:] = ops
+            self._ops_version = ops_version
+            self._drop_var_index()
 
     def _copy_param_info_from(self, other):
         """
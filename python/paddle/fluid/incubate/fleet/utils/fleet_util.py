@@ -37,10 +37,107 @@ _logger = get_logger(
 fleet = fleet_pslib
 
 
+def _auc_from_buckets(pos, neg):
+    """
+    Compute ROC auc from the pos and neg instance numbers of each
+    prediction bucket, by trapezoids from the highest bucket.
+
+    Returns:
+        auc_value(float)
+    """
+    pos = np.asarray(pos, dtype='float64')[::-1]
+    neg = np.asarray(neg, dtype='float64')[::-1]
+    total_pos = np.cumsum(pos)
+    total_neg = np.cumsum(neg)
+    area = np.sum(neg * (2 * total_pos - pos)) / 2
+    pos_num = total_pos[-1] if len(pos) > 0 else 0.0
+    neg_num = total_neg[-1] if len(neg) > 0 else 0.0
+    if pos_num * neg_num == 0:
+        return 0.5
+    return area / (pos_num * neg_num)
+
+
+def _bucket_error(pos, neg, k_max_span=0.01, k_relative_error_bound=0.05):
+    """
+    Compute bucket error from the pos and neg instance numbers of each
+    prediction bucket.
+
+    Buckets are merged from a start bucket until the relative error of the
+    merged ctr is below k_relative_error_bound, then the relative ctr error
+    of the merged buckets is counted and merging starts again from the next
+    bucket. Merging also restarts when the ctr of buckets spans more than
+    k_max_span. Most buckets have enough instances to be merged alone, so
+    the errors of single buckets are computed by numpy and the runs of them
+    are summed at once by prefix sums, only the other buckets are merged
+    one by one.
+    """
+    pos = np.asarray(pos, dtype='float64')
+    show = pos + np.asarray(neg, dtype='float64')
+    num_bucket = len(pos)
+    ctr = np.arange(num_bucket, dtype='float64') / num_bucket
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        adjust_ctr = ctr * show / show
+        relative_error = np.sqrt((1 - adjust_ctr) / (adjust_ctr * show))
+        single = (show != 0) & (adjust_ctr != 0) & \
+            (relative_error < k_relative_error_bound)
+        single_error = np.abs(pos / show / adjust_ctr - 1) * show
+    prefix_error = np.concatenate(
+        [[0.0], np.cumsum(np.where(single, single_error, 0))]).tolist()
+    prefix_show = np.concatenate(
+        [[0.0], np.cumsum(np.where(single, show, 0))]).tolist()
+    # the first bucket not merged alone at or after each bucket
+    next_not_single = np.where(single, num_bucket, np.arange(num_bucket))
+    next_not_single = np.minimum.accumulate(
+        next_not_single[::-1])[::-1].tolist()
+    pos = pos.tolist()
+    show = show.tolist()
+    ctr = ctr.tolist()
+
+    error_sum = 0.0
+    error_count = 0.0
+    start = 0
+    while start < num_bucket:
+        stop = next_not_single[start]
+        error_sum += prefix_error[stop] - prefix_error[start]
+        error_count += prefix_show[stop] - prefix_show[start]
+        start = stop
+        impression_sum = 0.0
+        ctr_sum = 0.0
+        click_sum = 0.0
+        i = start
+        while i < num_bucket and abs(ctr[i] - ctr[start]) <= k_max_span:
+            impression_sum += show[i]
+            ctr_sum += ctr[i] * show[i]
+            click_sum += pos[i]
+            i += 1
+            if impression_sum == 0:
+                continue
+            adjust_ctr = ctr_sum / impression_sum
+            if adjust_ctr == 0:
+                continue
+            relative_error = \
+                math.sqrt((1 - adjust_ctr) / (adjust_ctr * impression_sum))
+            if relative_error < k_relative_error_bound:
+                actual_ctr = click_sum / impression_sum
+                error_sum += abs(actual_ctr / adjust_ctr - 1) * impression_sum
+                error_count += impression_sum
+                break
+        start = i
+
+    return error_sum / error_count if error_count > 0 else 0.0
+
+
 class FleetUtil(object):
     """
     FleetUtil provides some common functions for users' convenience.
 
+    Args:
+        mode(str): "pslib" or "transpiler", default is "pslib"
+        role_maker(RoleMakerBase): role maker to reduce global metrics by,
+                                   default is None, which means the role
+                                   maker of fleet
+
     Examples:
         .. code-block:: python
 
@@ -50,8 +147,10 @@ class FleetUtil(object):
 
     """
 
-    def __init__(self, mode="pslib"):
+    def __init__(self, mode="pslib", role_maker=None):
         global fleet
+        # role maker to reduce metrics, None means fleet._role_maker
+        self._role_maker = role_maker
         if mode == "pslib":
             fleet = fleet_pslib
         elif mode == "transpiler":
@@ -60,6 +159,30 @@ class FleetUtil(object):
             raise ValueError(
                 "Please choose one mode from [\"pslib\", \"transpiler\"]")
 
+    def _get_role_maker(self):
+        if self._role_maker is not None:
+            return self._role_maker
+        return fleet._role_maker
+
+    def _all_reduce_arrays(self, arrays):
+        """
+        Sum numpy arrays over all workers. The arrays are packed into one
+        float64 buffer and reduced by a single all reduce.
+        """
+        shapes = [np.shape(a) for a in arrays]
+        packed = np.concatenate(
+            [np.asarray(
+                a, dtype='float64').reshape(-1) for a in arrays])
+        global_packed = np.zeros_like(packed)
+        self._get_role_maker()._all_reduce(packed, global_packed)
+        results = []
+        offset = 0
+        for shape in shapes:
+            size = int(np.prod(shape))
+            results.append(global_packed[offset:offset + size].reshape(shape))
+            offset += size
+        return results
+
     def rank0_print(self, s):
         """
         Worker of rank 0 print some log.
@@ -211,52 +334,12 @@ class FleetUtil(object):
         if scope.find_var(stat_pos) is None or scope.find_var(stat_neg) is None:
             self.rank0_print("not found auc bucket")
             return None
-        fleet._role_maker._barrier_worker()
-        # auc pos bucket
-        pos = np.array(scope.find_var(stat_pos).get_tensor())
-        # auc pos bucket shape
-        old_pos_shape = np.array(pos.shape)
-        # reshape to one dim
-        pos = pos.reshape(-1)
-        global_pos = np.copy(pos) * 0
-        # mpi allreduce
-        fleet._role_maker._all_reduce(pos, global_pos)
-        # reshape to its original shape
-        global_pos = global_pos.reshape(old_pos_shape)
-
-        # auc neg bucket
-        neg = np.array(scope.find_var(stat_neg).get_tensor())
-        old_neg_shape = np.array(neg.shape)
-        neg = neg.reshape(-1)
-        global_neg = np.copy(neg) * 0
-        fleet._role_maker._all_reduce(neg, global_neg)
-        global_neg = global_neg.reshape(old_neg_shape)
-
-        # calculate auc
-        num_bucket = len(global_pos[0])
-        area = 0.0
-        pos = 0.0
-        neg = 0.0
-        new_pos = 0.0
-        new_neg = 0.0
-        total_ins_num = 0
-        for i in xrange(num_bucket):
-            index = num_bucket - 1 - i
-            new_pos = pos + global_pos[0][index]
-            total_ins_num += global_pos[0][index]
-            new_neg = neg + global_neg[0][index]
-            total_ins_num += global_neg[0][index]
-            area += (new_neg - neg) * (pos + new_pos) / 2
-            pos = new_pos
-            neg = new_neg
-
-        auc_value = None
-        if pos * neg == 0 or total_ins_num == 0:
-            auc_value = 0.5
-        else:
-            auc_value = area / (pos * neg)
-
-        fleet._role_maker._barrier_worker()
+        self._get_role_maker()._barrier_worker()
+        global_pos, global_neg = self._all_reduce_arrays([
+            np.array(scope.find_var(stat_pos).get_tensor()),
+            np.array(scope.find_var(stat_neg).get_tensor())
+        ])
+        auc_value = _auc_from_buckets(global_pos[0], global_neg[0])
         return auc_value
 
     def load_fleet_model_one_table(self, table_id, path):
@@ -1353,48 +1436,23 @@ class FleetUtil(object):
             return [None] * 9
 
         # barrier worker to ensure all workers finished training
-        fleet._role_maker._barrier_worker()
+        self._get_role_maker()._barrier_worker()
 
-        # get auc
-        auc = self.get_global_auc(scope, stat_pos_name, stat_neg_name)
-        pos = np.array(scope.find_var(stat_pos_name).get_tensor())
-        # auc pos bucket shape
-        old_pos_shape = np.array(pos.shape)
-        # reshape to one dim
-        pos = pos.reshape(-1)
-        global_pos = np.copy(pos) * 0
-        # mpi allreduce
-        fleet._role_maker._all_reduce(pos, global_pos)
-        # reshape to its original shape
-        global_pos = global_pos.reshape(old_pos_shape)
-        # auc neg bucket
-        neg = np.array(scope.find_var(stat_neg_name).get_tensor())
-        old_neg_shape = np.array(neg.shape)
-        neg = neg.reshape(-1)
-        global_neg = np.copy(neg) * 0
-        fleet._role_maker._all_reduce(neg, global_neg)
-        global_neg = global_neg.reshape(old_neg_shape)
-
-        num_bucket = len(global_pos[0])
-
-        def get_metric(name):
-            metric = np.array(scope.find_var(name).get_tensor())
-            old_metric_shape = np.array(metric.shape)
-            metric = metric.reshape(-1)
-            global_metric = np.copy(metric) * 0
-            fleet._role_maker._all_reduce(metric, global_metric)
-            global_metric = global_metric.reshape(old_metric_shape)
-            return global_metric[0]
-
-        global_sqrerr = get_metric(sqrerr_name)
-        global_abserr = get_metric(abserr_name)
-        global_prob = get_metric(prob_name)
-        global_q_value = get_metric(q_name)
+        # reduce all the metric states by one all reduce
+        names = [
+            stat_pos_name, stat_neg_name, sqrerr_name, abserr_name, prob_name,
+            q_name, pos_ins_num_name, total_ins_num_name
+        ]
+        global_pos, global_neg, global_sqrerr, global_abserr, global_prob, \
+            global_q_value, pos_ins_num, total_ins_num = [
+                m[0] for m in self._all_reduce_arrays([
+                    np.array(scope.find_var(name).get_tensor())
+                    for name in names
+                ])
+            ]
         # note: get ins_num from auc bucket is not actual value,
         # so get it from metric op
-        pos_ins_num = get_metric(pos_ins_num_name)
-        total_ins_num = get_metric(total_ins_num_name)
-        neg_ins_num = total_ins_num - pos_ins_num
+        auc = _auc_from_buckets(global_pos, global_neg)
 
         mae = global_abserr / total_ins_num
         rmse = math.sqrt(global_sqrerr / total_ins_num)
@@ -1405,49 +1463,7 @@ class FleetUtil(object):
         if abs(predicted_ctr > 1e-6):
             copc = return_actual_ctr / predicted_ctr
 
-        # calculate bucket error
-        last_ctr = -1.0
-        impression_sum = 0.0
-        ctr_sum = 0.0
-        click_sum = 0.0
-        error_sum = 0.0
-        error_count = 0.0
-        click = 0.0
-        show = 0.0
-        ctr = 0.0
-        adjust_ctr = 0.0
-        relative_error = 0.0
-        actual_ctr = 0.0
-        relative_ctr_error = 0.0
-        k_max_span = 0.01
-        k_relative_error_bound = 0.05
-        for i in xrange(num_bucket):
-            click = global_pos[0][i]
-            show = global_pos[0][i] + global_neg[0][i]
-            ctr = float(i) / num_bucket
-            if abs(ctr - last_ctr) > k_max_span:
-                last_ctr = ctr
-                impression_sum = 0.0
-                ctr_sum = 0.0
-                click_sum = 0.0
-            impression_sum += show
-            ctr_sum += ctr * show
-            click_sum += click
-            if impression_sum == 0:
-                continue
-            adjust_ctr = ctr_sum / impression_sum
-            if adjust_ctr == 0:
-                continue
-            relative_error = \
-                           math.sqrt((1 - adjust_ctr) / (adjust_ctr * impression_sum))
-            if relative_error < k_relative_error_bound:
-                actual_ctr = click_sum / impression_sum
-                relative_ctr_error = abs(actual_ctr / adjust_ctr - 1)
-                error_sum += relative_ctr_error * impression_sum
-                error_count += impression_sum
-                last_ctr = -1
-
-        bucket_error = error_sum / error_count if error_count > 0 else 0.0
+        bucket_error = _bucket_error(global_pos, global_neg)
 
         return [
             auc, bucket_error, mae, rmse, return_actual_ctr, predicted_ctr,
@@ -13,13 +13,19 @@
 # limitations under the License.
 """Http Server."""
 
+import base64
+import json
 import logging
-import BaseHTTPServer
-import SimpleHTTPServer
 import time
 import threading
 import socket
 
+from six.moves import BaseHTTPServer
+from six.moves import SimpleHTTPServer
+from six.moves import socketserver
+from six.moves import http_client
+from six.moves.urllib.parse import urlparse, parse_qs, urlencode
+
 
 def get_logger(name, level, fmt):
     logger = logging.getLogger(name)
@@ -34,35 +40,93 @@ def get_logger(name, level, fmt):
 _http_server_logger = get_logger(
     __name__, logging.INFO, fmt='%(asctime)s-%(levelname)s: %(message)s')
 
+# the max seconds a request waits for keys
+MAX_WAIT_TIMEOUT = 600
+
+
+def _encode_kv(kv):
+    return json.dumps(
+        dict((key, base64.b64encode(value).decode('ascii'))
+             for key, value in kv.items())).encode('utf-8')
+
+
+def _decode_kv(data):
+    return dict((key, base64.b64decode(value))
+                for key, value in json.loads(data.decode('utf-8')).items())
+
 
 class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
     """
     kv handler class for kv http server,
     it defines the way to get/set kv in server.
+
+    The requests on /scope/key get, set or delete a single key. The requests
+    on /scope get or set multiple keys at once, values are base64 encoded in
+    a json dict:
+
+    - GET /scope?keys=k1,k2 gets the values of keys.
+    - GET /scope?size=n gets all the values in scope after it has n keys.
+    - PUT /scope sets the keys and values in body.
+
+    GET requests with timeout=t in query wait at most t seconds for the
+    keys instead of returning 404 at once.
     """
 
+    # keep connections alive, all responses have Content-Length
+    protocol_version = "HTTP/1.1"
+
+    def parse_path(self):
+        """
+        parse the request path into scope, key and query, key is None if
+        the request is on the scope, return None if path is invalid.
+        """
+        url = urlparse(self.path)
+        paths = url.path.split('/')
+        query = dict((k, v[-1]) for k, v in parse_qs(url.query).items())
+        if len(paths) == 3:
+            return paths[1], paths[2], query
+        if len(paths) == 2 and paths[1]:
+            return paths[1], None, query
+        print('len of request path must be 3: ' + self.path)
+        return None
+
     def do_GET(self):
         """
         get method for kv handler, get value according to key.
         """
         log_str = "GET " + self.address_string() + self.path
-        paths = self.path.split('/')
-        if len(paths) < 3:
-            print('len of request path must be 3: ' + self.path)
+        parsed = self.parse_path()
+        if parsed is None:
             self.send_status_code(400)
             return
-        _, scope, key = paths
-        with self.server.kv_lock:
-            value = self.server.kv.get(scope, {}).get(key)
-        if value is None:
-            log_str += ' , key not found: ' + key
-            self.send_status_code(404)
+        scope, key, query = parsed
+        try:
+            timeout = min(float(query.get('timeout', 0)), MAX_WAIT_TIMEOUT)
+            size = int(query['size']) if 'size' in query else None
+        except ValueError:
+            self.send_status_code(400)
+            return
+        if key is None:
+            if size is not None:
+                kv = self.server.wait_scope(scope, size, timeout)
+                found = len(kv) >= size
+            elif query.get('keys'):
+                keys = query['keys'].split(',')
+                kv = self.server.get_kv(scope, keys, timeout)
+                found = len(kv) == len(keys)
+            else:
+                self.send_status_code(400)
+                return
+            log_str += ' , %d keys found' % len(kv)
+            self.send_value(_encode_kv(kv), 200 if found else 404)
         else:
-            log_str += ' , key found: ' + key
-            self.send_response(200)
-            self.send_header("Content-Length", str(len(value)))
-            self.end_headers()
-            self.wfile.write(value)
+            value = self.server.get_kv(scope, [key], timeout).get(key)
+            if value is None:
+                log_str += ' , key not found: ' + key
+                self.send_status_code(404)
+            else:
+                log_str += ' , key found: ' + key
+                self.send_value(value)
         _http_server_logger.info(log_str)
 
     def do_PUT(self):
@@ -70,12 +134,6 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         put method for kv handler, set value according to key.
         """
         log_str = "PUT " + self.address_string() + self.path
-        paths = self.path.split('/')
-        if len(paths) < 3:
-            print('len of request path must be 3: ' + self.path)
-            self.send_status_code(400)
-            return
-        _, scope, key = paths
         content_length = int(self.headers['Content-Length'])
         try:
             value = self.rfile.read(content_length)
@@ -83,10 +141,20 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
             print("receive error invalid request")
             self.send_status_code(404)
             return
-        with self.server.kv_lock:
-            if self.server.kv.get(scope) is None:
-                self.server.kv[scope] = {}
-            self.server.kv[scope][key] = value
+        parsed = self.parse_path()
+        if parsed is None:
+            self.send_status_code(400)
+            return
+        scope, key, _ = parsed
+        if key is None:
+            try:
+                kv = _decode_kv(value)
+            except (ValueError, TypeError):
+                self.send_status_code(400)
+                return
+        else:
+            kv = {key: value}
+        self.server.put_kv(scope, kv)
         self.send_status_code(200)
         _http_server_logger.info(log_str)
 
@@ -95,12 +163,11 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         delete method for kv handler, set value according to key.
         """
         log_str = "DELETE " + self.address_string() + self.path
-        paths = self.path.split('/')
-        if len(paths) < 3:
-            print('len of request path must be 3: ' + self.path)
+        parsed = self.parse_path()
+        if parsed is None or parsed[1] is None:
             self.send_status_code(400)
             return
-        _, scope, key = paths
+        scope, key, _ = parsed
         with self.server.delete_kv_lock:
             if self.server.delete_kv.get(scope) is None:
                 self.server.delete_kv[scope] = []
@@ -122,18 +189,35 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         self.send_header("Content-Length", 0)
         self.end_headers()
 
+    def send_value(self, value, code=200):
+        """
+        send value back to client.
+        """
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(value)))
+        self.end_headers()
+        self.wfile.write(value)
+
 
-class KVHTTPServer(BaseHTTPServer.HTTPServer, object):
+class KVHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer,
+                   object):
     """
-    it is a http server storing kv pairs.
+    it is a http server storing kv pairs, each request is served in its own
+    thread, so that requests waiting for keys do not block the others.
     """
 
+    daemon_threads = True
+    # all workers may connect at the same time
+    request_queue_size = 1024
+
     def __init__(self, port, handler):
         """Init."""
         super(KVHTTPServer, self).__init__(('', port), handler)
         self.delete_kv_lock = threading.Lock()
         self.delete_kv = {}
         self.kv_lock = threading.Lock()
+        # notified when kv is updated
+        self.kv_cond = threading.Condition(self.kv_lock)
         self.kv = {}
 
     def get_deleted_size(self, key):
@@ -145,6 +229,116 @@ class KVHTTPServer(BaseHTTPServer.HTTPServer, object):
             ret = self.delete_kv.get(key, 0)
         return ret
 
+    def put_kv(self, scope, kv):
+        """
+        set kv pairs in scope and wake up the requests waiting for keys.
+        """
+        with self.kv_cond:
+            if self.kv.get(scope) is None:
+                self.kv[scope] = {}
+            self.kv[scope].update(kv)
+            self.kv_cond.notify_all()
+
+    def _wait(self, done, timeout):
+        # wait until done() under kv_cond, or timeout
+        deadline = time.time() + timeout
+        while not done():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            self.kv_cond.wait(remaining)
+
+    def get_kv(self, scope, keys, timeout=0):
+        """
+        get the values of keys in scope, wait at most timeout seconds for
+        all the keys. Return a dict of the keys found.
+        """
+        with self.kv_cond:
+            self._wait(lambda: all(key in self.kv.get(scope, {})
+                                   for key in keys), timeout)
+            values = self.kv.get(scope, {})
+            return dict((key, values[key]) for key in keys if key in values)
+
+    def wait_scope(self, scope, size, timeout=0):
+        """
+        wait at most timeout seconds until scope has size keys, return all
+        the kv pairs in scope.
+        """
+        with self.kv_cond:
+            self._wait(lambda: len(self.kv.get(scope, {})) >= size, timeout)
+            return dict(self.kv.get(scope, {}))
+
+
+class KVClient(object):
+    """
+    it is a client of KVServer keeping one connection, which is not thread
+    safe, each thread should have its own client.
+
+    Args:
+        endpoint(str): ip:port of KVServer
+        timeout(float): socket timeout in seconds, default is 600
+    """
+
+    def __init__(self, endpoint, timeout=MAX_WAIT_TIMEOUT):
+        """Init."""
+        host, port = endpoint.split(':')
+        self.conn = http_client.HTTPConnection(
+            host, int(port), timeout=timeout)
+
+    def _request(self, method, path, body=None):
+        self.conn.request(method, path, body)
+        response = self.conn.getresponse()
+        return response.status, response.read()
+
+    def put(self, scope, key, value):
+        """
+        set value of key in scope.
+        """
+        self._request('PUT', '/%s/%s' % (scope, key), value)
+
+    def get(self, scope, key, timeout=0):
+        """
+        get value of key in scope, wait at most timeout seconds for it.
+        Return None if not found.
+        """
+        status, value = self._request('GET', '/%s/%s?%s' % (
+            scope, key, urlencode({'timeout': timeout})))
+        return value if status == 200 else None
+
+    def put_multi(self, scope, kv):
+        """
+        set multiple kv pairs in scope by one request.
+        """
+        self._request('PUT', '/%s' % scope, _encode_kv(kv))
+
+    def get_multi(self, scope, keys, timeout=0):
+        """
+        get values of keys in scope by one request, wait at most timeout
+        seconds for all the keys. Return a dict of the keys found.
+        """
+        _, value = self._request('GET', '/%s?%s' % (scope, urlencode({
+            'keys': ','.join(keys),
+            'timeout': timeout
+        })))
+        return _decode_kv(value)
+
+    def wait_scope(self, scope, size, timeout=MAX_WAIT_TIMEOUT):
+        """
+        wait at most timeout seconds until scope has size keys, return all
+        the kv pairs in scope.
+        """
+        _, value = self._request('GET', '/%s?%s' % (scope, urlencode({
+            'size': size,
+            'timeout': timeout
+        })))
+        return _decode_kv(value)
+
+    def close(self):
+        """
+        close the connection.
+        """
+        self.conn.close()
+
 
 class KVServer:
     """
@@ -89,7 +89,7 @@ def create_lod_tensor(data, recursive_seq_lens, place):
             new_recursive_seq_lens
         ] == recursive_seq_lens, "data and recursive_seq_lens do not match"
 
-        arr = np.array(converter.data)
+        arr = converter._to_array()
 
         # FIXME(zjl): the original logic of create_lod_tensor would append
         # 1 to the shape. Maybe it is not a right way? Currently, we only
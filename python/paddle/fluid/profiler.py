@@ -16,12 +16,14 @@ from __future__ import print_function
 
 from . import core
 from .wrapped_decorator import signature_safe_contextmanager
+from .span_profiler import span, add_counter, enable_spans, disable_spans, reset_spans, span_stats, print_span_summary, save_spans
 import os
 import six
 
 __all__ = [
     'cuda_profiler', 'reset_profiler', 'profiler', 'start_profiler',
-    'stop_profiler'
+    'stop_profiler', 'span', 'add_counter', 'enable_spans', 'disable_spans',
+    'reset_spans', 'span_stats', 'print_span_summary', 'save_spans'
 ]
 
 NVPROF_CONFIG = [
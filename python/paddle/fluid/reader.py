@@ -26,6 +26,7 @@ from .dataloader import BatchSampler, Dataset
 from .dataloader.dataloader_iter import _DataLoaderIterSingleProcess, _DataLoaderIterMultiProcess, default_collate_fn
 from .layers.io import monkey_patch_reader_methods, _copy_reader_var_, double_buffer
 from .unique_name import UniqueNameGenerator
+from .span_profiler import span
 import logging
 import warnings
 from .dataset import DatasetBase, InMemoryDataset
@@ -1099,10 +1100,11 @@ class GeneratorLoader(DataLoaderBase):
 
     def __next__(self):
         try:
-            if self._return_list:
-                return self._reader.read_next_list()
-            else:
-                return self._reader.read_next()
+            with span('dataloader.wait', 'input'):
+                if self._return_list:
+                    return self._reader.read_next_list()
+                else:
+                    return self._reader.read_next()
         except StopIteration:
             self._queue.close()
             self._reset()
@@ -1124,17 +1126,20 @@ class GeneratorLoader(DataLoaderBase):
                         return
 
                 for tensors in self._tensor_reader():
-                    array = core.LoDTensorArray()
-                    for item in tensors:
-                        if not isinstance(item, core.LoDTensor):
-                            item = self._check_input_array(item)
-                            tmp = core.LoDTensor()
-                            tmp.set(item, core.CPUPlace())
-                            item = tmp
-
-                        array.append(item)
-
-                    if not self._queue.push(array):
+                    with span('dataloader.convert'):
+                        array = core.LoDTensorArray()
+                        for item in tensors:
+                            if not isinstance(item, core.LoDTensor):
+                                item = self._check_input_array(item)
+                                tmp = core.LoDTensor()
+                                tmp.set(item, core.CPUPlace())
+                                item = tmp
+
+                            array.append(item)
+
+                    with span('dataloader.queue_push'):
+                        pushed = self._queue.push(array)
+                    if not pushed:
                         break
 
                 self._queue.close()
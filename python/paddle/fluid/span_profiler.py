@@ -0,0 +1,290 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Lightweight instrumentation of the Python side of Paddle, such as the feed
+and fetch conversion of Executor and the waiting of DataLoader, which is
+invisible to the C++ profiler.
+"""
+
+from __future__ import print_function
+
+import threading
+import time
+
+import six
+
+__all__ = [
+    'span', 'add_counter', 'enable_spans', 'disable_spans', 'reset_spans',
+    'span_stats', 'print_span_summary', 'save_spans'
+]
+
+# The categories of a step: 'input' is waiting for data, 'python' is the
+# Python overhead around running programs and 'compute' is running programs.
+SPAN_CATEGORIES = ['input', 'python', 'compute']
+
+_enabled = False
+_record_events = False
+_max_events = 0
+_lock = threading.Lock()
+# name -> [category, calls, total, min, max], times in seconds
+_stats = {}
+_counters = {}
+# (name, thread ident, start, end)
+_events = []
+_num_dropped_events = 0
+
+
+class _NullSpan(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span(object):
+    __slots__ = ['name', 'category', 'start']
+
+    def __init__(self, name, category):
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *args):
+        _record(self.name, self.category, self.start, time.time())
+        return False
+
+
+def _record(name, category, start, end):
+    global _num_dropped_events
+    elapsed = end - start
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            _stats[name] = [category, 1, elapsed, elapsed, elapsed]
+        else:
+            stat[1] += 1
+            stat[2] += elapsed
+            if elapsed < stat[3]:
+                stat[3] = elapsed
+            if elapsed > stat[4]:
+                stat[4] = elapsed
+        if _record_events:
+            if len(_events) < _max_events:
+                _events.append((name, threading.current_thread().ident, start,
+                                end))
+            else:
+                _num_dropped_events += 1
+
+
+def span(name, category=None):
+    """
+    Get a context manager measuring the time of the code inside it as a
+    span named `name`. When spans are not enabled, it returns a shared
+    context manager doing nothing, so that spans can be left in hot paths.
+
+    Args:
+        name (str): The name of span.
+        category (str, optional): One of 'input', 'python' and 'compute', the
+            time of spans in these categories are summed up as the breakdown
+            of steps in the summary. Default None means not in the breakdown.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle.fluid.profiler as profiler
+
+            profiler.enable_spans()
+            for batch in range(10):
+                with profiler.span('preprocess', 'input'):
+                    pass # ...
+            profiler.print_span_summary()
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category)
+
+
+def add_counter(name, value=1):
+    """
+    Add value to the counter named `name`. It does nothing when spans are
+    not enabled.
+
+    Args:
+        name (str): The name of counter.
+        value (int|float, optional): The value to add. Default 1.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def enable_spans(record_events=False, max_events=1000000):
+    """
+    Enable the spans and counters.
+
+    Args:
+        record_events (bool, optional): Whether to keep every span, so that
+            they can be saved by `save_spans` and shown in the timeline.
+            Default False means only the statistics are kept.
+        max_events (int, optional): The max number of spans kept, the spans
+            after it are dropped. Default 1000000.
+    """
+    global _enabled, _record_events, _max_events
+    _record_events = record_events
+    _max_events = max_events
+    _enabled = True
+
+
+def disable_spans():
+    """
+    Disable the spans and counters, the recorded data is kept.
+    """
+    global _enabled
+    _enabled = False
+
+
+def reset_spans():
+    """
+    Clear the recorded spans and counters.
+    """
+    global _num_dropped_events
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+        del _events[:]
+        _num_dropped_events = 0
+
+
+def span_stats():
+    """
+    Get the statistics of spans and counters.
+
+    Returns:
+        tuple: (spans, counters). spans is a dict from names to dicts of
+        category, calls, total, min, max and ave, times in milliseconds.
+        counters is a dict from names to values.
+    """
+    spans = {}
+    with _lock:
+        for name, (category, calls, total, min_t, max_t) in six.iteritems(
+                _stats):
+            spans[name] = {
+                'category': category,
+                'calls': calls,
+                'total': total * 1e3,
+                'min': min_t * 1e3,
+                'max': max_t * 1e3,
+                'ave': total * 1e3 / calls
+            }
+        counters = dict(_counters)
+    return spans, counters
+
+
+def print_span_summary(sorted_key=None):
+    """
+    Print the statistics of spans, the breakdown of steps by the categories
+    of spans, and the counters.
+
+    Args:
+        sorted_key (str, optional): The order of spans, which should be one
+            of None, 'calls', 'total', 'max', 'min' or 'ave'. Default None
+            means sorting by names.
+
+    Raises:
+        ValueError: If `sorted_key` is not in
+            ['calls', 'total', 'max', 'min', 'ave'].
+    """
+    if sorted_key not in [None, 'calls', 'total', 'max', 'min', 'ave']:
+        raise ValueError("The sorted_key must be None or in 'calls', 'total', "
+                         "'max', 'min' and 'ave'")
+    spans, counters = span_stats()
+    if sorted_key is None:
+        names = sorted(spans)
+    else:
+        names = sorted(
+            spans, key=lambda name: spans[name][sorted_key], reverse=True)
+    total = sum([s['total'] for s in spans.values()])
+
+    print("------------------------->  Python Span Report  "
+          "<-------------------------\n")
+    print("Time unit: ms")
+    print("%-32s%-12s%-12s%-12s%-12s%-12s%-12s" %
+          ("Span", "Calls", "Total", "Min.", "Max.", "Ave.", "Ratio."))
+    for name in names:
+        s = spans[name]
+        print("%-32s%-12d%-12.3f%-12.3f%-12.3f%-12.3f%-12.3f" %
+              (name, s['calls'], s['total'], s['min'], s['max'], s['ave'],
+               s['total'] / total if total > 0 else 0))
+
+    breakdown = dict((category, 0.0) for category in SPAN_CATEGORIES)
+    for s in spans.values():
+        if s['category'] in breakdown:
+            breakdown[s['category']] += s['total']
+    step_total = sum(breakdown.values())
+    if step_total > 0:
+        print("\nStep breakdown:")
+        for category in SPAN_CATEGORIES:
+            print("%-32s%-12.3f%.1f%%" % (category, breakdown[category],
+                                           breakdown[category] * 100.0 /
+                                           step_total))
+    if counters:
+        print("\nCounters:")
+        for name in sorted(counters):
+            print("%-32s%s" % (name, counters[name]))
+    if _num_dropped_events > 0:
+        print("\n%d spans are not recorded since max_events is reached." %
+              _num_dropped_events)
+
+
+def save_spans(profile_path):
+    """
+    Save the recorded spans into a profile file in the format of
+    `fluid.profiler`, spans of each thread are saved as a CPU block. It can
+    be merged with the profile of C++ by tools/timeline.py, e.g.
+    `--profile_path=trainer=/tmp/profile,python=/tmp/profile.py`, since both
+    of them use the wall clock.
+
+    Args:
+        profile_path (str): The path of profile file.
+    """
+    import paddle.fluid.proto.profiler.profiler_pb2 as profiler_pb2
+
+    profile = profiler_pb2.Profile()
+    threads = {}
+    with _lock:
+        events = list(_events)
+    for name, thread, start, end in events:
+        if thread not in threads:
+            threads[thread] = len(threads)
+        event = profile.events.add()
+        event.name = name
+        event.type = profiler_pb2.Event.CPU
+        event.start_ns = int(start * 1e9)
+        event.end_ns = int(end * 1e9)
+        event.device_id = threads[thread]
+        event.sub_device_id = 0
+    if events:
+        profile.start_ns = min([e.start_ns for e in profile.events])
+        profile.end_ns = max([e.end_ns for e in profile.events])
+    with open(profile_path, 'wb') as f:
+        f.write(profile.SerializeToString())
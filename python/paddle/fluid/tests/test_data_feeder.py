@@ -14,6 +14,7 @@
 
 from __future__ import print_function
 
+import numpy as np
 import paddle.fluid as fluid
 import unittest
 
@@ -76,6 +77,29 @@ class TestDataFeeder(unittest.TestCase):
                          [[2, 1], [3, 2, 4]])
         self.assertEqual(result['label'].recursive_sequence_lengths(), [])
 
+    def test_numpy_converter(self):
+        img = fluid.layers.data(name='image', shape=[1, 2, 2])
+        words = fluid.layers.data(
+            name='words', shape=[1], dtype='int64', lod_level=1)
+        feeder = fluid.DataFeeder([img, words], fluid.CPUPlace())
+
+        images = [np.arange(4) + i for i in range(3)]
+        sentences = [np.arange(n).reshape([n, 1]) for n in [3, 0, 2]]
+        result = feeder.feed(list(zip(images, sentences)))
+        # the same as feeding python lists
+        expected = feeder.feed([(image.tolist(), sentence.tolist())
+                                for image, sentence in zip(images, sentences)])
+
+        self.assertEqual(result['image'].shape(), [3, 1, 2, 2])
+        self.assertEqual(result['words'].shape(), [5, 1])
+        self.assertEqual(result['words'].recursive_sequence_lengths(),
+                         [[3, 0, 2]])
+        for name in ['image', 'words']:
+            self.assertEqual(result[name]._dtype(), expected[name]._dtype())
+            self.assertTrue(
+                np.array_equal(np.array(result[name]), np.array(expected[
+                    name])))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,80 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import time
+import unittest
+import numpy as np
+
+import paddle
+import paddle.fluid as fluid
+import paddle.fluid.dygraph as dg
+from paddle.fluid.framework import ComplexVariable
+
+# This is a benchmark of the complex ops in dygraph, it reports the time of
+# matmul with four ('4m') and three ('3m') real matrix multiplications, and
+# the time of elementwise_div compared with the previous decomposition into
+# a multiplication by the conjugate and by 1 / (c^2 + d^2).
+
+
+def div_by_conjugate(x, y):
+    c, d = y.real, y.imag
+    e = 1 / (fluid.layers.pow(c, 2.0) + fluid.layers.pow(d, 2.0))
+    out = paddle.complex.elementwise_mul(x, ComplexVariable(c, -d))
+    return paddle.complex.elementwise_mul(out, e)
+
+
+class BenchmarkComplexOps(unittest.TestCase):
+    def setUp(self):
+        self.iters = 20
+        self.place = fluid.CUDAPlace(0) if fluid.core.is_compiled_with_cuda(
+        ) else fluid.CPUPlace()
+
+    def random(self, shape):
+        real = np.random.random(shape).astype("float32")
+        imag = np.random.random(shape).astype("float32")
+        return real + 1j * imag
+
+    def timeit(self, name, func, *args):
+        with dg.guard(self.place):
+            args = [dg.to_variable(arg) for arg in args]
+            func(*args).real.numpy()
+            start = time.time()
+            for _ in range(self.iters):
+                out = func(*args)
+            # wait for the kernels to finish
+            out.real.numpy()
+        print("{}: {:.3f} ms".format(name, (time.time() - start) /
+                                      self.iters * 1e3))
+
+    def test_matmul(self):
+        for size in [64, 256, 1024]:
+            x = self.random([size, size])
+            y = self.random([size, size])
+            for method in ['4m', '3m']:
+                self.timeit(
+                    "matmul {0}x{0} {1}".format(size, method),
+                    lambda x, y: paddle.complex.matmul(x, y, method=method),
+                    x, y)
+
+    def test_elementwise_div(self):
+        x = self.random([256, 1024])
+        y = self.random([256, 1024])
+        self.timeit("elementwise_div by conjugate", div_by_conjugate, x, y)
+        self.timeit("elementwise_div", paddle.complex.elementwise_div, x, y)
+
+
+if __name__ == "__main__":
+    unittest.main()
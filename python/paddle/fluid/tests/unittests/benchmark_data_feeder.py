@@ -0,0 +1,62 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import time
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+
+# This is a benchmark of DataFeeder.feed, it reports the time of converting
+# a batch of dense and sparse-ID sequence samples, given as numpy arrays and
+# as python lists.
+
+
+class BenchmarkDataFeeder(unittest.TestCase):
+    def setUp(self):
+        self.iters = 100
+        self.batch_size = 256
+        main = fluid.Program()
+        with fluid.program_guard(main, fluid.Program()):
+            image = fluid.data(
+                name='image', shape=[None, 3, 32, 32], dtype='float32')
+            ids = fluid.data(
+                name='ids', shape=[None, 1], dtype='int64', lod_level=1)
+            label = fluid.data(name='label', shape=[None, 1], dtype='int64')
+        self.feeder = fluid.DataFeeder([image, ids, label],
+                                       fluid.CPUPlace(), main)
+        self.samples = [(np.random.random([3, 32, 32]).astype('float32'),
+                         np.random.randint(
+                             0, 10000, size=[np.random.randint(1, 100), 1]),
+                         np.array([i % 10])) for i in range(self.batch_size)]
+
+    def timeit(self, name, samples):
+        start = time.time()
+        for _ in range(self.iters):
+            self.feeder.feed(samples)
+        print("DataFeeder.feed of {}: {:.3f} ms/batch".format(name, (
+            time.time() - start) / self.iters * 1e3))
+
+    def test_numpy(self):
+        self.timeit("numpy arrays", self.samples)
+
+    def test_list(self):
+        self.timeit("python lists", [[slot.tolist() for slot in sample]
+                                     for sample in self.samples])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import time
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+
+# This is a benchmark of the overhead of Executor.run, it reports the QPS of
+# running a tiny program, which is dominated by feeding and fetching.
+
+
+class BenchmarkExecutorRun(unittest.TestCase):
+    def setUp(self):
+        self.iters = 10000
+        self.main = fluid.Program()
+        self.startup = fluid.Program()
+        with fluid.program_guard(self.main, self.startup):
+            x = fluid.data(name='x', shape=[None, 16], dtype='float32')
+            ids = fluid.data(name='ids', shape=[None, 1], dtype='int64')
+            emb = fluid.layers.embedding(ids, size=[100, 16])
+            self.out = fluid.layers.fc(x + emb, size=1)
+        self.feed = {
+            'x': np.random.random([1, 16]).astype('float32'),
+            'ids': np.ones([1, 1]).astype('int64')
+        }
+
+    def run_qps(self, **kwargs):
+        exe = fluid.Executor(fluid.CPUPlace(), **kwargs)
+        scope = fluid.Scope()
+        with fluid.scope_guard(scope):
+            exe.run(self.startup)
+            for _ in range(10):
+                exe.run(self.main,
+                        feed=self.feed,
+                        fetch_list=[self.out],
+                        use_program_cache=True)
+            start = time.time()
+            for _ in range(self.iters):
+                exe.run(self.main,
+                        feed=self.feed,
+                        fetch_list=[self.out],
+                        use_program_cache=True)
+            return self.iters / (time.time() - start)
+
+    def test_qps(self):
+        default_qps = self.run_qps()
+        reuse_qps = self.run_qps(reuse_feed_tensors=True)
+        print("Executor.run QPS: default {:.0f}, reuse_feed_tensors {:.0f}".
+              format(default_qps, reuse_qps))
+
+
+if __name__ == '__main__':
+    unittest.main()
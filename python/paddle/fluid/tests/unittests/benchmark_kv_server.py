@@ -0,0 +1,80 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import threading
+import time
+import unittest
+
+from paddle.fluid.incubate.fleet.utils.http_server import KVServer, KVClient
+
+# This is a benchmark of the rendezvous on KVServer, it reports the time of
+# num_clients clients starting at once, each of which puts its address and
+# gets the addresses of all the others, by polling each key or by waiting
+# for the scope to complete.
+
+
+class BenchmarkKVServer(unittest.TestCase):
+    def setUp(self):
+        self.num_clients = 200
+        self.poll_interval = 0.01
+        self.server = KVServer(0)
+        self.server.start()
+        self.endpoint = "127.0.0.1:%d" % self.server.http_server.server_port
+
+    def tearDown(self):
+        self.server.stop()
+
+    def poll(self, client, scope, rank):
+        for key in range(self.num_clients):
+            while client.get(scope, str(key)) is None:
+                time.sleep(self.poll_interval)
+
+    def wait(self, client, scope, rank):
+        kv = client.wait_scope(scope, self.num_clients)
+        assert len(kv) == self.num_clients
+
+    def timeit(self, name, scope, rendezvous):
+        start_event = threading.Event()
+
+        def run(rank):
+            client = KVClient(self.endpoint)
+            start_event.wait()
+            client.put(scope, str(rank), ("127.0.0.1:%d" % rank).encode())
+            rendezvous(client, scope, rank)
+            client.close()
+
+        threads = [
+            threading.Thread(
+                target=run, args=(rank, )) for rank in range(self.num_clients)
+        ]
+        for thread in threads:
+            thread.start()
+        start = time.time()
+        start_event.set()
+        for thread in threads:
+            thread.join()
+        print("rendezvous of {} clients by {}: {:.3f} s".format(
+            self.num_clients, name, time.time() - start))
+
+    def test_poll(self):
+        self.timeit("polling keys", "poll", self.poll)
+
+    def test_wait(self):
+        self.timeit("waiting scope", "wait", self.wait)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import time
+import unittest
+
+import paddle.fluid as fluid
+
+# This is a benchmark of program construction, it reports the time of
+# building, backward, clone, transpiling and op insertion of a program
+# with thousands of ops, which used to be quadratic in the number of ops.
+
+
+class BenchmarkProgramConstruction(unittest.TestCase):
+    def setUp(self):
+        self.num_layers = 500
+
+    def timeit(self, name, callback):
+        start = time.time()
+        ret = callback()
+        print("{}: {:.3f} sec".format(name, time.time() - start))
+        return ret
+
+    def build(self):
+        main = fluid.Program()
+        startup = fluid.Program()
+        with fluid.program_guard(main, startup):
+            hidden = fluid.data(name='x', shape=[None, 32], dtype='float32')
+            for _ in range(self.num_layers):
+                hidden = fluid.layers.fc(input=hidden, size=32, act='relu')
+            loss = fluid.layers.mean(hidden)
+        return main, startup, loss
+
+    def test_timeit(self):
+        main, startup, loss = self.timeit("build", self.build)
+        with fluid.program_guard(main, startup):
+            self.timeit("backward", lambda: fluid.backward.append_backward(loss))
+        print("number of ops: {}".format(len(main.global_block().ops)))
+
+        self.timeit("clone", lambda: main.clone())
+        self.timeit("clone for test", lambda: main.clone(for_test=True))
+
+        def insert_ops():
+            block = main.global_block()
+            x = block.var('x')
+            for i in range(len(block.ops) - 1, 0, -10):
+                block._insert_op(
+                    i, type='assign', inputs={'X': [x]}, outputs={'Out': [x]})
+
+        self.timeit("insert ops", insert_ops)
+
+        def transpile():
+            main, startup, loss = self.build()
+            with fluid.program_guard(main, startup):
+                fluid.optimizer.SGD(learning_rate=0.01).minimize(loss)
+            t = fluid.DistributeTranspiler()
+            t.transpile(
+                trainer_id=0,
+                program=main,
+                startup_program=startup,
+                pservers="127.0.0.1:6170,127.0.0.1:6171",
+                trainers=2)
+            t.get_trainer_program()
+
+        self.timeit("build, minimize and transpile", transpile)
+
+
+if __name__ == '__main__':
+    unittest.main()
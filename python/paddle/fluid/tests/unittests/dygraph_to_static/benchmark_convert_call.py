@@ -0,0 +1,108 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import time
+import unittest
+
+import numpy as np
+
+import paddle.fluid as fluid
+from paddle.fluid.dygraph import ProgramTranslator
+from paddle.fluid.dygraph import dygraph_to_static
+
+# This is a benchmark of tracing in dygraph-to-static, it reports the time
+# of tracing a function which calls helpers many times, and the part of it
+# spent in convert_call.
+
+program_translator = ProgramTranslator()
+
+
+def scale(x):
+    return fluid.layers.scale(x, scale=0.5)
+
+
+def shift(x):
+    return scale(x) + 1
+
+
+class Block(fluid.dygraph.Layer):
+    def __init__(self):
+        super(Block, self).__init__()
+        self.fc = fluid.dygraph.Linear(16, 16)
+
+    def forward(self, x):
+        return shift(self.fc(x))
+
+
+class Net(fluid.dygraph.Layer):
+    def __init__(self, num_blocks):
+        super(Net, self).__init__()
+        self.blocks = [Block() for _ in range(num_blocks)]
+        for i, block in enumerate(self.blocks):
+            self.add_sublayer('block_%d' % i, block)
+
+    def forward(self, x):
+        for block in self.blocks:
+            x = block(x)
+            x = shift(x)
+        return x
+
+
+class BenchmarkConvertCall(unittest.TestCase):
+    def setUp(self):
+        self.num_blocks = 100
+        self.iters = 10000
+        self.input = np.random.random([4, 16]).astype('float32')
+        program_translator.enable(True)
+
+    def test_convert_call(self):
+        block = Block()
+        for name, func in [("function", shift), ("method", block.forward),
+                           ("layer", block)]:
+            start = time.time()
+            for _ in range(self.iters):
+                dygraph_to_static.convert_call(func)
+            print("convert_call of {}: {:.2f} us/call".format(name, (
+                time.time() - start) / self.iters * 1e6))
+
+    def test_tracing(self):
+        convert_call = dygraph_to_static.convert_call
+        elapse = [0.0, 0]
+
+        def timed_convert_call(func):
+            start = time.time()
+            ret = convert_call(func)
+            elapse[0] += time.time() - start
+            elapse[1] += 1
+            return ret
+
+        # converted code calls fluid.dygraph.dygraph_to_static.convert_call
+        dygraph_to_static.convert_call = timed_convert_call
+        try:
+            with fluid.dygraph.guard():
+                net = Net(self.num_blocks)
+                start = time.time()
+                program_translator.get_program(net.forward, self.input)
+                total = time.time() - start
+        finally:
+            dygraph_to_static.convert_call = convert_call
+
+        print("tracing: {:.3f} sec, convert_call: {:.3f} sec in {} calls".
+              format(total, elapse[0], elapse[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,13 +14,18 @@
 
 from __future__ import print_function
 
+import functools
+import gc
 import unittest
+import weakref
 
 import numpy as np
 
 import paddle.fluid as fluid
 from paddle.fluid.dygraph import ProgramTranslator
 from paddle.fluid.dygraph import declarative
+from paddle.fluid.dygraph.dygraph_to_static import convert_call
+from paddle.fluid.dygraph.dygraph_to_static import convert_call_func
 
 program_translator = ProgramTranslator()
 
@@ -163,5 +168,47 @@ class TestRecursiveCall2(unittest.TestCase):
                                                             static_res))
 
 
+def add_one(x):
+    return x + 1
+
+
+class AddOne(object):
+    def forward(self, x):
+        return x + 1
+
+
+class TestConvertCallCache(unittest.TestCase):
+    def setUp(self):
+        program_translator.enable(True)
+
+    def test_function(self):
+        converted = convert_call(add_one)
+        self.assertIsNot(converted, add_one)
+        self.assertIs(convert_call(add_one), converted)
+
+    def test_method(self):
+        converted = convert_call(AddOne().forward)
+        converted2 = convert_call(AddOne().forward)
+        self.assertIsInstance(converted, functools.partial)
+        self.assertIs(converted.func, converted2.func)
+
+    def test_not_pinned(self):
+        cache = convert_call_func._convert_call_cache
+        num_cached = len(cache)
+
+        def local_func(x):
+            return x + 1
+
+        # local functions are not converted, the decision is cached but the
+        # function is not kept alive by the cache
+        self.assertIs(convert_call(local_func), local_func)
+        self.assertEqual(len(cache), num_cached + 1)
+        func_ref = weakref.ref(local_func)
+        del local_func
+        gc.collect()
+        self.assertIsNone(func_ref())
+        self.assertEqual(len(cache), num_cached)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -100,5 +100,31 @@ class TestAllocContinuousSpace2(TestAllocContinuousSpace):
             place=core.CUDAPlace(0), no_check_set=["FusedOutput"], atol=1e-5)
 
 
+@unittest.skipIf(not core.is_compiled_with_cuda(),
+                 "core is not compiled with CUDA")
+class TestAllocContinuousSpace3(TestAllocContinuousSpace):
+    def init_attr(self):
+        return {
+            "copy_data": True,
+            "set_constant": True,
+            "constant": 0.5,
+            "dtype": self.fluid_dtype
+        }
+
+    def init_output(self, input_list, set_constant, constant):
+        # the data is copied and only the padding is set with the constant
+        aligned_numel = alignment // np.dtype(self.dtype).itemsize
+        fused = []
+        for _, input in input_list:
+            fused.append(input.flatten())
+            fused.append(
+                np.ones(-input.size % aligned_numel).astype(self.dtype) *
+                constant)
+        return input_list, np.concatenate(fused)
+
+    def test_check_output(self):
+        self.check_output_with_place(place=core.CUDAPlace(0), atol=1e-5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -65,6 +65,15 @@ class TestComplexElementwiseLayers(unittest.TestCase):
         y = rand([5]).astype(self._dtype) + 1j * rand([5]).astype(self._dtype)
         self.compare(x, y)
 
+    def test_div_large_y(self):
+        # c^2 + d^2 overflows float32 while x / y does not
+        x = rand([3, 4]).astype("float32") + 1j * rand([3, 4]).astype("float32")
+        y = (rand([3, 4]) + 1).astype("float32") * 1e20
+        for place in self._places:
+            self.assertTrue(
+                np.allclose(
+                    self.calc(x, y, "div", place) * 1e20, x / y * 1e20))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -25,15 +25,29 @@ class TestComplexMatMulLayer(unittest.TestCase):
         if fluid.core.is_compiled_with_cuda():
             self._places.append(fluid.CUDAPlace(0))
 
-    def compare(self, x, y):
+    def compare(self, x, y, method='4m'):
         for place in self._places:
             with dg.guard(place):
                 x_var = dg.to_variable(x)
                 y_var = dg.to_variable(y)
-                result = paddle.complex.matmul(x_var, y_var)
+                result = paddle.complex.matmul(x_var, y_var, method=method)
         np_result = np.matmul(x, y)
         self.assertTrue(np.allclose(result.numpy(), np_result))
 
+    def max_error(self, x, y, method, transpose_y=False):
+        with dg.guard(self._places[0]):
+            result = paddle.complex.matmul(
+                dg.to_variable(x),
+                dg.to_variable(y),
+                transpose_y=transpose_y,
+                alpha=2.0,
+                method=method).numpy()
+        y = y.astype("complex128")
+        if transpose_y:
+            y = np.swapaxes(y, -1, -2)
+        np_result = 2.0 * np.matmul(x.astype("complex128"), y)
+        return np.abs(result - np_result).max()
+
     def test_complex_xy(self):
         x = np.random.random(
             (2, 3, 4, 5)).astype("float32") + 1J * np.random.random(
@@ -42,6 +56,32 @@ class TestComplexMatMulLayer(unittest.TestCase):
             (2, 3, 5, 4)).astype("float32") + 1J * np.random.random(
                 (2, 3, 5, 4)).astype("float32")
         self.compare(x, y)
+        self.compare(x, y, method='3m')
+
+    def test_3m_error(self):
+        x = np.random.uniform(-1, 1, (4, 64, 128)).astype(
+            "float32") + 1J * np.random.uniform(-1, 1, (4, 64, 128)).astype(
+                "float32")
+        y = np.random.uniform(-1, 1, (4, 32, 128)).astype(
+            "float32") + 1J * np.random.uniform(-1, 1, (4, 32, 128)).astype(
+                "float32")
+        # the rounding error of a dot product of length k is bounded by
+        # k * eps * sum(|x| * |y|), where |x| * |y| <= alpha * 4 here for
+        # both 4m and the (a + b)(c + d) of 3m
+        bound = 128 * np.finfo("float32").eps * 2.0 * 4 * 128
+        error_4m = self.max_error(x, y, '4m', transpose_y=True)
+        error_3m = self.max_error(x, y, '3m', transpose_y=True)
+        self.assertLess(error_4m, bound)
+        self.assertLess(error_3m, bound)
+        # in practice the error of 3m is within a small factor of 4m
+        self.assertLess(error_3m, 10 * error_4m + 1e-6)
+
+    def test_invalid_method(self):
+        x = np.random.random((4, 5)) + 1J * np.random.random((4, 5))
+        with dg.guard(self._places[0]):
+            x_var = dg.to_variable(x)
+            self.assertRaises(
+                ValueError, paddle.complex.matmul, x_var, x_var, method='2m')
 
     def test_complex_x(self):
         x = np.random.random(
@@ -56,6 +96,7 @@ class TestComplexMatMulLayer(unittest.TestCase):
             (2, 3, 5, 4)).astype("float32") + 1J * np.random.random(
                 (2, 3, 5, 4)).astype("float32")
         self.compare(x, y)
+        self.compare(x, y, method='3m')
 
 
 if __name__ == '__main__':
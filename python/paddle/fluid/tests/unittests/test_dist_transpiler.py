@@ -243,6 +243,57 @@ class TestNoSliceVar(TranspilerTest):
         self.assertEqual(fc_w_var.shape, (1000, 1000))
 
 
+class TestSizeBalancedDispatch(TranspilerTest):
+    def transpiler_test_impl(self):
+        config = fluid.DistributeTranspilerConfig()
+        config.slice_var_up = False
+        config.split_method = fluid.transpiler.SizeBalanced
+
+        pserver, _ = self.get_pserver(self.pserver1_ep, config)
+        pserver2, _ = self.get_pserver(self.pserver2_ep, config)
+
+        # fc_w and fc_b are placed on different pservers
+        report = self.transpiler.placement_report
+        self.assertEqual(list(report.keys()), self.pserver_eps.split(","))
+        self.assertEqual(
+            sorted(placement["bytes"] for placement in report.values()),
+            [1000 * 4, 1000 * 1000 * 4])
+        self.assertEqual(
+            sorted(
+                sum([placement["vars"] for placement in report.values()], [])),
+            ["fc_b", "fc_w"])
+
+    def test_dispatch(self):
+        block = fluid.Program().global_block()
+        dense = [
+            block.create_var(
+                name="dense_%d" % i, shape=[size, 10], dtype='float32')
+            for i, size in enumerate([10, 20, 30])
+        ]
+        sparse = block.create_var(
+            name="sparse",
+            shape=[1000, 10],
+            dtype='float32',
+            type=fluid.core.VarDesc.VarType.SELECTED_ROWS)
+
+        # the sparse var of the largest load is placed first although it is
+        # the last one
+        eps = ["127.0.0.1:6174", "127.0.0.1:6175"]
+        dispatcher = fluid.transpiler.SizeBalanced(
+            eps, sparse_update_ratio=0.06)
+        eplist = dispatcher.dispatch(dense + [sparse])
+        self.assertEqual(eplist, [eps[1], eps[1], eps[1], eps[0]])
+        report = dispatcher.report()
+        self.assertEqual(report[eps[0]]["bytes"], 10000 * 4)
+        self.assertEqual(report[eps[1]]["bytes"], 600 * 4)
+        self.assertAlmostEqual(report[eps[0]]["load"], 600 * 4)
+        self.assertAlmostEqual(report[eps[1]]["load"], 600 * 4)
+
+        # the same placement is given after reset
+        dispatcher.reset()
+        self.assertEqual(dispatcher.dispatch(dense + [sparse]), eplist)
+
+
 class TestLRDecay(TranspilerTest):
     def net_conf(self):
         x = fluid.layers.data(name='x', shape=[1000], dtype='float32')
@@ -698,6 +749,37 @@ class TestDistLookupTable(TestDistLookupTableBase):
                          startup_ops)
 
 
+class TestSizeBalancedSparseDispatch(TestDistLookupTableBase):
+    def net_conf(self):
+        self.network_with_table(is_sparse=True, is_distributed=False)
+
+    def transpiler_test_impl(self):
+        class SparseSizeBalanced(fluid.transpiler.SizeBalanced):
+            sparse_update_ratio = 0.1
+
+        config = fluid.DistributeTranspilerConfig()
+        config.split_method = SparseSizeBalanced
+        trainer, _ = self.get_trainer(config)
+
+        # each grad block is sent to the endpoint of its param block
+        send_eps = {}
+        for op in trainer.global_block().ops:
+            if op.type == "send":
+                for name, ep in zip(op.input("X"), op.attr("epmap")):
+                    send_eps[name] = ep
+        num_sparse_grads = 0
+        mapping = self.transpiler.param_grad_ep_mapping
+        for ep, placement in six.iteritems(mapping):
+            for param, grad in zip(placement["params"], placement["grads"]):
+                self.assertEqual(
+                    param.name.split(".block")[0] + "@GRAD",
+                    grad.name.split(".block")[0])
+                self.assertEqual(send_eps[grad.name], ep)
+                if grad.type == fluid.core.VarDesc.VarType.SELECTED_ROWS:
+                    num_sparse_grads += 1
+        self.assertGreater(num_sparse_grads, 0)
+
+
 class TestAsyncLocalLookupTable(TestDistLookupTableBase):
     def net_conf(self):
         self.network_with_table(is_sparse=True, is_distributed=False)
@@ -0,0 +1,105 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+import paddle.fluid.core as core
+
+
+class TestExecutorReuseFeedTensors(unittest.TestCase):
+    def setUp(self):
+        self.main = fluid.Program()
+        self.startup = fluid.Program()
+        with fluid.program_guard(self.main, self.startup):
+            x = fluid.data(name='x', shape=[None, 4], dtype='float32')
+            label = fluid.data(name='label', shape=[None, 1], dtype='int64')
+            y = fluid.layers.fc(x, size=2)
+            self.fetch_list = [y, fluid.layers.cast(label, 'float32')]
+        self.place = fluid.CPUPlace()
+        self.scope = fluid.Scope()
+
+    def run_program(self, exe, x, label):
+        with fluid.scope_guard(self.scope):
+            return exe.run(self.main,
+                           feed={'x': x,
+                                 'label': label},
+                           fetch_list=self.fetch_list,
+                           use_program_cache=True)
+
+    def test_reuse(self):
+        exe = fluid.Executor(self.place)
+        reuse_exe = fluid.Executor(self.place, reuse_feed_tensors=True)
+        with fluid.scope_guard(self.scope):
+            exe.run(self.startup)
+
+        for batch_size in [2, 2, 3, 1]:
+            x = np.random.random([batch_size, 4]).astype('float32')
+            label = np.arange(batch_size).reshape([batch_size, 1])
+            expected = self.run_program(exe, x, label)
+            results = self.run_program(reuse_exe, x, label)
+            for expected_out, out in zip(expected, results):
+                self.assertTrue(np.allclose(expected_out, out))
+
+        feed_cache, = reuse_exe.feed_caches.values()
+        self.assertEqual(sorted(feed_cache.tensors.keys()), ['label', 'x'])
+        self.assertEqual(feed_cache.signatures['x'], ((1, 4), np.float32))
+
+        # data of a new signature is validated
+        with self.assertRaises(ValueError):
+            self.run_program(reuse_exe,
+                             np.ones([1, 5]).astype('float32'),
+                             np.ones([1, 1]).astype('int64'))
+        with self.assertRaises(ValueError):
+            self.run_program(reuse_exe,
+                             np.ones([1, 4]).astype('float64'),
+                             np.ones([1, 1]).astype('int64'))
+
+    def test_feed_tensor_and_list(self):
+        exe = fluid.Executor(self.place, reuse_feed_tensors=True)
+        with fluid.scope_guard(self.scope):
+            exe.run(self.startup)
+        x = np.random.random([2, 4]).astype('float32')
+        x_tensor = core.LoDTensor()
+        x_tensor.set(x, self.place)
+        out1 = self.run_program(exe, x_tensor, [[1], [2]])
+        out2 = self.run_program(exe, x.tolist(), [[1], [2]])
+        self.assertTrue(np.allclose(out1[0], out2[0]))
+        self.assertTrue(np.allclose(out2[1], [[1], [2]]))
+
+    def test_fetch_feed_target(self):
+        exe = fluid.Executor(self.place, reuse_feed_tensors=True)
+        x1 = np.random.random([2, 4]).astype('float32')
+        x2 = np.random.random([2, 4]).astype('float32')
+        outs = []
+        with fluid.scope_guard(self.scope):
+            exe.run(self.startup)
+            for x in [x1, x2]:
+                out, = exe.run(self.main,
+                               feed={'x': x,
+                                     'label': np.ones([2, 1]).astype('int64')},
+                               fetch_list=['x'],
+                               return_numpy=False,
+                               use_program_cache=True)
+                outs.append(out)
+        # the fetched tensor is not overwritten by the next run
+        self.assertTrue(np.allclose(np.array(outs[0]), x1))
+        self.assertTrue(np.allclose(np.array(outs[1]), x2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -148,6 +148,7 @@ class TestCloudRoleMaker(unittest.TestCase):
                     self.delete_kv_lock = threading.Lock()
                     self.delete_kv = {}
                     self.kv_lock = threading.Lock()
+                    self.kv_cond = threading.Condition(self.kv_lock)
                     self.kv = {}
         except:
             print("warning: no KVHTTPServer, skip test_pslib_4")
@@ -0,0 +1,158 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import math
+import multiprocessing
+import sys
+import unittest
+
+import numpy as np
+
+import paddle.fluid as fluid
+from paddle.fluid.incubate.fleet.utils.fleet_util import FleetUtil, _auc_from_buckets, _bucket_error
+
+NUM_BUCKET = 1000
+METRIC_NAMES = ["sqrerr", "abserr", "prob", "q", "pos", "total"]
+
+
+class LocalRoleMaker(object):
+    """
+    A stand-in of the role maker of fleet for processes on one machine,
+    all reduce is done by a shared array.
+    """
+
+    def __init__(self, barrier, lock, buffer, num_all_reduce):
+        self._barrier = barrier
+        self._lock = lock
+        self._buffer = buffer
+        self._num_all_reduce = num_all_reduce
+
+    def _barrier_worker(self):
+        self._barrier.wait()
+
+    def _all_reduce(self, input, output, mode="sum"):
+        size = len(input)
+        if self._barrier.wait() == 0:
+            self._buffer[:size] = [0.0] * size
+            self._num_all_reduce.value += 1
+        self._barrier.wait()
+        with self._lock:
+            self._buffer[:size] = list(
+                np.array(self._buffer[:size]) + np.array(input))
+        self._barrier.wait()
+        output[:] = self._buffer[:size]
+        self._barrier.wait()
+
+
+def gen_stats(rank):
+    rng = np.random.RandomState(rank)
+    stats = {
+        "stat_pos": rng.poisson(rng.rand(1, NUM_BUCKET) * 50).astype('int64'),
+        "stat_neg": rng.poisson(rng.rand(1, NUM_BUCKET) * 500).astype('int64')
+    }
+    for name in METRIC_NAMES:
+        stats[name] = (rng.rand(1) * 100 + 100).astype('float32')
+    return stats
+
+
+def run_worker(rank, role_maker, results):
+    scope = fluid.Scope()
+    for name, value in gen_stats(rank).items():
+        scope.var(name).get_tensor().set(value, fluid.CPUPlace())
+    fleet_util = FleetUtil(role_maker=role_maker)
+    results.put((rank, fleet_util.get_global_auc(scope, "stat_pos",
+                                                 "stat_neg"),
+                 fleet_util.get_global_metrics(scope, "stat_pos", "stat_neg",
+                                               *METRIC_NAMES)))
+
+
+class TestFleetUtilMetrics(unittest.TestCase):
+    def test_bucket_metrics(self):
+        pos = np.array([0, 2, 5, 40, 3000, 8000, 0, 7, 1])
+        neg = np.array([900, 0, 30, 70, 4000, 1000, 0, 3, 0])
+        # roc by trapezoids from the highest bucket
+        area = 0.0
+        pos_sum = neg_sum = 0.0
+        for i in reversed(range(len(pos))):
+            area += neg[i] * (2 * pos_sum + pos[i]) / 2.0
+            pos_sum += pos[i]
+            neg_sum += neg[i]
+        self.assertAlmostEqual(
+            _auc_from_buckets(pos, neg), area / (pos_sum * neg_sum))
+        self.assertEqual(_auc_from_buckets(pos, np.zeros_like(neg)), 0.5)
+
+        # buckets are too far apart to be merged, only bucket 4 and 5 have
+        # enough instances
+        show = pos + neg
+        ctr = np.arange(len(pos)) / float(len(pos))
+        error_sum = error_count = 0.0
+        for start, end in [(4, 4), (5, 5)]:
+            impression = show[start:end + 1].sum()
+            adjust_ctr = (ctr * show)[start:end + 1].sum() / impression
+            actual_ctr = pos[start:end + 1].sum() / float(impression)
+            error_sum += abs(actual_ctr / adjust_ctr - 1) * impression
+            error_count += impression
+        self.assertAlmostEqual(
+            _bucket_error(pos, neg), error_sum / error_count)
+        self.assertEqual(_bucket_error(pos * 0, neg * 0), 0.0)
+
+    @unittest.skipIf(sys.version_info < (3, ),
+                     "multiprocessing.Barrier requires python3")
+    def test_global_metrics(self):
+        num_workers = 3
+        barrier = multiprocessing.Barrier(num_workers)
+        lock = multiprocessing.Lock()
+        buffer = multiprocessing.Array('d', 4 * NUM_BUCKET, lock=False)
+        num_all_reduce = multiprocessing.Value('i', 0)
+        results = multiprocessing.Queue()
+        role_maker = LocalRoleMaker(barrier, lock, buffer, num_all_reduce)
+        workers = [
+            multiprocessing.Process(
+                target=run_worker, args=(rank, role_maker, results))
+            for rank in range(num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        results = [results.get(timeout=120) for _ in workers]
+        for worker in workers:
+            worker.join()
+        # one all reduce for auc and one for all the metrics
+        self.assertEqual(num_all_reduce.value, 2)
+
+        stats = [gen_stats(rank) for rank in range(num_workers)]
+        global_stats = dict(
+            (name, np.sum(
+                [s[name].astype('float64') for s in stats], axis=0))
+            for name in stats[0])
+        auc = _auc_from_buckets(global_stats["stat_pos"][0],
+                                global_stats["stat_neg"][0])
+        bucket_error = _bucket_error(global_stats["stat_pos"][0],
+                                     global_stats["stat_neg"][0])
+        sqrerr, abserr, prob, q, pos, total = [
+            global_stats[name][0] for name in METRIC_NAMES
+        ]
+        expected = [
+            auc, bucket_error, abserr / total, math.sqrt(sqrerr / total),
+            pos / total, prob / total, pos / prob, q / total, int(total)
+        ]
+        for rank, global_auc, metrics in results:
+            self.assertAlmostEqual(global_auc, auc)
+            for metric, expected_metric in zip(metrics, expected):
+                self.assertAlmostEqual(metric, expected_metric)
+
+
+if __name__ == '__main__':
+    unittest.main()
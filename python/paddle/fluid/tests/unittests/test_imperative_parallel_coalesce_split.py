@@ -12,70 +12,223 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import contextlib
 import unittest
 import numpy as np
-from collections import OrderedDict
 
-import paddle
 import paddle.fluid as fluid
 from paddle.fluid import core
+from paddle.fluid.dygraph.nn import Embedding, Linear
 from paddle.fluid.dygraph.parallel import DataParallel
 from paddle.fluid.dygraph.base import to_variable
 
 
 class MyLayer(fluid.Layer):
-    def __init__(self, name_scope):
-        super(MyLayer, self).__init__(name_scope)
+    def __init__(self, is_sparse=False):
+        super(MyLayer, self).__init__()
+        self._embedding = Embedding(size=[20, 8], is_sparse=is_sparse)
+        self._linear1 = Linear(8, 32)
+        self._linear2 = Linear(32, 4)
 
-    def forward(self, inputs):
-        x = fluid.layers.relu(inputs)
-        x = fluid.layers.elementwise_mul(x, x)
-        x = fluid.layers.reduce_sum(x)
-        return [x]
+    def forward(self, ids, use_linear2=True):
+        x = fluid.layers.reshape(self._embedding(ids), [-1, 8])
+        x = fluid.layers.relu(self._linear1(x))
+        if not use_linear2:
+            return fluid.layers.reduce_sum(x)
+        return fluid.layers.reduce_sum(self._linear2(x))
 
 
-class TestImperativeParallelCoalesceSplit(unittest.TestCase):
-    def test_coalesce_split(self):
-        with fluid.dygraph.guard():
-            test_layer = MyLayer("test_layer")
+class FakeAllReduce(object):
+    """
+    Sum the var of two trainers having the same gradients.
+    """
+
+    def __init__(self):
+        self.vars = []
+
+    def __call__(self, var):
+        self.vars.append(var)
+        if not var._is_sparse():
+            tensor = var.value().get_tensor()
+            tensor.set(np.array(tensor) * 2, fluid.CPUPlace())
+
+
+class TestImperativeParallelGradBuckets(unittest.TestCase):
+    def run_step(self, is_sparse=False, comm_buffer_size=128):
+        strategy = core.ParallelStrategy()
+        strategy.nranks = 2
+        allreduce = FakeAllReduce()
+        layer = DataParallel(
+            MyLayer(is_sparse),
+            strategy,
+            comm_buffer_size,
+            allreduce,
+            overlap_allreduce=False)
+        ids = to_variable(np.random.randint(0, 20, [6, 1]).astype('int64'))
+        layer(ids).backward()
+        params = layer.parameters()
+        grads = [
+            None if param._grad_ivar()._is_sparse() else param.gradient()
+            for param in params
+        ]
+        layer.apply_collective_grads()
+        for param, grad in zip(params, grads):
+            if grad is not None:
+                self.assertTrue(np.allclose(param.gradient(), grad * 2))
+        return layer, allreduce
+
+    def test_dense_buckets(self):
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            layer, allreduce = self.run_step()
+            stats = layer.grad_bucket_stats()
+            self.assertEqual(len(stats), 1)
+            self.assertEqual(stats[0]['num_params'], 5)
+            self.assertEqual(stats[0]['allreduce_calls'], 1)
+            self.assertEqual(len(allreduce.vars), 1)
+
+            # the stats have the size of the fused buffer, in which the
+            # gradients are padded with zeros
+            bucket = layer._grad_buckets[0]
+            buffer = bucket.buffer
+            buffer_numel = int(np.prod(buffer.shape))
+            self.assertGreaterEqual(buffer_numel,
+                                    20 * 8 + 8 * 32 + 32 + 32 * 4 + 4)
+            self.assertEqual(stats[0]['numel'], buffer_numel)
+            self.assertEqual(stats[0]['bytes'], buffer_numel * 4)
+            grads_sum = sum(
+                [np.abs(param.gradient()).sum() for param in layer.parameters()])
+            self.assertTrue(
+                np.allclose(
+                    np.abs(np.array(buffer.value().get_tensor())).sum(),
+                    grads_sum))
+
+            # the gradients are views of the fused buffer, which is kept
+            # across steps
+            for step in range(2):
+                if step > 0:
+                    layer.clear_gradients()
+                    ids = to_variable(
+                        np.random.randint(0, 20, [6, 1]).astype('int64'))
+                    layer(ids).backward()
+                    layer.apply_collective_grads()
+                self.assertIs(layer._grad_buckets[0], bucket)
+                self.assertIs(bucket.buffer, buffer)
+                tensor = buffer.value().get_tensor()
+                tensor.set(
+                    np.zeros(tensor.shape(), 'float32'), fluid.CPUPlace())
+                for param in layer.parameters():
+                    self.assertEqual(np.abs(param.gradient()).sum(), 0)
+            self.assertEqual(layer.grad_bucket_stats()[0]['allreduce_calls'],
+                             2)
+
+    def test_bucket_size(self):
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            # 1 KB buckets, the gradients of the last layers come first
+            layer, allreduce = self.run_step(comm_buffer_size=1.0 / 1024)
+            stats = layer.grad_bucket_stats()
+            self.assertEqual([s['num_params'] for s in stats], [3, 1, 1])
+            self.assertGreaterEqual(stats[-1]['numel'], 20 * 8)
+            self.assertEqual(len(allreduce.vars), 3)
+
+    def test_sparse_bucket(self):
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            layer, allreduce = self.run_step(is_sparse=True)
+            stats = layer.grad_bucket_stats()
+            self.assertEqual([s['is_sparse'] for s in stats], [False, True])
+            self.assertEqual([s['num_params'] for s in stats], [4, 1])
+            self.assertTrue(allreduce.vars[-1]._is_sparse())
+
+    def test_overlap_allreduce(self):
+        with fluid.dygraph.guard(fluid.CPUPlace()):
             strategy = core.ParallelStrategy()
-            test_layer = DataParallel(test_layer, strategy)
-
-            # test variables prepare
-            vars = []
-            vars.append(to_variable(np.random.random([2, 3]).astype("float32")))
-            vars.append(to_variable(np.random.random([4, 9]).astype("float32")))
-            vars.append(
-                to_variable(np.random.random([10, 1]).astype("float32")))
-            var_groups = OrderedDict()
-            var_groups.setdefault(0, vars)
-
-            # record shapes
-            orig_var_shapes = []
-            for var in vars:
-                orig_var_shapes.append(var.shape)
-
-            # execute interface
-            coalesced_vars = test_layer._coalesce_tensors(var_groups)
-            test_layer._split_tensors(coalesced_vars)
-
-            # compare
-            for orig_var_shape, var in zip(orig_var_shapes, vars):
-                self.assertEqual(orig_var_shape, var.shape)
-
-    def test_reshape_inplace(self):
-        with fluid.dygraph.guard():
-            test_layer = MyLayer("test_layer")
+            strategy.nranks = 2
+            model = MyLayer()
+            ids = to_variable(np.random.randint(0, 20, [6, 1]).astype('int64'))
+            model(ids).backward()
+            expected = [param.gradient() * 2 for param in model.parameters()]
+
+            for overlap in [False, True]:
+                allreduce = FakeAllReduce()
+                # 3 buckets of 1 KB
+                layer = DataParallel(model, strategy, 1.0 / 1024, allreduce,
+                                     overlap)
+                for step in range(3):
+                    layer.clear_gradients()
+                    start = len(allreduce.vars)
+                    layer(ids).backward()
+                    in_backward = allreduce.vars[start:]
+                    layer.apply_collective_grads()
+                    step_vars = allreduce.vars[start:]
+
+                    # the buckets are all-reduced in backward from the
+                    # second step, in the same order
+                    buffers = [b.buffer for b in layer._grad_buckets]
+                    self.assertEqual(len(step_vars), 3)
+                    for var, buffer in zip(step_vars, buffers):
+                        self.assertIs(var, buffer)
+                    self.assertEqual(
+                        len(in_backward), 3 if overlap and step > 0 else 0)
+                    for param, grad in zip(layer.parameters(), expected):
+                        self.assertTrue(np.allclose(param.gradient(), grad))
+
+    def test_overlap_unused_param(self):
+        with fluid.dygraph.guard(fluid.CPUPlace()):
             strategy = core.ParallelStrategy()
-            test_layer = DataParallel(test_layer, strategy)
-
-            ori_shape = [2, 25]
-            new_shape = [5, 10]
-            x_data = np.random.random(ori_shape).astype("float32")
-            x = to_variable(x_data)
-            test_layer._reshape_inplace(x, new_shape)
-            self.assertEqual(x.shape, new_shape)
+            strategy.nranks = 2
+            allreduce = FakeAllReduce()
+            layer = DataParallel(
+                MyLayer(),
+                strategy,
+                1.0 / 1024,
+                allreduce,
+                overlap_allreduce=True)
+            ids = to_variable(np.random.randint(0, 20, [6, 1]).astype('int64'))
+            layer(ids).backward()
+            layer.apply_collective_grads()
+
+            # the first bucket of the unused last layer is not ready in
+            # backward, and the later buckets wait for it to keep the order
+            layer.clear_gradients()
+            layer(ids, use_linear2=False).backward()
+            self.assertEqual(len(allreduce.vars), 3)
+            layer.apply_collective_grads()
+            self.assertEqual(len(allreduce.vars), 6)
+            self.assertEqual(
+                [s['allreduce_calls'] for s in layer.grad_bucket_stats()],
+                [2, 2, 2])
+
+    def test_overlap_backward_without_apply(self):
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            strategy = core.ParallelStrategy()
+            strategy.nranks = 2
+            model = MyLayer()
+            ids = to_variable(np.random.randint(0, 20, [6, 1]).astype('int64'))
+            model(ids).backward()
+            expected = [param.gradient() * 2 for param in model.parameters()]
+
+            allreduce = FakeAllReduce()
+            layer = DataParallel(
+                model, strategy, 1.0 / 1024, allreduce, overlap_allreduce=True)
+            layer.clear_gradients()
+            layer(ids).backward()
+            layer.apply_collective_grads()
+            self.assertEqual(len(allreduce.vars), 3)
+
+            # the step skipping apply_collective_grads does not stop the
+            # next step from all-reducing the buckets in backward
+            for step in range(2):
+                layer.clear_gradients()
+                layer(ids).backward()
+                self.assertEqual(len(allreduce.vars), 6 + 3 * step)
+            layer.apply_collective_grads()
+            self.assertEqual(len(allreduce.vars), 9)
+            for param, grad in zip(layer.parameters(), expected):
+                self.assertTrue(np.allclose(param.gradient(), grad))
+
+            # the backward not started by the forward of DataParallel does
+            # not all-reduce the gradients
+            layer.clear_gradients()
+            model(ids).backward()
+            self.assertEqual(len(allreduce.vars), 9)
 
 
 if __name__ == '__main__':
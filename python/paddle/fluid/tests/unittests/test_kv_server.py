@@ -0,0 +1,77 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import threading
+import time
+import unittest
+
+from paddle.fluid.incubate.fleet.utils.http_server import KVServer, KVClient
+
+
+class TestKVServer(unittest.TestCase):
+    def setUp(self):
+        self.server = KVServer(0)
+        self.server.start()
+        self.endpoint = "127.0.0.1:%d" % self.server.http_server.server_port
+        self.client = KVClient(self.endpoint)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_get_put(self):
+        self.assertIsNone(self.client.get("scope", "a"))
+        self.client.put("scope", "a", b"1")
+        self.assertEqual(self.client.get("scope", "a"), b"1")
+        self.client.put_multi("scope", {"b": b"\x00\xff", "c": b""})
+        self.assertEqual(
+            self.client.get_multi("scope", ["a", "b", "c", "d"]),
+            {"a": b"1",
+             "b": b"\x00\xff",
+             "c": b""})
+        self.assertEqual(len(self.client.wait_scope("scope", 3)), 3)
+        self.assertEqual(len(self.client.wait_scope("scope", 4, 0.1)), 3)
+
+    def test_delete(self):
+        status, _ = self.client._request('DELETE', '/scope/a?timeout=1')
+        self.assertEqual(status, 200)
+        self.assertEqual(self.server.http_server.delete_kv, {"scope": ["a"]})
+        status, _ = self.client._request('DELETE', '/scope')
+        self.assertEqual(status, 400)
+
+    def test_wait(self):
+        def put():
+            client = KVClient(self.endpoint)
+            for rank in range(4):
+                time.sleep(0.05)
+                client.put("scope", str(rank), str(rank).encode())
+            client.close()
+
+        thread = threading.Thread(target=put)
+        thread.start()
+        # waiting requests do not block the others
+        self.assertEqual(self.client.get("scope", "0", timeout=10), b"0")
+        self.assertEqual(
+            self.client.get_multi(
+                "scope", ["1", "2"], timeout=10), {"1": b"1",
+                                                   "2": b"2"})
+        kv = self.client.wait_scope("scope", 4, timeout=10)
+        self.assertEqual(sorted(kv.keys()), ["0", "1", "2", "3"])
+        thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
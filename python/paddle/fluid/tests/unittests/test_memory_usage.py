@@ -55,6 +55,25 @@ class TestMemoryUsage(unittest.TestCase):
         with self.program_scope_guard():
             train_simulator(test_batch_size=100000)
 
+    def test_peak_memory_usage(self):
+        with self.program_scope_guard():
+            train_simulator()
+            program = fluid.default_main_program()
+            ops = program.global_block().ops
+            usage = fluid.contrib.peak_memory_usage(program, batch_size=10)
+            self.assertEqual(len(usage.timeline), len(ops))
+            self.assertIs(usage.peak_op, ops[usage.peak_step])
+            self.assertEqual(usage.peak_bytes, usage.persistable_bytes +
+                             max(usage.timeline))
+            # fc weight and bias, and the learning rate
+            self.assertEqual(usage.persistable_bytes, (13 + 1 + 1) * 4)
+            self.assertEqual(usage.timeline[usage.peak_step],
+                             sum([size for _, size in usage.peak_vars]))
+
+            larger = fluid.contrib.peak_memory_usage(program, batch_size=1000)
+            self.assertEqual(larger.persistable_bytes, usage.persistable_bytes)
+            self.assertGreater(larger.peak_bytes, usage.peak_bytes)
+
     @contextlib.contextmanager
     def program_scope_guard(self):
         prog = fluid.Program()
@@ -0,0 +1,76 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+from paddle.fluid.contrib.model_stat import profile_program, profile_layer
+
+
+class TestProfileProgram(unittest.TestCase):
+    def test_profile(self):
+        main = fluid.Program()
+        startup = fluid.Program()
+        with fluid.program_guard(main, startup):
+            x = fluid.data(name='x', shape=[None, 3, 8, 8], dtype='float32')
+            with fluid.name_scope('backbone'):
+                y = fluid.layers.conv2d(
+                    x, num_filters=4, filter_size=3, bias_attr=False)
+            with fluid.name_scope('head'):
+                y = fluid.layers.fc(y, size=10)
+                loss = fluid.layers.mean(y)
+            fluid.backward.append_backward(loss)
+
+        profile = profile_program(main, batch_size=2)
+        ops = dict((op['type'], op) for op in profile.ops)
+        # 2 * batch * c_out * h_out * w_out * (c_in * k_h * k_w)
+        self.assertEqual(ops['conv2d']['flops'], 2 * 2 * 4 * 6 * 6 * 27)
+        self.assertEqual(ops['conv2d']['params'], 4 * 27)
+        self.assertEqual(ops['conv2d']['scope'], 'backbone')
+        self.assertEqual(ops['mul']['flops'], 2 * 2 * 144 * 10)
+        self.assertEqual(ops['mul_grad']['flops'], 2 * ops['mul']['flops'])
+        self.assertEqual(ops['mean']['bytes'], (2 * 10 + 1) * 4)
+
+        # parameters are counted once
+        self.assertEqual(profile.total['params'], 4 * 27 + 144 * 10 + 10)
+        self.assertEqual(profile.scopes['head']['params'], 144 * 10 + 10)
+        self.assertEqual(profile.total['flops'],
+                         sum([op['flops'] for op in profile.ops]))
+        profile.summary(max_depth=1)
+
+
+class TestProfileLayer(unittest.TestCase):
+    def test_profile(self):
+        with fluid.dygraph.guard():
+            model = fluid.dygraph.Sequential(
+                fluid.dygraph.Linear(16, 32),
+                fluid.dygraph.BatchNorm(32), fluid.dygraph.Linear(32, 10))
+            x = fluid.dygraph.to_variable(
+                np.random.random([8, 16]).astype('float32'))
+            profile = profile_layer(model, x)
+
+        self.assertEqual([op['type'] for op in profile.ops],
+                         ['Linear', 'BatchNorm', 'Linear'])
+        self.assertEqual(profile.ops[0]['flops'], 2 * 8 * 16 * 32 + 8 * 32)
+        self.assertEqual(profile.ops[0]['bytes'], (8 * 16 + 8 * 32) * 4)
+        self.assertEqual(profile.ops[2]['params'], 32 * 10 + 10)
+        self.assertEqual(profile.unsupported_types(), [])
+        profile.summary()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@ import unittest
 from paddle.fluid.framework import Program, default_main_program, program_guard, grad_var_name
 import paddle.fluid.layers as layers
 import paddle.fluid as fluid
+import paddle.compat as cpt
 
 main_program = default_main_program()
 
@@ -162,6 +163,121 @@ class TestProgram(unittest.TestCase):
         self.assertRaises(TypeError, program._copy_dist_param_info_from,
                           "program")
 
+    def test_sync_with_cpp(self):
+        program = Program()
+        block = program.global_block()
+        with program_guard(program):
+            x = fluid.data(name='x', shape=[None, 13], dtype='float32')
+            hidden = fluid.layers.fc(input=x, size=10)
+            layers.mean(hidden)
+        ops = block.ops
+        types = [op.type for op in ops]
+
+        # change the desc in the middle and at both ends from c++ end
+        op_desc = block.desc._insert_op(1)
+        op_desc.set_type('scale')
+        block.desc._prepend_op().set_type('assign')
+        block.desc.append_op().set_type('assign')
+        block.desc._remove_op(3, 4)
+        block.desc.var(b'var_from_cpp')
+        block.desc._remove_var(cpt.to_bytes(hidden.name))
+        old_op = ops[0]
+        block._sync_with_cpp()
+
+        self.assertIs(block.ops, ops)
+        self.assertEqual([op.type for op in block.ops],
+                         ['assign', types[0], 'scale'] + types[2:] +
+                         ['assign'])
+        self.assertIs(block.ops[1], old_op)
+        for op, op_desc in zip(block.ops, block.desc.all_ops()):
+            self.assertIs(op.desc, op_desc)
+        self.assertTrue(block.has_var('var_from_cpp'))
+        self.assertFalse(block.has_var(hidden.name))
+
+        # edits from python end keep the block synced
+        block._remove_op(0)
+        block._insert_op(0, type='assign', inputs={'X': [x]},
+                         outputs={'Out': [x]})
+        self.assertEqual(block._ops_version, block.desc._ops_version())
+        self.assertEqual(block._vars_version, block.desc._vars_version())
+
+        # ops and vars removed only from the python end are synced back
+        first_op = block.ops[0]
+        del block.ops[0]
+        block.vars.pop(x.name)
+        block._sync_with_cpp()
+        self.assertIs(block.ops[0].desc, first_op.desc)
+        self.assertEqual(len(block.ops), block.desc.op_size())
+        self.assertTrue(block.has_var(x.name))
+
+    def test_var_index(self):
+        program = Program()
+        block = program.global_block()
+        with program_guard(program):
+            x = fluid.data(name='x', shape=[None, 13], dtype='float32')
+            y = layers.scale(x, scale=2.0)
+            z = layers.scale(y, scale=2.0)
+            out = layers.elementwise_add(y, z)
+        scale_y, scale_z, add = block.ops
+
+        self.assertEqual(block._producer_ops(y.name), [scale_y])
+        self.assertEqual(block._consumer_ops(y.name), [scale_z, add])
+        self.assertEqual(block._op_index(add), 2)
+
+        # the index follows edits of ops
+        assign = block._insert_op(
+            1, type='assign', inputs={'X': [x]}, outputs={'Out': [y]})
+        self.assertEqual(block._producer_ops(y.name), [scale_y, assign])
+        self.assertEqual(block._op_index(add), 3)
+        block._rename_var(y.name, 'renamed_y')
+        self.assertEqual(block._consumer_ops('renamed_y'), [scale_z, add])
+        self.assertEqual(block._consumer_ops(y.name), [])
+        add._rename_input(z.name, x.name)
+        self.assertEqual(block._consumer_ops(z.name), [])
+        self.assertEqual(block._consumer_ops(x.name), [scale_y, assign, add])
+
+        block._remove_ops([scale_y, add])
+        self.assertEqual(block.ops, [assign, scale_z])
+        self.assertEqual(block._consumer_ops(x.name), [assign])
+        self.assertEqual(block._producer_ops(out.name), [])
+        self.assertRaises(ValueError, block._op_index, add)
+
+        # the index is rebuilt after the inputs are changed through desc
+        scale_z.desc._rename_input('renamed_y', x.name)
+        self.assertEqual(block._consumer_ops('renamed_y'), [])
+        self.assertEqual(block._consumer_ops(x.name), [assign, scale_z])
+        scale_z.desc.set_input('X', ['renamed_y'])
+        self.assertEqual(block._consumer_ops(x.name), [assign])
+
+        # the index is rebuilt after edits from c++ end
+        block.desc._remove_op(0, 1)
+        self.assertEqual(block._producer_ops('renamed_y'), [])
+
+    def test_insert_ops(self):
+        program = Program()
+        block = program.global_block()
+        with program_guard(program):
+            x = fluid.data(name='x', shape=[None, 13], dtype='float32')
+            y = layers.scale(x, scale=2.0)
+            z = layers.scale(y, scale=2.0)
+        scale_y, scale_z = block.ops
+
+        assign_x, assign_y, assign_z = block._insert_ops([
+            (0, dict(
+                type='assign', inputs={'X': [x]}, outputs={'Out': [y]})),
+            (2, dict(
+                type='assign', inputs={'X': [y]}, outputs={'Out': [z]})),
+            (0, dict(
+                type='assign', inputs={'X': [x]}, outputs={'Out': [z]})),
+        ])
+        self.assertEqual(block.ops,
+                         [assign_x, assign_z, scale_y, scale_z, assign_y])
+        self.assertEqual([op.type for op in block.ops],
+                         [block.desc.op(i).type() for i in range(5)])
+        self.assertEqual(scale_z.input('X'), [y.name])
+        self.assertEqual(block._consumer_ops(y.name), [scale_z, assign_y])
+        self.assertEqual(block._op_index(assign_y), 4)
+
 
 if __name__ == '__main__':
     unittest.main()
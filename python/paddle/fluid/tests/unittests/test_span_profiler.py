@@ -0,0 +1,86 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import paddle.fluid as fluid
+import paddle.fluid.profiler as profiler
+import paddle.fluid.proto.profiler.profiler_pb2 as profiler_pb2
+
+
+class TestSpanProfiler(unittest.TestCase):
+    def setUp(self):
+        profiler.reset_spans()
+
+    def tearDown(self):
+        profiler.disable_spans()
+        profiler.reset_spans()
+
+    def test_disabled(self):
+        with profiler.span('disabled'):
+            pass
+        profiler.add_counter('disabled')
+        self.assertEqual(profiler.span_stats(), ({}, {}))
+
+    def test_spans(self):
+        profiler.enable_spans(record_events=True, max_events=3)
+        for _ in range(4):
+            with profiler.span('step', 'compute'):
+                pass
+        profiler.add_counter('samples', 32)
+        profiler.add_counter('samples', 32)
+        spans, counters = profiler.span_stats()
+        self.assertEqual(spans['step']['calls'], 4)
+        self.assertEqual(spans['step']['category'], 'compute')
+        self.assertEqual(counters, {'samples': 64})
+        profiler.print_span_summary('total')
+
+        profile_path = os.path.join(tempfile.mkdtemp(), 'profile')
+        profiler.save_spans(profile_path)
+        profile = profiler_pb2.Profile()
+        with open(profile_path, 'rb') as f:
+            profile.ParseFromString(f.read())
+        self.assertEqual([e.name for e in profile.events], ['step'] * 3)
+        os.remove(profile_path)
+
+    def test_executor(self):
+        main = fluid.Program()
+        startup = fluid.Program()
+        with fluid.program_guard(main, startup):
+            x = fluid.data(name='x', shape=[None, 4], dtype='float32')
+            y = fluid.layers.fc(x, size=2)
+        exe = fluid.Executor(fluid.CPUPlace())
+        exe.run(startup)
+
+        profiler.enable_spans()
+        for _ in range(3):
+            exe.run(main,
+                    feed={'x': np.ones([2, 4], dtype='float32')},
+                    fetch_list=[y],
+                    use_program_cache=True)
+        spans, counters = profiler.span_stats()
+        for name in ['executor.feed', 'executor.run', 'executor.fetch']:
+            self.assertEqual(spans[name]['calls'], 3)
+        self.assertEqual(counters['executor.program_cache_miss'], 1)
+        self.assertEqual(counters['executor.program_cache_hit'], 2)
+        profiler.print_span_summary()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import paddle.fluid.proto.profiler.profiler_pb2 as profiler_pb2
+from paddle.utils.timeline import ProfileReader, write_timeline
+from paddle.utils.timeline_analysis import analyze_profile, print_analysis
+
+MS = 1000000
+
+
+class TestTimeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        # cpu: mul [0, 4ms) with mul/compute inside, relu [6ms, 7ms)
+        # gpu: mul kernel [1ms, 5ms)
+        self.profile0 = self.save_profile('profile0', 100 * MS, [
+            ('mul', profiler_pb2.Event.CPU, 0, 4, 0, ''),
+            ('mul/compute', profiler_pb2.Event.CPU, 1, 3, 0, ''),
+            ('gemm_kernel', profiler_pb2.Event.GPUKernel, 1, 5, 0, 'mul'),
+            ('relu', profiler_pb2.Event.CPU, 6, 7, 0, ''),
+        ])
+        self.profile1 = self.save_profile('profile1', 500 * MS, [
+            ('relu', profiler_pb2.Event.CPU, 2, 3, 0, ''),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def save_profile(self, name, start_ns, events):
+        profile = profiler_pb2.Profile()
+        profile.start_ns = start_ns
+        profile.end_ns = start_ns + 10 * MS
+        for event_name, type, start, end, device_id, detail_info in events:
+            event = profile.events.add()
+            event.name = event_name
+            event.type = type
+            event.start_ns = start_ns + start * MS
+            event.end_ns = start_ns + end * MS
+            event.device_id = device_id
+            event.detail_info = detail_info
+        mem_event = profile.mem_events.add()
+        mem_event.start_ns = start_ns
+        mem_event.end_ns = start_ns + 2 * MS
+        mem_event.bytes = 1024
+        mem_event.place = profiler_pb2.MemEvent.CPUPlace
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(profile.SerializeToString())
+        return path
+
+    def load_trace(self, profile_path, **kwargs):
+        timeline_path = os.path.join(self.temp_dir, 'timeline')
+        num_events = write_timeline(profile_path, timeline_path, **kwargs)
+        with open(timeline_path) as f:
+            trace = json.load(f)['traceEvents']
+        self.assertEqual(len(trace), num_events)
+        return trace
+
+    def test_reader(self):
+        with ProfileReader(self.profile0) as reader:
+            self.assertEqual(reader.start_ns, 100 * MS)
+            self.assertEqual(reader.end_ns, 110 * MS)
+            self.assertEqual([e.name for e in reader.events()],
+                             ['mul', 'mul/compute', 'gemm_kernel', 'relu'])
+            self.assertEqual([e.bytes for e in reader.mem_events()], [1024])
+
+    def test_write_timeline(self):
+        trace = self.load_trace(self.profile0)
+        regions = [e for e in trace if e['ph'] == 'X']
+        self.assertEqual(len(regions), 4)
+        processes = dict((e['pid'], e['args']['name']) for e in trace
+                         if e['ph'] == 'M')
+        self.assertEqual(
+            sorted(processes.values()), [
+                'memory usage on trainer:cpu:0', 'trainer:cpu:block:0',
+                'trainer:gpu:0'
+            ])
+        counters = [e['args']['0'] for e in trace if e['ph'] == 'C']
+        self.assertEqual(counters, [1024, 0])
+
+    def test_filter(self):
+        trace = self.load_trace(self.profile0, start_ms=4.5, end_ms=10)
+        self.assertEqual([e['name'] for e in trace if e['ph'] == 'X'],
+                         ['gemm_kernel', 'relu'])
+        trace = self.load_trace(self.profile0, op_types=['mul'])
+        self.assertEqual([e['name'] for e in trace if e['ph'] == 'X'],
+                         ['mul', 'mul/compute', 'gemm_kernel'])
+
+    def test_merge_ranks(self):
+        profile_path = 'trainer0=%s,trainer1=%s' % (self.profile0,
+                                                    self.profile1)
+        trace = self.load_trace(profile_path, align_ranks=True)
+        processes = dict((e['args']['name'], e['pid']) for e in trace
+                         if e['ph'] == 'M')
+        relu = dict((e['pid'], e['ts']) for e in trace
+                    if e['ph'] == 'X' and e['name'] == 'relu')
+        self.assertEqual(relu[processes['trainer0:cpu:block:0']], 6 * MS)
+        self.assertEqual(relu[processes['trainer1:cpu:block:0']], 2 * MS)
+
+    def test_analyze(self):
+        result = analyze_profile({'trainer': self.profile0}, min_gap_us=0)
+        result = result['trainer']
+        print_analysis({'trainer': result})
+        self.assertEqual(result['span_ns'], 7 * MS)
+        # critical path: relu, idle [5ms, 6ms), gemm_kernel [3ms, 5ms),
+        # mul/compute [1ms, 3ms) nested in mul, mul [0ms, 1ms)
+        self.assertEqual(result['critical_idle_ns'], 1 * MS)
+        self.assertEqual(result['critical_path_ns'], 6 * MS)
+        self.assertEqual(result['ops']['gemm_kernel']['critical_ns'], 2 * MS)
+        self.assertEqual(result['ops']['mul']['critical_ns'], 1 * MS)
+        self.assertEqual(result['ops']['mul/compute']['critical_ns'], 2 * MS)
+        self.assertEqual(result['ops']['relu']['critical_ns'], 1 * MS)
+
+        cpu = result['devices']['trainer:cpu:block:0']
+        self.assertEqual(cpu['busy_ns'], 5 * MS)
+        self.assertEqual(cpu['idle_ns'], 2 * MS)
+        self.assertEqual(cpu['gaps'], [(104 * MS, 106 * MS)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,31 +21,25 @@ import paddle
 
 
 def delete_ops(block, ops):
+    valid_ops = []
     for op in ops:
         try:
-            idx = list(block.ops).index(op)
-            block._remove_op(idx)
+            block._op_index(op)
+            valid_ops.append(op)
         except Exception as e:
             print(e)
+    block._remove_ops(valid_ops)
 
 
 def find_op_by_input_arg(block, arg_name):
-    for index, op in enumerate(block.ops):
-        if arg_name in op.input_arg_names:
-            return index
+    ops = block._consumer_ops(arg_name)
+    if ops:
+        return block._op_index(ops[0])
     return -1
 
 
 def find_op_by_output_arg(block, arg_name, reverse=False):
-    if reverse:
-        pos = len(block.ops) - 1
-        while pos >= 0:
-            op = block.ops[pos]
-            if arg_name in op.output_arg_names:
-                return pos
-            pos -= 1
-    else:
-        for index, op in enumerate(block.ops):
-            if arg_name in op.output_arg_names:
-                return index
+    ops = block._producer_ops(arg_name)
+    if ops:
+        return block._op_index(ops[-1] if reverse else ops[0])
     return -1
@@ -153,9 +153,11 @@ class DistributeTranspilerConfig(object):
     .. py:attribute:: split_method (PSDispatcher)
 
           Methods of dispatching parameters for server,
-          :ref:`api_fluid_transpiler_RoundRobin` or
-          :ref:`api_fluid_transpiler_HashName` can be used and default is RoundRobin.
-          Try to choose the best method to balance loads for parameter servers.
+          :ref:`api_fluid_transpiler_RoundRobin`,
+          :ref:`api_fluid_transpiler_HashName` or
+          :ref:`api_fluid_transpiler_SizeBalanced` can be used and default is RoundRobin.
+          Try to choose the best method to balance loads for parameter servers,
+          SizeBalanced balances the bytes held by each parameter server.
 
     .. py:attribute:: min_block_size (int)
 
@@ -339,7 +341,7 @@ class DistributeTranspiler(object):
         if self.config.print_log:
             PRINT_LOG = True
         assert (self.config.min_block_size >= 8192)
-        assert (self.config.split_method.__bases__[0] == PSDispatcher)
+        assert (issubclass(self.config.split_method, PSDispatcher))
         self.counter_var = None
 
     def _set_server_config(self, server_config=None):
@@ -695,8 +697,16 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
 
         self.grad_name_to_send_dummy_out = dict()
 
+        # dispatch all the gradients at once, so that the dispatcher knows
+        # every block when placing one, e.g. SizeBalanced
+        all_eplist = ps_dispatcher.dispatch([
+            var for _, splited_vars in grad_var_mapping_items
+            for var in splited_vars
+        ])
+        offset = 0
         for grad_varname, splited_vars in grad_var_mapping_items:
-            eplist = ps_dispatcher.dispatch(splited_vars)
+            eplist = all_eplist[offset:offset + len(splited_vars)]
+            offset += len(splited_vars)
 
             if not self.config.slice_var_up:
                 assert (len(splited_vars) == 1)
@@ -840,6 +850,11 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
             recv_vars.append(self.grad_param_mapping[var])
         ps_dispatcher.reset()
         eplist = ps_dispatcher.dispatch(recv_vars)
+        self.placement_report = ps_dispatcher.report()
+        if self.placement_report:
+            for ep, placement in six.iteritems(self.placement_report):
+                log("placement on", ep, "vars:", len(placement["vars"]),
+                    "bytes:", placement["bytes"], "load:", placement["load"])
 
         for i, ep in enumerate(eplist):
             self.param_grad_ep_mapping[ep]["params"].append(recv_vars[i])
@@ -963,10 +978,8 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
         # delete table init op
         for table_name in sparse_table_names:
             table_var = self.startup_program.global_block().vars[table_name]
-            table_param_init_op = []
-            for op in self.startup_program.global_block().ops:
-                if table_name in op.output_arg_names:
-                    table_param_init_op.append(op)
+            table_param_init_op = self.startup_program.global_block(
+            )._producer_ops(table_name)
             init_op_num = len(table_param_init_op)
             if init_op_num != 1:
                 raise ValueError("table init op num should be 1, now is " + str(
@@ -999,11 +1012,8 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
         if is_startup:
             init_ops = []
             for var in need_delete_optimize_vars:
-                param_init_op = []
-                for op in self.startup_program.global_block().ops:
-                    if var in op.output_arg_names:
-                        param_init_op.append(op)
-                init_ops.extend(param_init_op)
+                init_ops.extend(self.startup_program.global_block()
+                                ._producer_ops(var))
             delete_ops(self.startup_program.global_block(), init_ops)
 
             for var in need_delete_optimize_vars:
@@ -1770,34 +1780,29 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
         self.all_out_emb_vars = []
         lookup_table_op_index = -1
 
-        continue_search_lookup_table_op = True
-        while continue_search_lookup_table_op:
-            continue_search_lookup_table_op = False
-            all_ops = program.global_block().ops
-            for op in all_ops:
-                if op.type == LOOKUP_TABLE_TYPE and self.table_name == op.input(
-                        "W")[0]:
-                    if not op.attr('is_distributed'):
-                        raise RuntimeError(
-                            "lookup_table_op that lookup an distributed embedding table"
-                            "should set is_distributed to true")
-                    continue_search_lookup_table_op = True
-
-                    lookup_table_op_index = lookup_table_op_index if lookup_table_op_index != -1 else list(
-                        all_ops).index(op)
-                    ids_name = op.input("Ids")
-                    out_name = op.output("Out")
-
-                    ids_var = program.global_block().vars[ids_name[0]]
-                    self.all_in_ids_vars.append(ids_var)
-
-                    out_var = program.global_block().vars[out_name[0]]
-                    self.all_out_emb_vars.append(out_var)
-
-                    # delete lookup_table_op
-                    delete_ops(program.global_block(), [op])
-                    # break for loop
-                    break
+        lookup_table_ops = []
+        for op in program.global_block()._consumer_ops(self.table_name):
+            if op.type == LOOKUP_TABLE_TYPE and self.table_name == op.input(
+                    "W")[0]:
+                if not op.attr('is_distributed'):
+                    raise RuntimeError(
+                        "lookup_table_op that lookup an distributed embedding table"
+                        "should set is_distributed to true")
+                if lookup_table_op_index == -1:
+                    lookup_table_op_index = program.global_block()._op_index(
+                        op)
+                ids_name = op.input("Ids")
+                out_name = op.output("Out")
+
+                ids_var = program.global_block().vars[ids_name[0]]
+                self.all_in_ids_vars.append(ids_var)
+
+                out_var = program.global_block().vars[out_name[0]]
+                self.all_out_emb_vars.append(out_var)
+                lookup_table_ops.append(op)
+
+        # delete lookup_table_op
+        delete_ops(program.global_block(), lookup_table_ops)
 
         for index in range(len(self.pserver_endpoints)):
             in_var = program.global_block().create_var(
@@ -1849,11 +1854,10 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
         # 2. add split_ids_op and send_op to send gradient to pservers
 
         # there should only be one table_name
-        all_ops = program.global_block().ops
         table_grad_name = grad_var_name(self.table_name)
-        for op in all_ops:
+        for op in program.global_block()._producer_ops(table_grad_name):
             if table_grad_name in op.output_arg_names:
-                op_index = list(all_ops).index(op)
+                op_index = program.global_block()._op_index(op)
                 # insert split_ids_op
                 program.global_block()._insert_op(
                     index=op_index + 1,
@@ -2575,16 +2579,14 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
                             persistable=counter_var.persistable)
                         for id_ in range(self.trainer_num)
                     ]
-                    for i, op in enumerate(self.startup_program.global_block()
-                                           .ops):
+                    for op in self.startup_program.global_block(
+                    )._producer_ops(counter_var.name):
                         if op.type == 'fill_constant':
                             for key in op.output_names:
                                 if len(op.output(key)) == 1 and op.output(key)[
                                         0] == counter_var.name:
-                                    self.startup_program.global_block().ops[
-                                        i]._set_attr(
-                                            'value',
-                                            float(0.0 - self.trainer_num))
+                                    op._set_attr('value',
+                                                 float(0.0 - self.trainer_num))
                     for var in all_trainer_counter_inputs:
                         if var.name == "%s.trainer_%d" % (counter_var.name,
                                                           self.trainer_id):
@@ -2647,8 +2649,8 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
         # optimize
         op_maker = core.op_proto_and_checker_maker
         optimize_role = core.op_proto_and_checker_maker.OpRole.Optimize
-        if op_maker.kOpRoleAttrName() in op.attr_names and \
-                int(op.all_attrs()[op_maker.kOpRoleAttrName()]) == int(optimize_role):
+        if op.has_attr(op_maker.kOpRoleAttrName()) and \
+                int(op.attr(op_maker.kOpRoleAttrName())) == int(optimize_role):
             return True
         return False
 
@@ -2669,8 +2671,7 @@ WIKI: https://github.com/PaddlePaddle/Fleet/blob/develop/markdown_doc/transpiler
             if self._is_opt_role_op(op):
                 # Todo(chengmo): Whether clip related op belongs to Optimize guard should be discussed
                 # delete clip op from opt_ops when run in Parameter Server mode
-                if OP_NAME_SCOPE in op.all_attrs(
-                ) and CLIP_OP_NAME_SCOPE in op.attr(
+                if op.has_attr(OP_NAME_SCOPE) and CLIP_OP_NAME_SCOPE in op.attr(
                         OP_NAME_SCOPE
                 ) and self.config.mode != "nccl2" and self.config.mode != "collective":
                     op._set_attr(
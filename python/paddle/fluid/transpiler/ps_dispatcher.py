@@ -14,6 +14,11 @@
 
 from __future__ import print_function
 
+import collections
+from functools import reduce
+
+from .. import core
+
 
 class PSDispatcher(object):
     """
@@ -45,10 +50,20 @@ class PSDispatcher(object):
         """
         AssertionError("Interface has not been implemented.")
 
+    def report(self):
+        """
+        Get the placement report of vars dispatched since last reset.
+
+        Returns:
+            an OrderedDict of pserver endpoint -> placement totals, or None
+            if the dispatcher does not support it.
+        """
+        return None
+
 
 class HashName(PSDispatcher):
     """
-	:api_attr: Static Graph
+	:api_attr: Static Graph
 
     Hash variable names to several endpoints using python
     "hash()" function.
@@ -90,7 +105,7 @@ class HashName(PSDispatcher):
 
 class RoundRobin(PSDispatcher):
     """
-	:api_attr: Static Graph
+	:api_attr: Static Graph
 
     Distribute variables to several endpoints using
     RondRobin<https://en.wikipedia.org/wiki/Round-robin_scheduling> method.
@@ -127,3 +142,138 @@ class RoundRobin(PSDispatcher):
             if self._step >= len(self._eps):
                 self._step = 0
         return eplist
+
+
+class SizeBalanced(PSDispatcher):
+    """
+	:api_attr: Static Graph
+
+    Distribute variables to several endpoints by bin-packing on their sizes,
+    so that every parameter server holds and serves about the same number of
+    bytes. The variables of a :code:`dispatch` call are placed in descending
+    order of their loads, each to the endpoint with least load so far, i.e.
+    the longest-processing-time-first (LPT) rule, so that a big variable at
+    the end of the list does not unbalance the endpoints. The endpoints are
+    returned in the order of the given variables.
+
+    The load of a variable is its byte size. For a parameter with sparse
+    (SelectedRows) gradient only a part of its rows are updated in each
+    step, so the load of the parameter and its gradient is scaled by the
+    expected fraction of updated rows, which is
+    :code:`update_ratios[name]` if given, else :code:`sparse_update_ratio`.
+    Both can be overridden by class attributes of a subclass to use with
+    :code:`DistributeTranspilerConfig.split_method`. A gradient is weighted
+    the same as its parameter, so that they are placed on the same endpoint.
+
+    The placement only depends on the loads and the order of the variables,
+    so the parameters dispatched after :code:`reset` get the same endpoints
+    as their gradients dispatched in the same order. Dispatch all the
+    variables in one call, since each call is packed on its own.
+
+    Args:
+        pserver_endpoints (list): list of endpoint(ip:port).
+        sparse_update_ratio (float|None): expected fraction of rows updated
+            per step of sparse variables. Default None, which means the class
+            attribute, 1.0 for this class.
+        update_ratios (dict|None): parameter name -> expected fraction of
+            rows updated per step, the gradient and the split blocks of a
+            parameter also match by the name of the parameter. Default None,
+            which means the class attribute, an empty dict for this class.
+
+    Examples:
+        .. code-block:: python
+
+        import paddle.fluid as fluid
+        from paddle.fluid.transpiler.ps_dispatcher import SizeBalanced
+
+        config = fluid.DistributeTranspilerConfig()
+        config.split_method = SizeBalanced
+
+    """
+
+    sparse_update_ratio = 1.0
+    update_ratios = {}
+
+    def __init__(self,
+                 pserver_endpoints,
+                 sparse_update_ratio=None,
+                 update_ratios=None):
+        super(SizeBalanced, self).__init__(pserver_endpoints)
+        if sparse_update_ratio is not None:
+            self.sparse_update_ratio = sparse_update_ratio
+        if update_ratios is not None:
+            self.update_ratios = update_ratios
+        self.reset()
+
+    def reset(self):
+        """
+        reset the loads of endpoints and the placement report.
+        """
+        super(SizeBalanced, self).reset()
+        self._report = collections.OrderedDict()
+        for ep in self._eps:
+            self._report[ep] = {"vars": [], "bytes": 0, "load": 0.0}
+
+    @staticmethod
+    def _size_of(var):
+        numel = reduce(lambda x, y: x * y, [abs(d) for d in var.shape], 1)
+        return numel * core.size_of_dtype(var.dtype)
+
+    def _update_ratio(self, var):
+        # the ratio is decided by the parameter owning the var, so that a
+        # gradient and its parameter get the same ratio. The name of a split
+        # block is "{origin}.block{id}", and the name of a gradient is
+        # "{param}@GRAD".
+        origin_name = var.name.split(".block")[0]
+        block_suffix = var.name[len(origin_name):]
+        param_name = origin_name.split(core.grad_var_suffix())[0]
+        for name in [param_name + block_suffix, param_name]:
+            if name in self.update_ratios:
+                return self.update_ratios[name]
+        if self._has_sparse_grad(var, param_name):
+            return self.sparse_update_ratio
+        return 1.0
+
+    @staticmethod
+    def _has_sparse_grad(var, param_name):
+        if var.type == core.VarDesc.VarType.SELECTED_ROWS:
+            return True
+        if var.block is None:
+            return False
+        grad = var.block.program.global_block().vars.get(
+            param_name + core.grad_var_suffix())
+        return grad is not None and \
+            grad.type == core.VarDesc.VarType.SELECTED_ROWS
+
+    def dispatch(self, varlist):
+        """
+        use LPT bin-packing to dispatch variables with each parameter server.
+        Args:
+            varlist (list): a list of Variables
+
+        """
+        sizes = [self._size_of(var) for var in varlist]
+        loads = [
+            size * self._update_ratio(var) for var, size in zip(varlist, sizes)
+        ]
+        eplist = [None] * len(varlist)
+        # the sort is stable and the first endpoint wins a tie, which keeps
+        # it deterministic
+        for i in sorted(range(len(varlist)), key=lambda i: -loads[i]):
+            ep = min(self._eps, key=lambda ep: self._report[ep]["load"])
+            placement = self._report[ep]
+            placement["vars"].append(varlist[i].name)
+            placement["bytes"] += sizes[i]
+            placement["load"] += loads[i]
+            eplist[i] = ep
+        return eplist
+
+    def report(self):
+        """
+        Get the placement report of vars dispatched since last reset.
+
+        Returns:
+            an OrderedDict of pserver endpoint -> dict of "vars" (the names),
+            "bytes" (total byte size) and "load" (total weighted size).
+        """
+        return self._report
@@ -19,7 +19,13 @@ from ....fluid import layers
 __all__ = ['matmul', ]
 
 
-def matmul(x, y, transpose_x=False, transpose_y=False, alpha=1.0, name=None):
+def matmul(x,
+           y,
+           transpose_x=False,
+           transpose_y=False,
+           alpha=1.0,
+           name=None,
+           method='4m'):
     """
     Applies matrix multiplication to two complex number tensors. See the 
     detailed description in :ref:`api_fluid_layers_matmul`.
@@ -36,10 +42,20 @@ def matmul(x, y, transpose_x=False, transpose_y=False, alpha=1.0, name=None):
         alpha (float): The scale of output. Default 1.0.
         name(str|None): A name for this layer(optional). If set None, the layer
             will be named automatically.
+        method(str): How to compute the product of two ComplexVariables, '4m'
+            uses four real matrix multiplications, and '3m' uses three real
+            matrix multiplications and a few additions, which is faster for
+            large matrices but the imaginary part is less accurate when the
+            real and imaginary parts differ a lot in magnitude. It only
+            matters when both :math:`x` and :math:`y` are ComplexVariables.
+            Default '4m'.
    
     Returns:
         ComplexVariable: The product result, with the same data type as inputs.
 
+    Raises:
+        ValueError: If :attr:`method` is not '4m' or '3m'.
+
     Examples:
         .. code-block:: python
 
@@ -58,10 +74,20 @@ def matmul(x, y, transpose_x=False, transpose_y=False, alpha=1.0, name=None):
     # x = a + bi, y = c + di
     # mm(x, y) = mm(a, c) - mm(b, d) + (mm(a, d) + mm(b, c))i
     complex_variable_exists([x, y], "matmul")
+    if method not in ['4m', '3m']:
+        raise ValueError(
+            "The method of matmul should be '4m' or '3m', but received %s." %
+            method)
     a, b = (x.real, x.imag) if is_complex(x) else (x, None)
     c, d = (y.real, y.imag) if is_complex(y) else (y, None)
     ac = layers.matmul(a, c, transpose_x, transpose_y, alpha, name)
-    if is_real(b) and is_real(d):
+    if is_real(b) and is_real(d) and method == '3m':
+        # mm(a, d) + mm(b, c) = mm(a + b, c + d) - mm(a, c) - mm(b, d)
+        bd = layers.matmul(b, d, transpose_x, transpose_y, alpha, name)
+        real = ac - bd
+        imag = layers.matmul(a + b, c + d, transpose_x, transpose_y, alpha,
+                             name) - ac - bd
+    elif is_real(b) and is_real(d):
         bd = layers.matmul(b, d, transpose_x, transpose_y, alpha, name)
         real = ac - bd
         imag = layers.matmul(a, d, transpose_x, transpose_y, alpha, name) + \
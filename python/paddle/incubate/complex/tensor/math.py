@@ -223,17 +223,31 @@ def elementwise_div(x, y, axis=-1, name=None):
                 #  [0.43396226+0.01886792j 0.5       +0.j        ]]
     """
     complex_variable_exists([x, y], "elementwise_div")
-    # (a + bi)/(c + di) = (a + bi)(c - di)/(c^2 + d^2)
+    # (a + bi)/(c + di) = ((ac + bd) + (bc - ad)i)/(c^2 + d^2)
+    (a, b) = (x.real, x.imag) if is_complex(x) else (x, None)
     (c, d) = (y.real, y.imag) if is_complex(y) else (y, None)
-    y_conj = ComplexVariable(c, -d) if is_real(d) else c
-    e = 1 / (layers.pow(c, 2.0) + layers.pow(d, 2.0)
-             ) if is_real(d) else 1 / layers.pow(c, 2.0)
-    return elementwise_mul(
-        elementwise_mul(
-            x, y_conj, axis=axis, name=name),
-        e,
-        axis=axis,
-        name=name)
+    if is_real(d):
+        den = layers.elementwise_mul(c, c) + layers.elementwise_mul(d, d)
+    if is_real(b) and is_real(d):
+        real = layers.elementwise_mul(
+            a, c, axis=axis) + layers.elementwise_mul(
+                b, d, axis=axis)
+        imag = layers.elementwise_mul(
+            b, c, axis=axis) - layers.elementwise_mul(
+                a, d, axis=axis)
+        real = layers.elementwise_div(real, den, axis=axis, name=name)
+        imag = layers.elementwise_div(imag, den, axis=axis, name=name)
+    elif is_real(b):
+        real = layers.elementwise_div(a, c, axis=axis, name=name)
+        imag = layers.elementwise_div(b, c, axis=axis, name=name)
+    else:
+        # a/(c + di) = (a/(c^2 + d^2))(c - di)
+        scaled_a = layers.elementwise_div(a, den, axis=axis)
+        real = layers.elementwise_mul(scaled_a, c, axis=axis, name=name)
+        imag = layers.scale(
+            layers.elementwise_mul(
+                scaled_a, d, axis=axis), scale=-1.0, name=name)
+    return ComplexVariable(real, imag)
 
 
 def trace(x, offset=0, axis1=0, axis2=1, name=None):
@@ -23,6 +23,7 @@ from . import datasets
 from . import distributed
 from . import vision
 from . import text
+from . import writers
 
 logger.setup_logger()
 
@@ -35,6 +36,7 @@ __all__ = [
     'loss',
     'vision',
     'text',
+    'writers',
 ]
 
 __all__ += model.__all__
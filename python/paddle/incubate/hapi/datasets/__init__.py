@@ -15,11 +15,14 @@
 from . import folder
 from . import mnist
 from . import flowers
+from . import record
 
 from .folder import *
 from .mnist import *
 from .flowers import *
+from .record import *
 
 __all__ = folder.__all__ \
         + mnist.__all__ \
-        + flowers.__all__
+        + flowers.__all__ \
+        + record.__all__
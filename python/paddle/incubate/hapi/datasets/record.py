@@ -0,0 +1,390 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+from __future__ import division
+
+import os
+import json
+import mmap
+import numpy as np
+
+from paddle.io import Dataset, BatchSampler
+from paddle.dataset.image import load_image_bytes
+
+from .folder import IMG_EXTENSIONS, has_valid_extension, make_dataset
+
+__all__ = ["pack_folder", "RecordDataset", "ShardShuffleSampler"]
+
+META_FILE = 'meta.json'
+INDEX_FILE = 'index.npy'
+SHARD_PATTERN = 'shard-{:05d}.rec'
+
+# one row per sample: which shard it lives in, byte offset and byte
+# length inside that shard, and its class index (-1 if unlabeled)
+INDEX_DTYPE = np.dtype([('shard', '<i4'), ('offset', '<i8'),
+                        ('length', '<i8'), ('label', '<i8')])
+
+
+def _list_unlabeled(root, extensions, is_valid_file=None):
+    if extensions is not None:
+
+        def is_valid_file(x):
+            return has_valid_extension(x, extensions)
+
+    samples = []
+    for dirpath, _, fnames in sorted(os.walk(root, followlinks=True)):
+        for fname in sorted(fnames):
+            path = os.path.join(dirpath, fname)
+            if is_valid_file(path):
+                samples.append((path, -1))
+    return samples
+
+
+def pack_folder(root,
+                output_dir,
+                shard_size=256 * 1024 * 1024,
+                extensions=None,
+                is_valid_file=None,
+                with_label=True):
+    """Pack an image folder dataset into a few large shard files.
+
+    The raw (still encoded) bytes of each image are appended to shard
+    files of about :attr:`shard_size` bytes, and an offset index is saved
+    alongside them, so that reading a sample costs one ranged read on a
+    big file instead of opening a small one.
+
+    The folder layout is the same as :code:`DatasetFolder` (one sub
+    directory per class) if :attr:`with_label` is True, otherwise it is
+    the same as :code:`ImageFolder` and all labels are -1.
+
+    Args:
+        root (str): Root directory of the folder dataset.
+        output_dir (str): Directory to write shards and index into.
+        shard_size (int): Soft upper limit of bytes in one shard, a shard
+            is closed once it exceeds this size. Default 256MB.
+        extensions (tuple[str]|None): Allowed file extensions. Default
+            None, which means :code:`IMG_EXTENSIONS`.
+        is_valid_file (callable|None): A function that takes path of a
+            file and check if it is a valid file, only used if
+            :attr:`extensions` is None.
+        with_label (bool): Whether sub directories of :attr:`root` are
+            classes. Default True.
+
+    Returns:
+        dict: the meta information, which is also saved in
+            :code:`output_dir/meta.json`.
+
+    Examples:
+
+        .. code-block:: python
+
+            from paddle.incubate.hapi.datasets import pack_folder, RecordDataset
+
+            pack_folder('path/to/folder', 'path/to/records')
+            dataset = RecordDataset('path/to/records')
+    """
+    assert shard_size > 0, \
+        "shard_size should be positive, but got {}".format(shard_size)
+    root = os.path.expanduser(root)
+    if extensions is None and is_valid_file is None:
+        extensions = IMG_EXTENSIONS
+
+    if with_label:
+        classes = sorted(
+            [d for d in os.listdir(root)
+             if os.path.isdir(os.path.join(root, d))])
+        class_to_idx = {classes[i]: i for i in range(len(classes))}
+        samples = make_dataset(root, class_to_idx, extensions, is_valid_file)
+    else:
+        classes = []
+        samples = _list_unlabeled(root, extensions, is_valid_file)
+
+    if len(samples) == 0:
+        raise RuntimeError("Found 0 files in subfolders of: " + root)
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    index = np.zeros((len(samples), ), dtype=INDEX_DTYPE)
+    shards = []
+    writer = None
+    offset = 0
+    try:
+        for i, (path, label) in enumerate(samples):
+            if writer is None or offset >= shard_size:
+                if writer is not None:
+                    writer.close()
+                shards.append(SHARD_PATTERN.format(len(shards)))
+                writer = open(os.path.join(output_dir, shards[-1]), 'wb')
+                offset = 0
+            with open(path, 'rb') as f:
+                data = f.read()
+            writer.write(data)
+            index[i] = (len(shards) - 1, offset, len(data), label)
+            offset += len(data)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    np.save(os.path.join(output_dir, INDEX_FILE), index)
+    meta = {
+        'num_samples': len(samples),
+        'shards': shards,
+        'classes': classes,
+    }
+    with open(os.path.join(output_dir, META_FILE), 'w') as f:
+        json.dump(meta, f)
+    return meta
+
+
+class RecordDataset(Dataset):
+    """A dataset reading samples packed by :code:`pack_folder`.
+
+    Each sample is read by its offset in the shard file, either through
+    a memory map of the shard or a positional read, and decoded from the
+    encoded image bytes by :code:`paddle.dataset.image.load_image_bytes`.
+    Shard files are opened lazily and reopened after fork, so decoding
+    runs in parallel when used with :code:`DataLoader(num_workers > 0)`.
+
+    Args:
+        data_dir (str): The output directory of :code:`pack_folder`.
+        transform (callable|None): A function/transform that takes in
+            a decoded sample and returns a transformed version.
+        decoder (callable|None): A function to decode sample bytes.
+            Default None, which means :code:`load_image_bytes`.
+        use_mmap (bool): Whether to read shards by memory map, otherwise
+            by positional read. Default True.
+
+    Attributes:
+        classes (list): List of the class names.
+        shard_ids (np.ndarray): The shard index of each sample.
+        targets (np.ndarray): The class index of each sample.
+
+    Examples:
+
+        .. code-block:: python
+
+            from paddle.incubate.hapi.datasets import RecordDataset
+
+            dataset = RecordDataset('path/to/records')
+            image, label = dataset[0]
+    """
+
+    def __init__(self, data_dir, transform=None, decoder=None, use_mmap=True):
+        self.data_dir = data_dir
+        with open(os.path.join(data_dir, META_FILE), 'r') as f:
+            meta = json.load(f)
+        self.shards = [os.path.join(data_dir, s) for s in meta['shards']]
+        self.classes = meta['classes']
+        self.index = np.load(os.path.join(data_dir, INDEX_FILE))
+        assert len(self.index) == meta['num_samples'], \
+            "index of {} is inconsistent with its meta".format(data_dir)
+
+        self.shard_ids = self.index['shard']
+        self.targets = self.index['label']
+        self.transform = transform
+        self.decoder = load_image_bytes if decoder is None else decoder
+        self.use_mmap = use_mmap
+
+        self._pid = None
+        self._files = None
+        self._maps = None
+
+    def _open(self):
+        # file handles and maps can not be shared with forked workers
+        self.close()
+        self._pid = os.getpid()
+        self._files = [None] * len(self.shards)
+        self._maps = [None] * len(self.shards)
+
+    def _read(self, shard, offset, length):
+        if length == 0:
+            return b''
+        if self._pid != os.getpid():
+            self._open()
+        f = self._files[shard]
+        if f is None:
+            f = open(self.shards[shard], 'rb')
+            self._files[shard] = f
+        if self.use_mmap:
+            m = self._maps[shard]
+            if m is None:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[shard] = m
+            return m[offset:offset + length]
+        if hasattr(os, 'pread'):
+            return os.pread(f.fileno(), length, offset)
+        f.seek(offset)
+        return f.read(length)
+
+    def read_bytes(self, index):
+        """
+        Read the encoded bytes of a sample without decoding.
+
+        Args:
+            index (int): Index
+
+        Returns:
+            bytes: the raw bytes of the sample.
+        """
+        shard, offset, length, _ = self.index[index]
+        return self._read(int(shard), int(offset), int(length))
+
+    def __getitem__(self, index):
+        """
+        Args:
+            index (int): Index
+
+        Returns:
+            tuple: (sample, target) where target is class_index of the target class.
+        """
+        sample = self.decoder(self.read_bytes(index))
+        if self.transform is not None:
+            sample = self.transform(sample)
+        return sample, int(self.targets[index])
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        """
+        Close all opened shard files of current process.
+        """
+        if self._pid == os.getpid():
+            for m in self._maps:
+                if m is not None:
+                    m.close()
+            for f in self._files:
+                if f is not None:
+                    f.close()
+        self._pid = None
+        self._files = None
+        self._maps = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pid'] = None
+        state['_files'] = None
+        state['_maps'] = None
+        return state
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ShardShuffleSampler(BatchSampler):
+    """A batch sampler for :code:`RecordDataset` which shuffles at shard
+    level so that reading stays sequential.
+
+    The order of shards is shuffled each epoch, and samples inside a shard
+    are read in storage order, optionally shuffled inside each of the
+    consecutive, non-overlapping chunks of :attr:`buffer_size` samples of
+    the shard, which trades little randomness for large sequential reads.
+    Samples never move across chunks.
+
+    Args:
+        dataset (RecordDataset): the dataset to sample from.
+        batch_size (int): sample indice number in a mini-batch indices.
+        shuffle (bool): whether to shuffle shard order. Default True.
+        buffer_size (int): chunk size of in-shard shuffling, 0 means
+            no in-shard shuffling. Default 0.
+        drop_last (bool): whether drop the last incomplete batch. Default
+            False.
+        seed (int|None): random seed, the epoch number is added to it
+            every epoch. Default None.
+
+    Examples:
+
+        .. code-block:: python
+
+            from paddle.io import DataLoader
+            from paddle.incubate.hapi.datasets import RecordDataset, ShardShuffleSampler
+
+            dataset = RecordDataset('path/to/records')
+            sampler = ShardShuffleSampler(dataset, batch_size=64, buffer_size=1024)
+            loader = DataLoader(dataset, batch_sampler=sampler, num_workers=4,
+                                return_list=True)
+    """
+
+    def __init__(self,
+                 dataset,
+                 batch_size=1,
+                 shuffle=True,
+                 buffer_size=0,
+                 drop_last=False,
+                 seed=None):
+        assert isinstance(dataset, RecordDataset), \
+            "dataset should be an instance of RecordDataset"
+        # the indices are kept by shard below rather than in a list of all
+        # the samples
+        super(ShardShuffleSampler, self).__init__(
+            indices=[],
+            shuffle=shuffle,
+            batch_size=batch_size,
+            drop_last=drop_last)
+        assert buffer_size >= 0, \
+            "buffer_size should not be negative, but got {}".format(buffer_size)
+        self.buffer_size = buffer_size
+        self.seed = seed
+        self.epoch = 0
+
+        shard_ids = dataset.shard_ids
+        # samples are packed in shard order, so each shard is a range
+        order = np.argsort(shard_ids, kind='mergesort')
+        bounds = np.searchsorted(shard_ids[order],
+                                 np.arange(len(dataset.shards) + 1))
+        self._shards = [
+            order[bounds[i]:bounds[i + 1]] for i in range(len(dataset.shards))
+        ]
+        self._num_samples = len(dataset)
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def _indices(self):
+        rng = np.random.RandomState(None if self.seed is None else
+                                    self.seed + self.epoch)
+        shard_order = np.arange(len(self._shards))
+        if self.shuffle:
+            rng.shuffle(shard_order)
+        for s in shard_order:
+            indices = self._shards[s]
+            if not self.shuffle or self.buffer_size <= 1:
+                for idx in indices:
+                    yield int(idx)
+                continue
+            for start in range(0, len(indices), self.buffer_size):
+                chunk = indices[start:start + self.buffer_size].copy()
+                rng.shuffle(chunk)
+                for idx in chunk:
+                    yield int(idx)
+
+    def __iter__(self):
+        batch_indices = []
+        for idx in self._indices():
+            batch_indices.append(idx)
+            if len(batch_indices) == self.batch_size:
+                yield batch_indices
+                batch_indices = []
+        if not self.drop_last and len(batch_indices) > 0:
+            yield batch_indices
+
+    def __len__(self):
+        num_samples = self._num_samples
+        num_samples += int(not self.drop_last) * (self.batch_size - 1)
+        return num_samples // self.batch_size
@@ -33,6 +33,55 @@ _parallel_context_initialized = False
 __all__ = ['DistributedBatchSampler']
 
 
+def _mix64(x, key):
+    """
+    A uint64 hash of x with the key, used as the round function of
+    `_FeistelPermutation`. Multiplications wrap around in uint64.
+    """
+    x = (x + np.uint64(key)) * np.uint64(0x9E3779B97F4A7C15)
+    x ^= x >> np.uint64(29)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(32)
+    return x
+
+
+class _FeistelPermutation(object):
+    """
+    A seeded pseudo-random permutation of [0, size) evaluated lazily on
+    arrays of positions, without materializing the permutation.
+
+    A balanced Feistel network is a bijection on [0, 4^k), positions are
+    mapped by it repeatedly until falling in [0, size) (cycle walking),
+    which keeps it a bijection on [0, size). Since 4^k < 4 * size, it takes
+    less than 4 rounds in average.
+    """
+
+    def __init__(self, size, seed, num_rounds=4):
+        self.size = size
+        half_bits = 1
+        while (1 << (2 * half_bits)) < size:
+            half_bits += 1
+        self._half_bits = np.uint64(half_bits)
+        self._mask = np.uint64((1 << half_bits) - 1)
+        self._keys = np.random.RandomState(seed).randint(
+            0, 2**31 - 1, size=num_rounds)
+
+    def _feistel(self, x):
+        left = x >> self._half_bits
+        right = x & self._mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix64(right, key) & self._mask)
+        return (left << self._half_bits) | right
+
+    def __call__(self, positions):
+        x = self._feistel(np.asarray(positions, dtype='uint64'))
+        out_of_range = np.nonzero(x >= self.size)[0]
+        while len(out_of_range) > 0:
+            x[out_of_range] = self._feistel(x[out_of_range])
+            out_of_range = out_of_range[x[out_of_range] >= self.size]
+        return x.astype('int64')
+
+
 class DistributedBatchSampler(BatchSampler):
     """Sampler that restricts data loading to a subset of the dataset.
 
@@ -40,6 +89,11 @@ class DistributedBatchSampler(BatchSampler):
     as a DataLoader sampler, and load a subset of the original dataset that 
     is exclusive to it.
 
+    The indices of each batch are computed when it is sampled, so starting
+    an epoch takes constant time. With `lazy_shuffle=True`, the shuffled
+    order is also computed lazily instead of keeping a permutation of the
+    dataset in memory, which is useful for very large datasets.
+
     .. note::
         Dataset is assumed to be of constant size.
         
@@ -53,6 +107,10 @@ class DistributedBatchSampler(BatchSampler):
             batch indices. Default False.
         drop_last(bool): whether drop the last incomplete batch dataset size
             is not divisible by the batch size. Default False
+        lazy_shuffle(bool): whether to shuffle by a seeded pseudo-random
+            permutation computed on the fly, which takes O(1) memory but
+            gives a different order from `numpy.random.permutation` .
+            Only used when shuffle is True. Default False.
 
     Examples:
         .. code-block:: python
@@ -84,7 +142,12 @@ class DistributedBatchSampler(BatchSampler):
                 break
     """
 
-    def __init__(self, dataset, batch_size, shuffle=False, drop_last=False):
+    def __init__(self,
+                 dataset,
+                 batch_size,
+                 shuffle=False,
+                 drop_last=False,
+                 lazy_shuffle=False):
         self.dataset = dataset
 
         assert isinstance(batch_size, int) and batch_size > 0, \
@@ -97,61 +160,105 @@ class DistributedBatchSampler(BatchSampler):
                 "drop_last should be a boolean number"
 
         self.drop_last = drop_last
+        self.lazy_shuffle = lazy_shuffle
         self.nranks = ParallelEnv().nranks
         self.local_rank = ParallelEnv().local_rank
         self.epoch = 0
+        self.start_step = 0
         self.num_samples = int(math.ceil(len(self.dataset) * 1.0 / self.nranks))
         self.total_size = self.num_samples * self.nranks
 
+    @property
+    def num_valid_samples(self):
+        """
+        Number of samples of current rank which are not padding in the next
+        iteration, without the batches to skip set by `set_epoch`. Padding
+        samples always follow valid samples, so in every epoch the first
+        `num_valid_samples` samples yielded are valid.
+        """
+        # padding samples are at the last positions of all ranks
+        padding = np.arange(len(self.dataset), self.total_size)
+        last_batch_size = self.total_size % (self.batch_size * self.nranks)
+        last_start = self.total_size - last_batch_size
+        ranks = np.where(
+            padding >= last_start,
+            (padding - last_start) // max(last_batch_size // self.nranks, 1),
+            padding % (self.batch_size * self.nranks) // self.batch_size)
+        num_valid = self.num_samples - int(np.sum(ranks == self.local_rank))
+        return max(num_valid - self.start_step * self.batch_size, 0)
+
     def __iter__(self):
         num_samples = len(self.dataset)
-        indices = np.arange(num_samples).tolist()
-        indices += indices[:(self.total_size - len(indices))]
-        assert len(indices) == self.total_size
+        permutation = None
         if self.shuffle:
-            np.random.RandomState(self.epoch).shuffle(indices)
+            if self.lazy_shuffle:
+                permutation = _FeistelPermutation(num_samples, self.epoch)
+            else:
+                permutation = np.random.RandomState(self.epoch).permutation(
+                    num_samples)
             self.epoch += 1
+        start_step, self.start_step = self.start_step, 0
 
-        # subsample
-        def _get_indices_by_batch_size(indices):
-            subsampled_indices = []
-            last_batch_size = self.total_size % (self.batch_size * self.nranks)
-            assert last_batch_size % self.nranks == 0
-            last_local_batch_size = last_batch_size // self.nranks
-
-            for i in range(self.local_rank * self.batch_size,
-                           len(indices) - last_batch_size,
-                           self.batch_size * self.nranks):
-                subsampled_indices.extend(indices[i:i + self.batch_size])
-
-            indices = indices[len(indices) - last_batch_size:]
-            subsampled_indices.extend(indices[
-                self.local_rank * last_local_batch_size:(
-                    self.local_rank + 1) * last_local_batch_size])
-            return subsampled_indices
-
-        if self.nranks > 1:
-            indices = _get_indices_by_batch_size(indices)
-
-        assert len(indices) == self.num_samples
-        _sample_iter = iter(indices)
-
-        batch_indices = []
-        for idx in _sample_iter:
-            batch_indices.append(idx)
-            if len(batch_indices) == self.batch_size:
-                yield batch_indices
-                batch_indices = []
-        if not self.drop_last and len(batch_indices) > 0:
-            yield batch_indices
+        for begin in range(start_step * self.batch_size, self.num_samples,
+                           self.batch_size):
+            end = min(begin + self.batch_size, self.num_samples)
+            if self.drop_last and end - begin < self.batch_size:
+                break
+            # positions past the dataset are padding, which wrap around to
+            # the samples at the head of the (shuffled) order
+            positions = self._get_positions(np.arange(begin, end)) % \
+                    num_samples
+            if isinstance(permutation, np.ndarray):
+                positions = permutation[positions]
+            elif permutation is not None:
+                positions = permutation(positions)
+            yield positions.tolist()
+
+    def _get_positions(self, local_positions):
+        """
+        Map the positions in the samples of current rank to the positions in
+        the samples of all ranks. Ranks take batches in turn, and split the
+        last incomplete round of batches evenly.
+        """
+        round_size = self.batch_size * self.nranks
+        last_batch_size = self.total_size % round_size
+        assert last_batch_size % self.nranks == 0
+        last_local_batch_size = last_batch_size // self.nranks
+        num_full = (self.total_size - last_batch_size) // self.nranks
+
+        in_rounds = (local_positions // self.batch_size * round_size +
+                     self.local_rank * self.batch_size +
+                     local_positions % self.batch_size)
+        in_last = (self.total_size - last_batch_size + self.local_rank *
+                   last_local_batch_size + local_positions - num_full)
+        return np.where(local_positions < num_full, in_rounds, in_last)
+
+    # subsample indices of current rank
+    def _get_indices_by_batch_size(self, indices):
+        positions = self._get_positions(np.arange(self.num_samples))
+        return np.asarray(indices)[positions].tolist()
 
     def __len__(self):
+        # the number of batches in the next iteration
         num_samples = self.num_samples
         num_samples += int(not self.drop_last) * (self.batch_size - 1)
-        return num_samples // self.batch_size
-
-    def set_epoch(self, epoch):
+        return max(num_samples // self.batch_size - self.start_step, 0)
+
+    def set_epoch(self, epoch, start_step=0):
+        """
+        Set the epoch of the next iteration, which is the seed of shuffling,
+        and start it from batch `start_step`, so that a restarted job can
+        resume from the middle of an epoch without replaying data. Before
+        the next iteration starts, `len()` and `num_valid_samples` only
+        count the batches not skipped.
+
+        Args:
+            epoch(int): the epoch of the next iteration.
+            start_step(int): the number of batches to skip in the next
+                iteration. Default 0.
+        """
         self.epoch = epoch
+        self.start_step = start_step
 
 
 def _all_gather(x, nranks, ring_id=0, use_calc_stream=True):
@@ -159,6 +266,39 @@ def _all_gather(x, nranks, ring_id=0, use_calc_stream=True):
         x, nranks, ring_id=ring_id, use_calc_stream=use_calc_stream)
 
 
+def _all_reduce_arrays(arrays, place, ring_id=0):
+    """
+    Sum a list of numpy arrays across all processes, arrays are packed
+    into one float64 buffer and reduced by a single collective.
+    """
+    flat = np.concatenate(
+        [np.asarray(
+            a, dtype='float64').reshape([-1]) for a in arrays])
+    if fluid.in_dygraph_mode():
+        x = fluid.dygraph.to_variable(flat)
+        out = collective._c_allreduce(
+            x, reduce_type='sum', ring_id=ring_id, use_calc_stream=True)
+        flat = out.numpy()
+    else:
+        prog = fluid.Program()
+        with fluid.program_guard(prog, fluid.Program()):
+            x = fluid.data(name='packed_arrays', shape=flat.shape, dtype='float64')
+            out = collective._c_allreduce(
+                x, reduce_type='sum', ring_id=ring_id, use_calc_stream=True)
+        flat = fluid.Executor(place).run(prog,
+                                         feed={'packed_arrays': flat},
+                                         fetch_list=[out])[0]
+
+    results = []
+    offset = 0
+    for a in arrays:
+        a = np.asarray(a)
+        results.append(flat[offset:offset + a.size].reshape(a.shape).astype(
+            a.dtype))
+        offset += a.size
+    return results
+
+
 def wait_server_ready(endpoints):
     assert not isinstance(endpoints, six.string_types)
     while True:
@@ -140,6 +140,33 @@ class Metric(object):
         raise NotImplementedError("function 'name' not implemented in {}.".
                                   format(self.__class__.__name__))
 
+    def states(self):
+        """
+        Returns the accumulated states of the metric as a list of numpy
+        arrays, or None if the metric does not support merging states.
+
+        States returned should be mergeable by element-wise sum, e.g. counters
+        and histograms, so that in multi-process evaluation each process
+        updates the metric with its own samples only, and states of all
+        processes are reduced by a single collective at the end of evaluation
+        and loaded back by :code:`set_states`, instead of gathering outputs
+        and labels of all processes every batch.
+
+        see :code:`Metric.set_states`
+        """
+        return None
+
+    def set_states(self, states):
+        """
+        Load states, which are the element-wise sum of :code:`states` of all
+        processes, :code:`accumulate` should return the merged result then.
+
+        see :code:`Metric.states`
+        """
+        raise NotImplementedError(
+            "function 'set_states' not implemented in {}.".format(
+                self.__class__.__name__))
+
     def add_metric_op(self, *args):
         """
         This API is advanced usage to accelerate metric calculating, calulations
@@ -225,10 +252,23 @@ class Accuracy(Metric):
         self.total = [0.] * len(self.topk)
         self.count = [0] * len(self.topk)
 
+    def states(self):
+        return [
+            np.array(
+                self.total, dtype='float64'), np.array(
+                    self.count, dtype='float64')
+        ]
+
+    def set_states(self, states):
+        total, count = states
+        self.total = [float(t) for t in total]
+        self.count = [int(c) for c in count]
+
     def accumulate(self):
         res = []
         for t, c in zip(self.total, self.count):
-            res.append(float(t) / c)
+            # no sample is updated yet, e.g. all padding on a rank
+            res.append(float(t) / c if c > 0 else 0.)
         return res
 
     def _init_name(self, name):
@@ -36,9 +36,10 @@ from paddle.fluid.incubate.fleet.base import role_maker
 from paddle.io import DataLoader, Dataset
 
 from .loss import Loss
-from .distributed import DistributedBatchSampler, _all_gather, prepare_distributed_context, _parallel_context_initialized
+from .distributed import DistributedBatchSampler, _all_gather, _all_reduce_arrays, prepare_distributed_context, _parallel_context_initialized
 from .metrics import Metric
 from .callbacks import config_callbacks
+from .writers import PredictWriter, AsyncWriter
 from .utils import to_list, to_numpy, flatten_list, restore_flatten_list
 
 __all__ = [
@@ -325,12 +326,25 @@ class StaticGraphAdapter(object):
             return rets[:]
         losses = rets[:num_loss]
         metric_states = restore_flatten_list(rets[num_loss:], metric_splits)
+        mergeable = self.model._metrics_mergeable()
+        valid = None
+        if self.mode == 'eval' and self._nranks > 1 and mergeable \
+                and len(metric_states) > 0:
+            # cut off padding samples of current rank
+            valid = self.model._take_valid_samples(metric_states[0][0].shape[
+                0])
+            metric_states = [[s[:valid, ...] for s in state]
+                             for state in metric_states]
         metrics = []
         for metric, state in zip(self.model._metrics, metric_states):
+            if valid == 0:
+                # the batch is all padding, nothing to update
+                metrics.append(metric.accumulate())
+                continue
             # cut off padding size
             if self.mode != 'train' and self.model._test_dataloader is not None \
                     and isinstance(self.model._test_dataloader, DataLoader) \
-                    and self._nranks > 1:
+                    and self._nranks > 1 and not mergeable:
                 total_size = len(self.model._test_dataloader.dataset)
                 # TODO: fixme if have better way to get batch size
                 samples = state[0].shape[0]
@@ -389,7 +403,10 @@ class StaticGraphAdapter(object):
             if mode != 'test' and self.model._loss_function:
                 losses = self.model._loss_function(outputs, labels)
 
-            if self._nranks > 1 and mode != 'train':
+            # metrics with mergeable states are reduced once per evaluation
+            # by `Model._merge_metrics`, outputs need not to be gathered
+            if self._nranks > 1 and mode != 'train' and not (
+                    mode == 'eval' and self.model._metrics_mergeable()):
                 outputs = [_all_gather(o, self._nranks) for o in outputs]
                 if mode != 'test':
                     labels = [_all_gather(l, self._nranks) for l in labels]
@@ -535,13 +552,28 @@ class DynamicGraphAdapter(object):
             losses = self.model._loss_function(outputs, labels)
         else:
             losses = []
-        if self._nranks > 1:
+        mergeable = self.model._metrics_mergeable()
+        if self._nranks > 1 and mergeable:
+            # metric states are reduced once per evaluation by
+            # `Model._merge_metrics`, only cut off padding samples here
+            outputs = to_list(outputs)
+            samples = outputs[0].shape[0]
+            valid = self.model._take_valid_samples(samples)
+            if 0 < valid < samples:
+                outputs = [o[:valid] for o in outputs]
+                labels = [l[:valid] for l in labels]
+        elif self._nranks > 1:
             outputs = [_all_gather(o, self._nranks) for o in to_list(outputs)]
             labels = [_all_gather(l, self._nranks) for l in labels]
         metrics = []
         for metric in self.model._metrics:
+            if self._nranks > 1 and mergeable:
+                if valid == 0:
+                    # the batch is all padding, nothing to update
+                    metrics.append(metric.accumulate())
+                    continue
             # cut off padding value.
-            if self.model._test_dataloader is not None and self._nranks > 1 \
+            elif self.model._test_dataloader is not None and self._nranks > 1 \
                     and isinstance(self.model._test_dataloader, DataLoader):
                 total_size = len(self.model._test_dataloader.dataset)
                 samples = outputs[0].shape[0]
@@ -707,6 +739,8 @@ class Model(fluid.dygraph.Layer):
         self._device = None
         self._optimizer = None
         self._test_dataloader = None
+        self._valid_samples = None
+        self._seen_samples = 0
 
         # init backend
         if fluid.in_dygraph_mode():
@@ -1445,7 +1479,8 @@ class Model(fluid.dygraph.Layer):
                 batch_size=1,
                 num_workers=0,
                 stack_outputs=False,
-                callbacks=None):
+                callbacks=None,
+                writer=None):
         """
         Compute the output predictions on testing data.
 
@@ -1465,8 +1500,15 @@ class Model(fluid.dygraph.Layer):
                 be a length N list in shape [[X, Y], [X, Y], ....[X, Y]] if stack_outputs
                 is False. stack_outputs as False is used for LoDTensor output situation,
                 it is recommended set as True if outputs contains no LoDTensor. Default: False.
+            callbacks (Callback|None): A list of `Callback` instances to apply
+                during predicting. Default: None.
+            writer (PredictWriter|None): If set, outputs of each batch are
+                passed to the writer in a background thread once computed,
+                instead of being gathered in memory. See
+                `paddle.incubate.hapi.writers`. Default: None.
         Returns:
-            list: output of models.
+            list: output of models, or the result of :code:`writer.close()`
+                if :attr:`writer` is set.
 
         Examples:
         .. code-block:: python
@@ -1514,6 +1556,86 @@ class Model(fluid.dygraph.Layer):
                 print(result)
         """
 
+        if writer is not None:
+            assert isinstance(writer, PredictWriter), \
+                "writer should be an instance of PredictWriter"
+            if not isinstance(writer, AsyncWriter):
+                writer = AsyncWriter(writer)
+            try:
+                for outs in self.predict_generator(
+                        test_data,
+                        batch_size=batch_size,
+                        num_workers=num_workers,
+                        callbacks=callbacks):
+                    writer.write(outs)
+            finally:
+                result = writer.close()
+            return result
+
+        outputs = list(
+            self.predict_generator(
+                test_data,
+                batch_size=batch_size,
+                num_workers=num_workers,
+                callbacks=callbacks))
+
+        outputs = list(zip(*outputs))
+
+        # NOTE: for lod tensor output, we should not stack outputs
+        # for stacking may lose its detail info
+        if stack_outputs:
+            outputs = [np.vstack(outs) for outs in outputs]
+
+        return outputs
+
+    def predict_generator(self,
+                          test_data,
+                          batch_size=1,
+                          num_workers=0,
+                          callbacks=None):
+        """
+        Compute the output predictions on testing data and yield them batch
+        by batch, so that only outputs of the current batch are hold in
+        memory.
+
+        Args:
+            test_data (Dataset|DataLoader): An iterable data loader is used for
+                predict. An instance of paddle.io.Dataset or paddle.io.Dataloader
+                is recomended.
+            batch_size (int): Integer number. The batch size of test_data.
+                When test_data is the instance of Dataloader, this argument
+                will be ignored. Default: 1.
+            num_workers (int): The number of subprocess to load data, 0 for no
+                subprocess used and loading data in main process. When test_data
+                is the instance of Dataloader, this argument will be ignored.
+                Default: 0.
+            callbacks (Callback|None): A list of `Callback` instances to apply
+                during predicting. Default: None.
+        Returns:
+            generator: yields a list of numpy array, outputs of a batch.
+
+        Examples:
+        .. code-block:: python
+
+            import numpy as np
+            from paddle.incubate.hapi.datasets import MNIST
+            from paddle.incubate.hapi.vision.models import LeNet
+            from paddle.incubate.hapi.model import Input
+
+            class MnistDataset(MNIST):
+                def __getitem__(self, idx):
+                    return np.reshape(self.images[idx], [1, 28, 28]),
+
+            inputs = [Input([-1, 1, 28, 28], 'float32', name='image')]
+            test_dataset = MnistDataset(mode='test')
+
+            model = LeNet()
+            model.prepare(inputs=inputs)
+
+            for outs in model.predict_generator(test_dataset, batch_size=64):
+                print(outs[0].shape)
+        """
+
         if test_data is not None and isinstance(test_data, Dataset):
             test_sampler = DistributedBatchSampler(
                 test_data, batch_size=batch_size)
@@ -1535,21 +1657,13 @@ class Model(fluid.dygraph.Layer):
 
         cbks.on_begin('test', logs)
 
-        outputs = []
-
-        logs, outputs = self._run_one_epoch(test_loader, cbks, 'test')
-
-        outputs = list(zip(*outputs))
-
-        # NOTE: for lod tensor output, we should not stack outputs
-        # for stacking may lose its detail info
-        if stack_outputs:
-            outputs = [np.vstack(outs) for outs in outputs]
+        logs = {}
+        for outs in self._iter_one_epoch(test_loader, cbks, 'test', logs):
+            yield outs
 
         self._test_dataloader = None
 
         cbks.on_end('test', logs)
-        return outputs
 
     def save_inference_model(self,
                              save_dir,
@@ -1597,6 +1711,20 @@ class Model(fluid.dygraph.Layer):
 
     def _run_one_epoch(self, data_loader, callbacks, mode, logs={}):
         outputs = []
+        for outs in self._iter_one_epoch(data_loader, callbacks, mode, logs):
+            if mode == 'test':
+                outputs.append(outs)
+
+        if mode == 'test':
+            return logs, outputs
+        return logs
+
+    def _iter_one_epoch(self, data_loader, callbacks, mode, logs):
+        if mode == 'eval':
+            sampler = getattr(data_loader, 'batch_sampler', None)
+            self._valid_samples = getattr(sampler, 'num_valid_samples', None)
+            self._seen_samples = 0
+
         for step, data in enumerate(data_loader):
             # data might come from different types of data_loader and have
             # different format, as following:
@@ -1639,8 +1767,6 @@ class Model(fluid.dygraph.Layer):
                 else:
                     outs = getattr(self, mode + '_batch')(data)
 
-                outputs.append(outs)
-
             logs['step'] = step
             if mode == 'train' or self._adapter._merge_count.get(
                     mode + '_batch', 0) <= 0:
@@ -1649,16 +1775,48 @@ class Model(fluid.dygraph.Layer):
                 logs['batch_size'] = self._adapter._merge_count[mode + '_batch']
 
             callbacks.on_batch_end(mode, step, logs)
-        self._reset_metrics()
 
-        if mode == 'test':
-            return logs, outputs
-        return logs
+            yield outs if mode == 'test' else None
+
+        if mode == 'eval':
+            self._merge_metrics(logs)
+        self._reset_metrics()
 
     def _reset_metrics(self):
         for metric in self._metrics:
             metric.reset()
 
+    def _metrics_mergeable(self):
+        return len(self._metrics) > 0 and all(
+            m.states() is not None for m in self._metrics)
+
+    def _take_valid_samples(self, num_samples):
+        """
+        Returns how many of the next `num_samples` evaluated samples of
+        current rank are not padding added by `DistributedBatchSampler`.
+        """
+        if self._valid_samples is None:
+            return num_samples
+        valid = min(num_samples, self._valid_samples - self._seen_samples)
+        self._seen_samples += num_samples
+        return max(valid, 0)
+
+    def _merge_metrics(self, logs):
+        # sum metric states of all ranks with one collective
+        if ParallelEnv().nranks < 2 or not self._metrics_mergeable():
+            return
+
+        states = [to_list(m.states()) for m in self._metrics]
+        flat_states, splits = flatten_list(states)
+        flat_states = _all_reduce_arrays(flat_states, self._place)
+        metrics = []
+        for metric, state in zip(self._metrics,
+                                 restore_flatten_list(flat_states, splits)):
+            metric.set_states(state)
+            metrics.extend(to_list(metric.accumulate()))
+        for k, v in zip(self._metrics_name()[1:], metrics):
+            logs[k] = v
+
     def _metrics_name(self):
         metrics_name = ['loss']
         for m in self._metrics:
@@ -0,0 +1,62 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import time
+import unittest
+import numpy as np
+
+from paddle.incubate.hapi.vision.transforms import transforms
+
+# This is a benchmark of vision transforms, it reports images/sec on a
+# single core for the unfused, fused and batch fused pipelines.
+
+
+class BenchmarkTransforms(unittest.TestCase):
+    def setUp(self):
+        self.batch_size = 64
+        self.iters = 10
+        self.imgs = (np.random.random(
+            (self.batch_size, 256, 256, 3)) * 255).astype('uint8')
+        self.trans_list = [
+            transforms.CenterCrop(224),
+            transforms.RandomHorizontalFlip(),
+            transforms.Permute(mode='CHW'),
+            transforms.Normalize(
+                mean=[123.675, 116.28, 103.53], std=[58.395, 57.120, 57.375]),
+        ]
+
+    def timeit(self, name, callback):
+        callback()
+        start = time.time()
+        for _ in range(self.iters):
+            callback()
+        elapse = time.time() - start
+        print("{} transforms: {:.1f} images/sec".format(
+            name, self.iters * self.batch_size / elapse))
+
+    def test_timeit(self):
+        unfused = transforms.Compose(self.trans_list, fuse=False)
+        fused = transforms.Compose(self.trans_list)
+        batch = transforms.BatchCompose([fused])
+        samples = [(img, 0) for img in self.imgs]
+
+        self.timeit("unfused", lambda: [unfused(img) for img in self.imgs])
+        self.timeit("fused", lambda: [fused(img) for img in self.imgs])
+        self.timeit("batch fused", lambda: batch(samples))
+
+
+if __name__ == '__main__':
+    unittest.main()
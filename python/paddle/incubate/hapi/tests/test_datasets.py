@@ -87,6 +87,83 @@ class TestFolderDatasets(unittest.TestCase):
             _check_exists_and_download('temp_paddle', None, None, None, False)
 
 
+class TestRecordDataset(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.record_dir = tempfile.mkdtemp()
+        for i in range(2):
+            sub_dir = os.path.join(self.data_dir, 'class_' + str(i))
+            if not os.path.exists(sub_dir):
+                os.makedirs(sub_dir)
+            for j in range(3):
+                fake_img = (np.random.random((32, 32, 3)) * 255).astype('uint8')
+                cv2.imwrite(os.path.join(sub_dir, str(j) + '.png'), fake_img)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+        shutil.rmtree(self.record_dir)
+
+    def test_pack_and_read(self):
+        # small shard size to get several shards
+        meta = pack_folder(self.data_dir, self.record_dir, shard_size=1)
+        self.assertEqual(meta['num_samples'], 6)
+        self.assertEqual(len(meta['shards']), 6)
+
+        folder = DatasetFolder(self.data_dir)
+        for use_mmap in [True, False]:
+            dataset = RecordDataset(self.record_dir, use_mmap=use_mmap)
+            self.assertEqual(len(dataset), len(folder))
+            self.assertEqual(dataset.classes, folder.classes)
+            for i in range(len(dataset)):
+                image, label = dataset[i]
+                expect_image, expect_label = folder[i]
+                self.assertEqual(label, expect_label)
+                np.testing.assert_array_equal(image, expect_image)
+            dataset.close()
+
+    def test_unlabeled(self):
+        pack_folder(self.data_dir, self.record_dir, with_label=False)
+        dataset = RecordDataset(self.record_dir, transform=lambda x: x.shape)
+        self.assertEqual(len(dataset), 6)
+        for shape, label in dataset:
+            self.assertEqual(shape, (32, 32, 3))
+            self.assertEqual(label, -1)
+
+    def test_shard_shuffle_sampler(self):
+        pack_folder(self.data_dir, self.record_dir, shard_size=4000)
+        dataset = RecordDataset(self.record_dir)
+        sampler = ShardShuffleSampler(
+            dataset, batch_size=4, buffer_size=2, seed=1)
+        self.assertEqual(len(sampler), 2)
+        indices = [idx for batch in sampler for idx in batch]
+        self.assertEqual(sorted(indices), list(range(6)))
+
+        # samples of a shard are read together
+        shard_ids = [dataset.shard_ids[idx] for idx in indices]
+        changes = sum(a != b for a, b in zip(shard_ids[:-1], shard_ids[1:]))
+        self.assertEqual(changes, len(set(shard_ids)) - 1)
+
+        # samples are only shuffled inside chunks of buffer_size samples
+        for shard_id in set(shard_ids):
+            read = [
+                idx for idx in indices if dataset.shard_ids[idx] == shard_id
+            ]
+            stored = sorted(read)
+            for start in range(0, len(read), 2):
+                self.assertEqual(
+                    sorted(read[start:start + 2]), stored[start:start + 2])
+
+        sampler = ShardShuffleSampler(
+            dataset, batch_size=4, shuffle=False, drop_last=True)
+        self.assertEqual(list(sampler), [[0, 1, 2, 3]])
+
+    def test_errors(self):
+        empty_dir = tempfile.mkdtemp()
+        with self.assertRaises(RuntimeError):
+            pack_folder(empty_dir, self.record_dir)
+        shutil.rmtree(empty_dir)
+
+
 class TestMNISTTest(unittest.TestCase):
     def test_main(self):
         mnist = MNIST(mode='test')
@@ -0,0 +1,200 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import division
+from __future__ import print_function
+
+import os
+import unittest
+import numpy as np
+
+from paddle import fluid
+from paddle.io import Dataset
+from paddle.nn import Linear
+from paddle.incubate.hapi.model import Model, Input, set_device
+from paddle.incubate.hapi.loss import CrossEntropy
+from paddle.incubate.hapi.metrics import Accuracy
+from paddle.incubate.hapi.distributed import DistributedBatchSampler
+
+
+class RangeDataset(Dataset):
+    def __init__(self, num_samples):
+        self.num_samples = num_samples
+
+    def __getitem__(self, idx):
+        return idx
+
+    def __len__(self):
+        return self.num_samples
+
+
+class ClassifyDataset(Dataset):
+    def __init__(self, indices):
+        rng = np.random.RandomState(0)
+        self.x = rng.random_sample([100, 4]).astype('float32')
+        self.y = rng.randint(0, 3, [100, 1]).astype('int64')
+        self.indices = indices
+
+    def __getitem__(self, idx):
+        return self.x[self.indices[idx]], self.y[self.indices[idx]]
+
+    def __len__(self):
+        return len(self.indices)
+
+
+class LinearModel(Model):
+    def __init__(self):
+        super(LinearModel, self).__init__()
+        self.fc = Linear(4, 3, act='softmax')
+
+    def forward(self, x):
+        return self.fc(x)
+
+
+class TestDistributedBatchSampler(unittest.TestCase):
+    def setUp(self):
+        self.env = dict(os.environ)
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.env)
+
+    def get_samplers(self, dataset, nranks, **kwargs):
+        samplers = []
+        for rank in range(nranks):
+            os.environ['PADDLE_TRAINERS_NUM'] = str(nranks)
+            os.environ['PADDLE_TRAINER_ID'] = str(rank)
+            samplers.append(DistributedBatchSampler(dataset, **kwargs))
+        return samplers
+
+    def test_valid_samples(self):
+        dataset = RangeDataset(103)
+        for shuffle in [False, True]:
+            samplers = self.get_samplers(
+                dataset, 4, batch_size=8, shuffle=shuffle)
+            valid_indices = []
+            for sampler in samplers:
+                indices = [i for batch in sampler for i in batch]
+                self.assertEqual(len(indices), sampler.num_samples)
+                valid_indices.extend(indices[:sampler.num_valid_samples])
+            # valid samples of all ranks cover dataset exactly once
+            self.assertEqual(sorted(valid_indices), list(range(103)))
+
+    def test_lazy_shuffle(self):
+        dataset = RangeDataset(103)
+        samplers = self.get_samplers(
+            dataset, 4, batch_size=8, shuffle=True, lazy_shuffle=True)
+        valid_indices = []
+        for sampler in samplers:
+            indices = [i for batch in sampler for i in batch]
+            valid_indices.extend(indices[:sampler.num_valid_samples])
+        self.assertEqual(sorted(valid_indices), list(range(103)))
+        # shuffled differently in every epoch
+        sampler = samplers[0]
+        self.assertNotEqual(list(sampler), list(sampler))
+
+    def test_resume(self):
+        dataset = RangeDataset(103)
+        for lazy_shuffle in [False, True]:
+            sampler, = self.get_samplers(
+                dataset, 1, batch_size=8, shuffle=True,
+                lazy_shuffle=lazy_shuffle)
+            sampler.set_epoch(3)
+            batches = list(sampler)
+            sampler.set_epoch(3, start_step=5)
+            self.assertEqual(list(sampler), batches[5:])
+            # only the resumed epoch skips batches
+            sampler.set_epoch(3)
+            self.assertEqual(list(sampler), batches)
+
+    def test_resume_valid_samples(self):
+        dataset = RangeDataset(103)
+        for start_step in [0, 2, 3, 4]:
+            valid_indices = []
+            for sampler in self.get_samplers(dataset, 4, batch_size=8):
+                batches = list(sampler)
+                valid = [i for batch in batches for i in batch]
+                valid = valid[:sampler.num_valid_samples]
+                sampler.set_epoch(0, start_step=start_step)
+                self.assertEqual(len(sampler), len(batches) - start_step)
+                num_valid = sampler.num_valid_samples
+                resumed = [i for batch in sampler for i in batch]
+                # the valid samples skipped are not counted
+                self.assertEqual(resumed[:num_valid],
+                                 valid[start_step * 8:])
+                valid_indices.extend(resumed[:num_valid])
+                # the next iteration is a full epoch
+                self.assertEqual(len(sampler), len(batches))
+            self.assertEqual(len(valid_indices), max(103 - start_step * 32, 0))
+
+
+class TestEvaluatePadding(unittest.TestCase):
+    def setUp(self):
+        self.env = dict(os.environ)
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.env)
+
+    def evaluate(self, dynamic):
+        device = set_device('cpu')
+        fluid.enable_dygraph(device) if dynamic else None
+        model = LinearModel()
+        model.prepare(
+            loss_function=CrossEntropy(),
+            metrics=Accuracy(),
+            inputs=[Input([None, 4], 'float32', name='x')],
+            labels=[Input([None, 1], 'int64', name='label')],
+            device=device)
+        dataset = ClassifyDataset(list(range(9)))
+        for rank in range(4):
+            # 9 samples on 4 ranks in batches of 2, the last batch of
+            # rank 1, 2 and 3 is a single padding sample
+            os.environ['PADDLE_TRAINERS_NUM'] = '4'
+            os.environ['PADDLE_TRAINER_ID'] = str(rank)
+            sampler = DistributedBatchSampler(dataset, batch_size=2)
+            batches = list(sampler)
+            self.assertEqual(len(batches[-1]), 1)
+            self.assertEqual(sampler.num_valid_samples,
+                             3 if rank == 0 else 2)
+
+            # evaluate as a rank of 4 trainers without merging the metrics
+            os.environ['PADDLE_TRAINERS_NUM'] = '1'
+            os.environ['PADDLE_TRAINER_ID'] = '0'
+            loader = fluid.io.DataLoader(
+                dataset,
+                batch_sampler=sampler,
+                places=device,
+                return_list=True)
+            model._adapter._nranks = 4
+            result = model.evaluate(loader, verbose=0)
+
+            # same as the valid samples evaluated by a single trainer
+            model._adapter._nranks = 1
+            valid = [i for batch in batches for i in batch]
+            valid = valid[:sampler.num_valid_samples]
+            expected = model.evaluate(
+                ClassifyDataset(valid), batch_size=2, verbose=0)
+            np.testing.assert_allclose(result['acc'], expected['acc'])
+        fluid.disable_dygraph() if dynamic else None
+
+    def test_evaluate_dygraph(self):
+        self.evaluate(True)
+
+    def test_evaluate_static(self):
+        self.evaluate(False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -128,5 +128,25 @@ class TestAccuracyStaticMultiTopk(TestAccuracyStatic):
         self.name = "accuracy"
 
 
+class TestAccuracyMergeStates(unittest.TestCase):
+    def test_main(self):
+        topk = (1, 3)
+        correct = (np.random.random((1000, 3)) > 0.5).astype('float32')
+        expect = Accuracy(topk=topk)
+        expect.update(correct)
+
+        # each rank updates with its own samples
+        states = []
+        for shard in np.array_split(correct, 3):
+            acc = Accuracy(topk=topk)
+            acc.update(shard)
+            states.append(acc.states())
+
+        merged = Accuracy(topk=topk)
+        merged.set_states([sum(s[i] for s in states) for i in range(2)])
+        np.testing.assert_allclose(merged.accumulate(), expect.accumulate())
+        self.assertEqual(merged.count, [1000, 1000])
+
+
 if __name__ == '__main__':
     unittest.main()
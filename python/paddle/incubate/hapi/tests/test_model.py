@@ -31,6 +31,7 @@ from paddle.incubate.hapi.loss import CrossEntropy
 from paddle.incubate.hapi.metrics import Accuracy
 from paddle.incubate.hapi.datasets import MNIST
 from paddle.incubate.hapi.vision.models import LeNet
+from paddle.incubate.hapi.writers import NpyShardWriter
 from paddle.incubate.hapi.distributed import DistributedBatchSampler, prepare_distributed_context
 
 
@@ -257,6 +258,22 @@ class TestModel(unittest.TestCase):
         acc = compute_acc(output[0], self.val_dataset.labels)
         np.testing.assert_allclose(acc, self.acc1)
 
+        outputs = [
+            outs[0]
+            for outs in model.predict_generator(
+                self.test_dataset, batch_size=64)
+        ]
+        np.testing.assert_allclose(np.vstack(outputs), output[0])
+
+        save_dir = tempfile.mkdtemp()
+        writer = NpyShardWriter(save_dir, samples_per_shard=500)
+        files = model.predict(
+            self.test_dataset, batch_size=64, writer=writer)
+        self.assertEqual(len(files), 3)
+        np.testing.assert_allclose(
+            np.vstack([np.load(f[0]) for f in files]), output[0])
+        shutil.rmtree(save_dir)
+
         sampler = DistributedBatchSampler(
             self.test_dataset, batch_size=64, shuffle=False)
 
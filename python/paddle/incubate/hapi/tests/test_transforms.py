@@ -123,6 +123,61 @@ class TestTransforms(unittest.TestCase):
         with self.assertRaises(ValueError):
             transforms.BrightnessTransform(-1.0)
 
+    def test_fused_tail(self):
+        normalize = transforms.Normalize(
+            mean=[123.675, 116.28, 103.53], std=[58.395, 57.120, 57.375])
+        trans_list = [
+            transforms.Resize(256), transforms.CenterCrop(224),
+            transforms.RandomHorizontalFlip(), transforms.RandomVerticalFlip(),
+            transforms.Permute(mode='CHW'), normalize
+        ]
+        fused = transforms.Compose(trans_list)
+        unfused = transforms.Compose(trans_list, fuse=False)
+        self.assertEqual(len(fused._tail.transforms), 5)
+        self.assertIsNone(unfused._tail)
+
+        for dtype in ['uint8', 'float32']:
+            img = (np.random.random((280, 350, 3)) * 255).astype(dtype)
+            for seed in range(4):
+                np.random.seed(seed)
+                expected = unfused(img)
+                np.random.seed(seed)
+                result = fused(img)
+                self.assertEqual(result.dtype, expected.dtype)
+                self.assertTrue(result.flags['C_CONTIGUOUS'])
+                np.testing.assert_array_equal(result, expected)
+
+        self.do_transform(fused)
+
+    def test_batch_fused(self):
+        normalize = transforms.Normalize(mean=[0.5, 0.5, 0.5], std=0.5)
+        for trans_list in [[
+                transforms.CenterCrop(24),
+                transforms.RandomHorizontalFlip(1.0),
+                transforms.RandomVerticalFlip(0.0),
+                transforms.Permute(mode='CHW'), normalize
+        ], [
+                transforms.RandomHorizontalFlip(1.0),
+                transforms.CenterCrop(23),
+                transforms.Permute(mode='CHW', to_rgb=False)
+        ], [transforms.RandomVerticalFlip(1.0)]]:
+            imgs = (np.random.random((4, 32, 31, 3)) * 255).astype('uint8')
+            samples = [(img, i) for i, img in enumerate(imgs)]
+            trans = transforms.Compose(trans_list, fuse=False)
+            expected = [trans(img) for img in imgs]
+
+            batch_trans = transforms.BatchCompose(
+                [transforms.Compose(trans_list)])
+            batch_imgs, labels = batch_trans(samples)
+            self.assertEqual(list(labels), [0, 1, 2, 3])
+            for result, expect in zip(batch_imgs, expected):
+                np.testing.assert_allclose(result, expect, rtol=1e-6)
+
+            batch_trans = transforms.BatchCompose(trans_list)
+            batch_imgs, labels = batch_trans(samples)
+            for result, expect in zip(batch_imgs, expected):
+                np.testing.assert_allclose(result, expect, rtol=1e-6)
+
     def test_info(self):
         str(transforms.Compose([transforms.Resize((224, 224))]))
         str(transforms.BatchCompose([transforms.Resize((224, 224))]))
@@ -0,0 +1,89 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from paddle.incubate.hapi.writers import PredictWriter, NpyShardWriter, \
+        MemmapWriter, TextLineWriter, AsyncWriter
+
+
+class TestWriters(unittest.TestCase):
+    def setUp(self):
+        self.save_dir = tempfile.mkdtemp()
+        self.outputs = [
+            np.random.random((100, 3, 2)).astype('float32'),
+            np.arange(100).reshape((100, 1)).astype('int64'),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.save_dir)
+
+    def write_batches(self, writer, batch_size=16):
+        for i in range(0, 100, batch_size):
+            writer.write([o[i:i + batch_size] for o in self.outputs])
+        return writer.close()
+
+    def test_npy_shard_writer(self):
+        writer = NpyShardWriter(self.save_dir, samples_per_shard=30)
+        files = self.write_batches(writer)
+        self.assertEqual(len(files), 4)
+        for i, output in enumerate(self.outputs):
+            shards = [np.load(f[i]) for f in files]
+            self.assertEqual([len(s) for s in shards], [30, 30, 30, 10])
+            np.testing.assert_array_equal(np.concatenate(shards), output)
+
+    def test_memmap_writer(self):
+        # samples beyond num_samples, e.g. padding of the sampler, are dropped
+        writer = MemmapWriter(self.save_dir, num_samples=90)
+        arrays = self.write_batches(writer)
+        for array, output in zip(arrays, self.outputs):
+            self.assertEqual(array.dtype, output.dtype)
+            np.testing.assert_array_equal(array, output[:90])
+
+    def test_text_line_writer(self):
+        path = os.path.join(self.save_dir, 'out', 'pred.txt')
+        self.write_batches(TextLineWriter(path))
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 100)
+        values, label = lines[7].split('\t')
+        np.testing.assert_allclose(
+            np.array(values.split(), dtype='float32'),
+            self.outputs[0][7].flatten())
+        self.assertEqual(label, '7')
+
+    def test_async_writer(self):
+        writer = AsyncWriter(
+            NpyShardWriter(
+                self.save_dir, samples_per_shard=1000), max_pending=1)
+        files = self.write_batches(writer, batch_size=7)
+        self.assertEqual(len(files), 1)
+        np.testing.assert_array_equal(np.load(files[0][1]), self.outputs[1])
+
+    def test_async_writer_error(self):
+        writer = AsyncWriter(PredictWriter())
+        writer.write(self.outputs)
+        with self.assertRaises(NotImplementedError):
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
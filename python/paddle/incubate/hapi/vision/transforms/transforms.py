@@ -62,6 +62,12 @@ class Compose(object):
 
     Args:
         transforms (list): List of transforms to compose.
+        fuse (bool): Whether to fuse the tail of :attr:`transforms` made up
+            of :code:`CenterCrop`, :code:`RandomHorizontalFlip`,
+            :code:`RandomVerticalFlip`, :code:`Permute` and :code:`Normalize`
+            (normalize should follow permute) into a single pass, which
+            only takes views of the image and writes the output array once.
+            Default: True.
 
     Returns:
         A compose object which is callable, __call__ for this Compose
@@ -83,11 +89,23 @@ class Compose(object):
 
     """
 
-    def __init__(self, transforms):
+    def __init__(self, transforms, fuse=True):
         self.transforms = transforms
+        self.fuse = fuse
+        self._head, self._tail = _split_fused_tail(transforms, fuse)
 
     def __call__(self, *data):
-        for f in self.transforms:
+        if self._tail is not None:
+            data = self._run(self._head, data)
+            img = data[0] if isinstance(data, tuple) and len(data) == 1 \
+                else data
+            if self._tail.accept(img):
+                return self._tail(img)
+            return self._run(self._tail.transforms, data)
+        return self._run(self.transforms, data)
+
+    def _run(self, transforms, data):
+        for f in transforms:
             try:
                 # multi-fileds in a sample
                 if isinstance(data, Sequence):
@@ -117,6 +135,11 @@ class BatchCompose(object):
     Args:
         transforms (list): List of transforms to compose.
                            these transforms perform on batch data.
+                           :code:`CenterCrop`, :code:`RandomHorizontalFlip`,
+                           :code:`RandomVerticalFlip`, :code:`Permute`,
+                           :code:`Normalize` or a :code:`Compose` of them
+                           are applied to the first field of all samples
+                           as a whole batch array.
 
     Examples:
     
@@ -187,7 +210,11 @@ class BatchCompose(object):
     def __call__(self, data):
         for f in self.transforms:
             try:
-                data = f(data)
+                fused = _as_fused(f)
+                if fused is not None and _is_image_batch(data):
+                    data = _apply_on_batch(fused, data)
+                else:
+                    data = f(data)
             except Exception as e:
                 stack_info = traceback.format_exc()
                 print("fail to perform batch transform [{}] with error: "
@@ -500,7 +527,7 @@ class Normalize(object):
             mean = [mean, mean, mean]
 
         if isinstance(std, numbers.Number):
-            mean = [std, std, std]
+            std = [std, std, std]
 
         self.mean = np.array(mean, dtype=np.float32).reshape(len(mean), 1, 1)
         self.std = np.array(std, dtype=np.float32).reshape(len(std), 1, 1)
@@ -800,3 +827,181 @@ class ColorJitter(object):
 
     def __call__(self, img):
         return self.transforms(img)
+
+
+_FUSIBLE_GEOMETRIC = (CenterCrop, RandomHorizontalFlip, RandomVerticalFlip)
+
+
+def _split_fused_tail(transforms, fuse=True, min_fused=2):
+    """Split transforms into head and a fusible tail matching
+    [CenterCrop|RandomHorizontalFlip|RandomVerticalFlip]* [Permute [Normalize]]
+    """
+    if not fuse or not isinstance(transforms, (list, tuple)):
+        return transforms, None
+    i = len(transforms)
+    if i >= 2 and type(transforms[i - 1]) is Normalize \
+            and type(transforms[i - 2]) is Permute:
+        i -= 2
+    elif i >= 1 and type(transforms[i - 1]) is Permute:
+        i -= 1
+    while i > 0 and type(transforms[i - 1]) in _FUSIBLE_GEOMETRIC:
+        i -= 1
+    # fusing a single transform gains nothing
+    if len(transforms) - i < max(min_fused, 1):
+        return transforms, None
+    return transforms[:i], _FusedTail(transforms[i:])
+
+
+class _FusedTail(object):
+    """Apply crop, flip, permute and normalize transforms in one pass.
+
+    Crop, flip and permute only produce views of the input image, the only
+    data pass is normalize (or a plain copy) writing into the output array.
+    Random decisions are drawn in the same order as applying transforms
+    one by one, so results are the same as the unfused version.
+    """
+
+    def __init__(self, transforms):
+        self.transforms = list(transforms)
+        self.geometric = [
+            t for t in self.transforms if type(t) in _FUSIBLE_GEOMETRIC
+        ]
+        self.permute = None
+        self.normalize = None
+        for t in self.transforms:
+            if type(t) is Permute:
+                self.permute = t
+            elif type(t) is Normalize:
+                self.normalize = t
+
+    def accept(self, img):
+        return isinstance(img, np.ndarray) and img.ndim == 3
+
+    def _out_dtype(self, dtype):
+        if self.normalize is None:
+            return dtype
+        return np.result_type(dtype, self.normalize.mean.dtype,
+                              self.normalize.std.dtype)
+
+    def _permute(self, view, channel_axis):
+        if self.permute is None:
+            return view
+        if self.permute.to_rgb:
+            index = [slice(None)] * view.ndim
+            index[channel_axis] = slice(None, None, -1)
+            view = view[tuple(index)]
+        axes = list(range(view.ndim))
+        axes.insert(view.ndim - 3, axes.pop(channel_axis))
+        return view.transpose(axes)
+
+    def _write(self, view, out):
+        if self.normalize is None:
+            np.copyto(out, view)
+        else:
+            np.subtract(view, self.normalize.mean, out=out)
+            np.divide(out, self.normalize.std, out=out)
+        return out
+
+    def __call__(self, img, out=None):
+        view = img
+        for t in self.geometric:
+            if type(t) is CenterCrop:
+                x, y = t._get_params(view)
+                th, tw = t.output_size
+                view = view[y:y + th, x:x + tw]
+            elif np.random.random() < t.prob:
+                if type(t) is RandomHorizontalFlip:
+                    view = view[:, ::-1]
+                else:
+                    view = view[::-1]
+        view = self._permute(view, -1)
+        if out is None:
+            out = np.empty(view.shape, dtype=self._out_dtype(img.dtype))
+        return self._write(view, out)
+
+    def apply_batch(self, imgs):
+        """Apply on a batch array with (N, H, W, C) shape."""
+        n = len(imgs)
+        crop_after_flip = False
+        seen_flip = False
+        for t in self.geometric:
+            if type(t) is CenterCrop:
+                crop_after_flip = crop_after_flip or seen_flip
+            else:
+                seen_flip = True
+
+        if crop_after_flip:
+            # crop offsets differ between flipped and unflipped samples,
+            # so fall back to fuse per sample into rows of a batch array
+            first = self(imgs[0])
+            out = np.empty((n, ) + first.shape, dtype=first.dtype)
+            out[0] = first
+            for i in range(1, n):
+                self(imgs[i], out=out[i])
+            return out
+
+        view = imgs
+        flips = []
+        for t in self.geometric:
+            if type(t) is CenterCrop:
+                x, y = t._get_params(view[0])
+                th, tw = t.output_size
+                view = view[:, y:y + th, x:x + tw]
+            else:
+                flips.append((t, np.random.random(n) < t.prob))
+        view = self._permute(view, -1)
+        out = np.empty(view.shape, dtype=self._out_dtype(imgs.dtype))
+        self._write(view, out)
+
+        # flips commute with permute and normalize, apply them to
+        # the selected samples of the output inplace
+        h_axis, w_axis = (-2, -1) if self.permute is not None else (-3, -2)
+        for t, mask in flips:
+            if mask.any():
+                axis = w_axis if type(t) is RandomHorizontalFlip else h_axis
+                out[mask] = np.flip(out[mask], axis)
+        return out
+
+
+def _as_fused(transform):
+    if type(transform) is Compose:
+        head, tail = _split_fused_tail(
+            transform.transforms, transform.fuse, min_fused=1)
+        return tail if len(head) == 0 else None
+    if type(transform) in _FUSIBLE_GEOMETRIC + (Permute, Normalize):
+        return _FusedTail([transform])
+    return None
+
+
+def _is_image_batch(data):
+    if isinstance(data, np.ndarray):
+        return data.ndim == 4
+    if not isinstance(data, (list, tuple)) or len(data) == 0:
+        return False
+    for sample in data:
+        img = sample if isinstance(sample, np.ndarray) else \
+            sample[0] if isinstance(sample, (list, tuple)) and len(sample) > 0 \
+            else None
+        if not isinstance(img, np.ndarray) or img.ndim != 3:
+            return False
+    return True
+
+
+def _apply_on_batch(fused, data):
+    if isinstance(data, np.ndarray):
+        return fused.apply_batch(data)
+
+    imgs = [s if isinstance(s, np.ndarray) else s[0] for s in data]
+    if all(img.shape == imgs[0].shape and img.dtype == imgs[0].dtype
+           for img in imgs):
+        outs = fused.apply_batch(np.stack(imgs))
+    else:
+        outs = [fused(img) for img in imgs]
+
+    samples = []
+    for sample, out in zip(data, outs):
+        if isinstance(sample, np.ndarray):
+            samples.append(out)
+        else:
+            samples.append(type(sample)([out] + list(sample[1:])))
+    return samples
@@ -0,0 +1,256 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import sys
+import threading
+import numpy as np
+
+import six
+from six.moves import queue
+
+__all__ = [
+    'PredictWriter', 'NpyShardWriter', 'MemmapWriter', 'TextLineWriter',
+    'AsyncWriter'
+]
+
+
+class PredictWriter(object):
+    """
+    Base class of writers which consume outputs of :code:`Model.predict`
+    batch by batch, so that predictions need not be hold in memory.
+
+    Subclasses should implement :code:`write` and optionally :code:`close`.
+    """
+
+    def write(self, outputs):
+        """
+        Write outputs of a batch.
+
+        Args:
+            outputs (list): A list of numpy array, one for each output of
+                the model, the first dimension is batch size.
+        """
+        raise NotImplementedError("'{}' not implement in class "\
+                "{}".format('write', self.__class__.__name__))
+
+    def close(self):
+        """
+        Flush and release all resources.
+
+        Returns:
+            The written result, which differs between writers.
+        """
+        return None
+
+
+class NpyShardWriter(PredictWriter):
+    """
+    Write outputs into sharded `.npy` files, each output field of a shard is
+    saved as :code:`{prefix}_{field}_{shard}.npy`.
+
+    Args:
+        save_dir (str): Directory to save shard files.
+        samples_per_shard (int): Number of samples in one shard, only this
+            much samples are kept in memory. Default 100000.
+        prefix (str): Prefix of file names. Default 'output'.
+
+    Returns:
+        :code:`close` returns list of saved file paths per shard.
+    """
+
+    def __init__(self, save_dir, samples_per_shard=100000, prefix='output'):
+        assert samples_per_shard > 0, "samples_per_shard should be positive"
+        if not os.path.exists(save_dir):
+            os.makedirs(save_dir)
+        self.save_dir = save_dir
+        self.samples_per_shard = samples_per_shard
+        self.prefix = prefix
+        self.files = []
+        self._pending = []
+        self._num_pending = 0
+
+    def _flush(self, num_samples):
+        fields = list(zip(*self._pending))
+        arrays = [np.concatenate(f) for f in fields]
+        rest = [a[num_samples:] for a in arrays]
+
+        shard = len(self.files)
+        paths = []
+        for i, a in enumerate(arrays):
+            path = os.path.join(self.save_dir, '{}_{}_{:05d}.npy'.format(
+                self.prefix, i, shard))
+            np.save(path, a[:num_samples])
+            paths.append(path)
+        self.files.append(paths)
+
+        self._num_pending = len(rest[0])
+        self._pending = [rest] if self._num_pending > 0 else []
+
+    def write(self, outputs):
+        outputs = [np.asarray(o) for o in outputs]
+        self._pending.append(outputs)
+        self._num_pending += len(outputs[0])
+        while self._num_pending >= self.samples_per_shard:
+            self._flush(self.samples_per_shard)
+
+    def close(self):
+        if self._num_pending > 0:
+            self._flush(self._num_pending)
+        return self.files
+
+
+class MemmapWriter(PredictWriter):
+    """
+    Write outputs into numpy memmap (`.npy` format) files, one file for each
+    output field named :code:`{prefix}_{field}.npy`. The files are created
+    on first write with shape :code:`[num_samples] + output_shape[1:]`.
+
+    Args:
+        save_dir (str): Directory to save memmap files.
+        num_samples (int): Total number of samples to predict.
+        prefix (str): Prefix of file names. Default 'output'.
+
+    Returns:
+        :code:`close` returns list of memmap arrays opened in read mode.
+    """
+
+    def __init__(self, save_dir, num_samples, prefix='output'):
+        if not os.path.exists(save_dir):
+            os.makedirs(save_dir)
+        self.save_dir = save_dir
+        self.num_samples = num_samples
+        self.prefix = prefix
+        self.paths = []
+        self._maps = None
+        self._offset = 0
+
+    def write(self, outputs):
+        outputs = [np.asarray(o) for o in outputs]
+        if self._maps is None:
+            self._maps = []
+            for i, o in enumerate(outputs):
+                path = os.path.join(self.save_dir, '{}_{}.npy'.format(
+                    self.prefix, i))
+                self._maps.append(
+                    np.lib.format.open_memmap(
+                        path,
+                        mode='w+',
+                        dtype=o.dtype,
+                        shape=(self.num_samples, ) + o.shape[1:]))
+                self.paths.append(path)
+
+        # padded samples of the last batch would exceed num_samples
+        size = min(len(outputs[0]), self.num_samples - self._offset)
+        for m, o in zip(self._maps, outputs):
+            m[self._offset:self._offset + size] = o[:size]
+        self._offset += size
+
+    def close(self):
+        if self._maps is None:
+            return []
+        for m in self._maps:
+            m.flush()
+        self._maps = None
+        return [np.load(p, mmap_mode='r') for p in self.paths]
+
+
+class TextLineWriter(PredictWriter):
+    """
+    Write outputs as line-delimited text, one line for each sample, fields
+    are separated by tab and values of a field are separated by space.
+
+    Args:
+        path (str): Path of the text file.
+        formatter (callable|None): A function takes a list of numpy arrays,
+            the outputs of a sample, and returns a line without line break.
+            Default None.
+
+    Returns:
+        :code:`close` returns the path of the text file.
+    """
+
+    def __init__(self, path, formatter=None):
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        self.path = path
+        self.formatter = formatter or self._format
+        self._file = open(path, 'w')
+
+    @staticmethod
+    def _format(sample):
+        return '\t'.join(' '.join(str(v) for v in np.asarray(f).flatten())
+                         for f in sample)
+
+    def write(self, outputs):
+        outputs = [np.asarray(o) for o in outputs]
+        lines = [self.formatter(s) for s in zip(*outputs)]
+        self._file.write('\n'.join(lines) + '\n')
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        return self.path
+
+
+class AsyncWriter(PredictWriter):
+    """
+    Wrap a writer to write in a background thread, so that writing outputs
+    of current batch overlaps with loading and computing of next batches.
+
+    Args:
+        writer (PredictWriter): The writer to wrap.
+        max_pending (int): Max number of batches waiting to be written,
+            :code:`write` blocks once exceeded to bound memory. Default 2.
+    """
+
+    def __init__(self, writer, max_pending=2):
+        self.writer = writer
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._exc_info = None
+        self._thread = threading.Thread(target=self._loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            outputs = self._queue.get()
+            if outputs is None:
+                break
+            if self._exc_info is not None:
+                continue
+            try:
+                self.writer.write(outputs)
+            except Exception:
+                self._exc_info = sys.exc_info()
+
+    def _check(self):
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+
+    def write(self, outputs):
+        self._check()
+        self._queue.put(outputs)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._check()
+        return self.writer.close()
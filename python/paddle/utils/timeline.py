@@ -0,0 +1,424 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Read profiles saved by paddle.fluid.profiler and write them as Chrome traces
+(chrome://tracing) incrementally, so that memory does not grow with the
+length of profiles.
+"""
+
+from __future__ import print_function
+
+import json
+import mmap
+import six
+
+__all__ = ['ProfileReader', 'ChromeTraceWriter', 'write_timeline']
+
+# field numbers of message Profile in profiler.proto
+_EVENTS_FIELD = 1
+_START_NS_FIELD = 2
+_END_NS_FIELD = 3
+_MEM_EVENTS_FIELD = 4
+
+
+def _profiler_pb2():
+    import paddle.fluid.proto.profiler.profiler_pb2 as profiler_pb2
+    return profiler_pb2
+
+
+def _read_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        b = six.indexbytes(buf, pos)
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+class ProfileReader(object):
+    """
+    Read a profile file saved by :code:`paddle.fluid.profiler`. The file is
+    memory mapped and events are parsed one by one while iterating, instead
+    of parsing the whole profile into memory.
+
+    Args:
+        path (str): The path of profile file.
+
+    Attributes:
+        start_ns (int): The start time of profiling, 0 if not recorded.
+        end_ns (int): The end time of profiling, 0 if not recorded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._buf = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file can not be mapped
+            self._buf = b''
+        self.start_ns = 0
+        self.end_ns = 0
+        for field, value in self._fields((_START_NS_FIELD, _END_NS_FIELD)):
+            if field == _START_NS_FIELD:
+                self.start_ns = value
+            else:
+                self.end_ns = value
+
+    def _fields(self, wanted):
+        """
+        Iterate top level fields of Profile, yield (field, value) of wanted
+        fields, the value of length-delimited fields is (start, end) of it.
+        """
+        buf = self._buf
+        pos = 0
+        size = len(buf)
+        while pos < size:
+            tag, pos = _read_varint(buf, pos)
+            field, wire_type = tag >> 3, tag & 0x7
+            if wire_type == 0:
+                value, pos = _read_varint(buf, pos)
+            elif wire_type == 2:
+                length, pos = _read_varint(buf, pos)
+                value = (pos, pos + length)
+                pos += length
+            elif wire_type == 1:
+                value = None
+                pos += 8
+            elif wire_type == 5:
+                value = None
+                pos += 4
+            else:
+                raise ValueError("Unsupported wire type {} in profile {}".
+                                 format(wire_type, self.path))
+            if field in wanted:
+                yield field, value
+
+    def events(self):
+        """
+        Iterate the events (profiler_pb2.Event) of profile.
+        """
+        event_cls = _profiler_pb2().Event
+        for _, (start, end) in self._fields((_EVENTS_FIELD, )):
+            yield event_cls.FromString(self._buf[start:end])
+
+    def mem_events(self):
+        """
+        Iterate the memory events (profiler_pb2.MemEvent) of profile.
+        """
+        mem_event_cls = _profiler_pb2().MemEvent
+        for _, (start, end) in self._fields((_MEM_EVENTS_FIELD, )):
+            yield mem_event_cls.FromString(self._buf[start:end])
+
+    def first_ns(self):
+        """
+        Get start_ns, or the earliest start of events if it is not recorded.
+        """
+        if self.start_ns:
+            return self.start_ns
+        return min([e.start_ns for e in self.events()] or [0])
+
+    def close(self):
+        if not isinstance(self._buf, bytes):
+            self._buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ChromeTraceWriter(object):
+    """
+    Write events of Chrome trace format to a file one by one.
+
+    For details of the file format, see:
+    https://github.com/catapult-project/catapult/blob/master/tracing/README.md
+
+    Args:
+        path (str): The path of trace file.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'w')
+        self._file.write('{"traceEvents":[')
+        self._num_events = 0
+
+    def _write(self, event):
+        if self._num_events > 0:
+            self._file.write(',\n')
+        self._file.write(json.dumps(event, separators=(',', ':')))
+        self._num_events += 1
+
+    @property
+    def num_events(self):
+        return self._num_events
+
+    def emit_pid(self, name, pid):
+        """Adds a process metadata event to the trace.
+
+        Args:
+          name:  The process name as a string.
+          pid:  Identifier of the process as an integer.
+        """
+        self._write({
+            'name': 'process_name',
+            'ph': 'M',
+            'pid': pid,
+            'args': {
+                'name': name
+            }
+        })
+
+    def emit_region(self, timestamp, duration, pid, tid, category, name, args):
+        """Adds a region event to the trace.
+
+        Args:
+          timestamp:  The start timestamp of this region as a long integer.
+          duration:  The duration of this region as a long integer.
+          pid:  Identifier of the process generating this event as an integer.
+          tid:  Identifier of the thread generating this event as an integer.
+          category: The event category as a string.
+          name:  The event name as a string.
+          args:  A JSON-compatible dictionary of event arguments.
+        """
+        self._write({
+            'ph': 'X',
+            'cat': category,
+            'name': name,
+            'pid': pid,
+            'tid': tid,
+            'ts': timestamp,
+            'dur': duration,
+            'args': args
+        })
+
+    def emit_counter(self, category, name, pid, timestamp, counter, value):
+        """Emits a record for a single counter.
+
+        Args:
+            category: The event category as string
+            name: The event name as string
+            pid: Identifier of the process generating this event as integer
+            timestamp: The timestamps of this event as long integer
+            counter: Name of the counter as string
+            value: Value of the counter as integer
+        """
+        self._write({
+            'ph': 'C',
+            'cat': category,
+            'name': name,
+            'pid': pid,
+            'tid': 0,
+            'ts': timestamp,
+            'args': {
+                counter: value
+            }
+        })
+
+    def close(self):
+        if not self._file.closed:
+            self._file.write(']}')
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _device_key(event):
+    pb2 = _profiler_pb2()
+    if event.type == pb2.Event.GPUKernel:
+        return event.device_id, "GPUKernel"
+    return event.device_id, "CPU"
+
+
+def _device_name(rank, device_id, type):
+    if type == "GPUKernel":
+        return "%s:gpu:%d" % (rank, device_id)
+    # -1 device id represents CUDA API(RunTime) call.(e.g. cudaLaunch, cudaMemcpy)
+    if device_id == -1:
+        return "%s:cuda_api" % rank
+    return "%s:cpu:block:%d" % (rank, device_id)
+
+
+def _event_op_type(event):
+    """
+    The op type of event, GPU kernels are recorded with the name of ops
+    launching them in detail_info, and events inside ops are named like
+    op_type/compute.
+    """
+    name = event.name
+    if event.type == _profiler_pb2().Event.GPUKernel and event.detail_info:
+        name = event.detail_info
+    return name.split('/')[0]
+
+
+def _profile_paths(profile_path):
+    """
+    Parse profile paths in format 'file' or 'trainer1=file1,trainer2=file2'
+    into an ordered list of (rank name, path).
+    """
+    if isinstance(profile_path, dict):
+        return sorted(six.iteritems(profile_path))
+    paths = profile_path.split(',')
+    if len(paths) == 1 and '=' not in paths[0]:
+        return [('trainer', paths[0])]
+    return [tuple(p.split('=', 1)) for p in paths]
+
+
+class _EventFilter(object):
+    """
+    Select the events overlapping the time window [start_ms, end_ms], which
+    is relative to the start of profile, and of the given op types.
+    """
+
+    def __init__(self, first_ns, start_ms=None, end_ms=None, op_types=None):
+        self.start_ns = None if start_ms is None else first_ns + int(start_ms *
+                                                                     1e6)
+        self.end_ns = None if end_ms is None else first_ns + int(end_ms * 1e6)
+        self.op_types = None if op_types is None else set(op_types)
+
+    def in_window(self, start_ns, end_ns):
+        if self.start_ns is not None and end_ns < self.start_ns:
+            return False
+        if self.end_ns is not None and start_ns > self.end_ns:
+            return False
+        return True
+
+    def __call__(self, event):
+        if not self.in_window(event.start_ns, event.end_ns):
+            return False
+        if self.op_types is not None and \
+                _event_op_type(event) not in self.op_types:
+            return False
+        return True
+
+
+def _write_memory_counters(writer, reader, rank, pids, allocate_pid, offset,
+                           event_filter):
+    pb2 = _profiler_pb2()
+    place_to_str = {
+        pb2.MemEvent.CPUPlace: "cpu",
+        pb2.MemEvent.CUDAPlace: "gpu",
+        pb2.MemEvent.CUDAPinnedPlace: "cudapinnedplace"
+    }
+    # (time, size) changes of each place, only the small tuples are kept
+    changes = {}
+    for mevent in reader.mem_events():
+        place = place_to_str.get(mevent.place, "undefined")
+        key = (place, mevent.device_id)
+        if key not in changes:
+            changes[key] = []
+        changes[key].append((mevent.start_ns, mevent.bytes))
+        changes[key].append((mevent.end_ns, -mevent.bytes))
+
+    for (place, device_id), deltas in sorted(six.iteritems(changes)):
+        key = (rank, device_id, "memory:" + place)
+        if key not in pids:
+            pids[key] = allocate_pid()
+            writer.emit_pid("memory usage on %s:%s:%d" %
+                            (rank, place, device_id), pids[key])
+        deltas.sort(key=lambda d: d[0])
+        total_size = 0
+        for i, (time, size) in enumerate(deltas):
+            total_size += size
+            if i + 1 < len(deltas) and deltas[i + 1][0] == time:
+                continue
+            if event_filter.in_window(time, time):
+                writer.emit_counter("Memory", "Memory", pids[key],
+                                    time - offset, 0, total_size)
+
+
+def write_timeline(profile_path,
+                   timeline_path,
+                   start_ms=None,
+                   end_ms=None,
+                   op_types=None,
+                   align_ranks=False):
+    """
+    Convert profiles into a Chrome trace file. Events are read and written
+    one by one, only the memory events are kept in memory to compute the
+    memory usage.
+
+    Args:
+        profile_path (str|dict): The profile file, or multiple profile files
+            in format 'trainer1=file1,trainer2=file2,ps=file3' or a dict from
+            names to files, which are merged onto one timeline.
+        timeline_path (str): The output trace file.
+        start_ms (float|None): Only keep the events after start_ms since the
+            start of each profile. Default None.
+        end_ms (float|None): Only keep the events before end_ms since the
+            start of each profile. Default None.
+        op_types (list<str>|None): Only keep the events of these op types.
+            Default None means all events.
+        align_ranks (bool): Whether to shift the profiles to start at the
+            same time, which is useful when the clocks of machines are not
+            synchronized. Default False.
+
+    Returns:
+        int: the number of events written.
+
+    Examples:
+        .. code-block:: python
+
+            from paddle.utils.timeline import write_timeline
+
+            write_timeline('trainer0=/tmp/profile0,trainer1=/tmp/profile1',
+                           '/tmp/timeline', start_ms=1000, end_ms=2000)
+    """
+    pids = {}
+
+    def allocate_pid():
+        return len(pids)
+
+    with ChromeTraceWriter(timeline_path) as writer:
+        for rank, path in _profile_paths(profile_path):
+            with ProfileReader(path) as reader:
+                first_ns = reader.first_ns()
+                offset = first_ns if align_ranks else 0
+                event_filter = _EventFilter(first_ns, start_ms, end_ms,
+                                            op_types)
+                for event in reader.events():
+                    if not event_filter(event):
+                        continue
+                    device_id, type = _device_key(event)
+                    key = (rank, device_id, type)
+                    if key not in pids:
+                        pids[key] = allocate_pid()
+                        writer.emit_pid(
+                            _device_name(rank, device_id, type), pids[key])
+                    args = {'name': event.name}
+                    if event.memcopy.bytes > 0:
+                        args['mem_bytes'] = event.memcopy.bytes
+                    if event.detail_info:
+                        args['detail_info'] = event.detail_info
+                    # TODO(panyx0718): Chrome tracing only handles ms. However, some
+                    # ops takes micro-seconds. Hence, we keep the ns here.
+                    writer.emit_region(event.start_ns - offset,
+                                       (event.end_ns - event.start_ns) / 1.0,
+                                       pids[key], event.sub_device_id, 'Op',
+                                       event.name, args)
+                if op_types is None:
+                    _write_memory_counters(writer, reader, rank, pids,
+                                           allocate_pid, offset, event_filter)
+        return writer.num_events
@@ -0,0 +1,252 @@
+# Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Analyze profiles saved by paddle.fluid.profiler without converting them into
+Chrome traces: the aggregate time of events, the critical path and the idle
+gaps of devices.
+"""
+
+from __future__ import print_function
+
+import heapq
+import six
+from collections import OrderedDict
+
+from .timeline import ProfileReader, _EventFilter, _device_key, _device_name, _profile_paths
+
+__all__ = ['analyze_profile', 'print_analysis']
+
+
+def _critical_path(intervals):
+    """
+    Walk back from the end of the last event, at each time the innermost
+    event covering it, i.e. the one with the latest start, is on the critical
+    path, and the time it covers until the start of it or the end of another
+    event is attributed to it, so the time of nested events is attributed to
+    the leaf events rather than the outermost ones. If no event covers a time,
+    the walk jumps to the latest end of the events before it, and the time in
+    between is idle.
+
+    Args:
+        intervals (list): list of (start, end, name).
+
+    Returns:
+        tuple: (critical time of names in dict, idle time).
+    """
+    critical = {}
+    idle = 0
+    if not intervals:
+        return critical, idle
+    by_end = sorted(intervals, key=lambda i: i[1], reverse=True)
+    t = by_end[0][1]
+    # max heap of starts, the event ending earlier is inner on equal starts
+    heap = []
+    i = 0
+    while True:
+        while i < len(by_end) and by_end[i][1] >= t:
+            heapq.heappush(heap, (-by_end[i][0], -i))
+            i += 1
+        # events starting at or after t will never cover an earlier time
+        while heap and -heap[0][0] >= t:
+            heapq.heappop(heap)
+        if heap:
+            start, index = -heap[0][0], -heap[0][1]
+            # an event ending in between becomes the innermost one there
+            if i < len(by_end):
+                start = max(start, by_end[i][1])
+            name = by_end[index][2]
+            critical[name] = critical.get(name, 0) + t - start
+            t = start
+        elif i < len(by_end):
+            idle += t - by_end[i][1]
+            t = by_end[i][1]
+        else:
+            break
+    return critical, idle
+
+
+def _idle_gaps(intervals, min_gap_ns):
+    """
+    Merge the (start, end) intervals and return the busy time, the idle time
+    between them, and the gaps not shorter than min_gap_ns.
+    """
+    intervals.sort()
+    busy = idle = 0
+    gaps = []
+    cur_start, cur_end = intervals[0]
+    for start, end in intervals[1:]:
+        if start > cur_end:
+            busy += cur_end - cur_start
+            idle += start - cur_end
+            if start - cur_end >= min_gap_ns:
+                gaps.append((cur_end, start))
+            cur_start, cur_end = start, end
+        else:
+            cur_end = max(cur_end, end)
+    busy += cur_end - cur_start
+    return busy, idle, gaps
+
+
+def _analyze(reader, rank, event_filter, min_gap_ns, top_k):
+    ops = {}
+    intervals = []
+    device_intervals = {}
+    for event in reader.events():
+        if not event_filter(event):
+            continue
+        duration = event.end_ns - event.start_ns
+        if event.name not in ops:
+            ops[event.name] = {
+                'calls': 0,
+                'total_ns': 0,
+                'min_ns': duration,
+                'max_ns': duration,
+                'critical_ns': 0
+            }
+        op = ops[event.name]
+        op['calls'] += 1
+        op['total_ns'] += duration
+        op['min_ns'] = min(op['min_ns'], duration)
+        op['max_ns'] = max(op['max_ns'], duration)
+
+        intervals.append((event.start_ns, event.end_ns, event.name))
+        device = _device_name(rank, *_device_key(event))
+        if device not in device_intervals:
+            device_intervals[device] = []
+        device_intervals[device].append((event.start_ns, event.end_ns))
+
+    critical, critical_idle = _critical_path(intervals)
+    for name, op in six.iteritems(ops):
+        op['ave_ns'] = op['total_ns'] / float(op['calls'])
+        op['critical_ns'] = critical.get(name, 0)
+
+    devices = OrderedDict()
+    for device in sorted(device_intervals):
+        busy, idle, gaps = _idle_gaps(device_intervals[device], min_gap_ns)
+        gaps.sort(key=lambda g: g[1] - g[0], reverse=True)
+        devices[device] = {
+            'busy_ns': busy,
+            'idle_ns': idle,
+            'num_gaps': len(gaps),
+            'gaps': gaps[:top_k]
+        }
+
+    span = (max([i[1] for i in intervals]) - min([i[0] for i in intervals])
+            if intervals else 0)
+    return {
+        'span_ns': span,
+        'critical_path_ns': span - critical_idle,
+        'critical_idle_ns': critical_idle,
+        'ops': OrderedDict(
+            sorted(
+                six.iteritems(ops),
+                key=lambda item: item[1]['total_ns'],
+                reverse=True)),
+        'devices': devices
+    }
+
+
+def analyze_profile(profile_path,
+                    start_ms=None,
+                    end_ms=None,
+                    op_types=None,
+                    min_gap_us=100,
+                    top_k=10):
+    """
+    Analyze profiles saved by :code:`paddle.fluid.profiler`. The profile is
+    read event by event, only the (start, end) of events are kept in memory.
+
+    For each profile, the result contains:
+
+    - ops: the calls, total_ns, ave_ns, min_ns, max_ns of each event name,
+      and critical_ns, the time it is on the critical path, sorted by
+      total_ns in descending order.
+    - span_ns: the time from the start of the first event to the end of the
+      last event.
+    - critical_path_ns: the time covered by events along the critical path,
+      which walks back from the end of the last event through the innermost
+      event covering each time, so nested events are attributed to the leaf
+      events rather than the outermost ones.
+    - critical_idle_ns: the time no event is running, i.e.
+      span_ns - critical_path_ns.
+    - devices: busy_ns, idle_ns, num_gaps and the top_k longest gaps
+      (start_ns, end_ns) of each device.
+
+    Args:
+        profile_path (str|dict): The profile file, or multiple profile files
+            in format 'trainer1=file1,trainer2=file2' or a dict from names to
+            files.
+        start_ms (float|None): Only analyze the events after start_ms since
+            the start of each profile. Default None.
+        end_ms (float|None): Only analyze the events before end_ms since the
+            start of each profile. Default None.
+        op_types (list<str>|None): Only analyze the events of these op
+            types. Default None means all events.
+        min_gap_us (float): The gaps shorter than it are not reported.
+            Default 100.
+        top_k (int): The number of longest gaps reported for each device.
+            Default 10.
+
+    Returns:
+        OrderedDict: the result of each profile by its name.
+
+    Examples:
+        .. code-block:: python
+
+            from paddle.utils.timeline_analysis import analyze_profile, print_analysis
+
+            print_analysis(analyze_profile('/tmp/profile'))
+    """
+    results = OrderedDict()
+    for rank, path in _profile_paths(profile_path):
+        with ProfileReader(path) as reader:
+            event_filter = _EventFilter(reader.first_ns(), start_ms, end_ms,
+                                        op_types)
+            results[rank] = _analyze(reader, rank, event_filter,
+                                     min_gap_us * 1000, top_k)
+    return results
+
+
+def print_analysis(results, max_ops=20):
+    """
+    Print the results of :code:`analyze_profile`.
+
+    Args:
+        results (OrderedDict): The results of analyze_profile.
+        max_ops (int): The number of events with most total time to print.
+            Default 20.
+    """
+    for rank, result in six.iteritems(results):
+        print("------------------------->  %s  <-------------------------" %
+              rank)
+        print("Span: %.3f ms, critical path: %.3f ms, idle: %.3f ms" %
+              (result['span_ns'] / 1e6, result['critical_path_ns'] / 1e6,
+               result['critical_idle_ns'] / 1e6))
+        print("%-40s%-10s%-14s%-14s%-14s%-14s%-14s" %
+              ("Event", "Calls", "Total(ms)", "Ave(ms)", "Min(ms)", "Max(ms)",
+               "Critical(ms)"))
+        for name, op in list(result['ops'].items())[:max_ops]:
+            print("%-40s%-10d%-14.3f%-14.3f%-14.3f%-14.3f%-14.3f" %
+                  (name, op['calls'], op['total_ns'] / 1e6,
+                   op['ave_ns'] / 1e6, op['min_ns'] / 1e6,
+                   op['max_ns'] / 1e6, op['critical_ns'] / 1e6))
+        print("%-40s%-14s%-14s%-10s%s" %
+              ("Device", "Busy(ms)", "Idle(ms)", "Gaps", "Longest gaps(ms)"))
+        for device, stat in six.iteritems(result['devices']):
+            print("%-40s%-14.3f%-14.3f%-10d%s" %
+                  (device, stat['busy_ns'] / 1e6, stat['idle_ns'] / 1e6,
+                   stat['num_gaps'], ", ".join([
+                       "%.3f" % ((end - start) / 1e6)
+                       for start, end in stat['gaps']
+                   ])))